@@ -1,7 +1,14 @@
-from flask import Blueprint, render_template, request, redirect, session, flash, url_for
+from flask import (Blueprint, render_template, request, redirect, session, flash, url_for,
+                   abort, jsonify, make_response)
 from werkzeug.security import check_password_hash, generate_password_hash
 from db import mysql
 from datetime import datetime
+from skill_index import sync_volunteer_skills
+from repository import accounts
+from repository import admin as admin_repo
+import counters
+import signups
+from vocabulary import vocabulary
 
 admin_bp = Blueprint("admin", __name__, template_folder="../templates/admin")
 
@@ -29,13 +36,12 @@ def admin_login():
         password = request.form['password']
 
         cur = mysql.connection.cursor()
-        cur.execute("SELECT * FROM admin WHERE username=%s", (username,))
-        admin = cur.fetchone()
+        admin = accounts.find_admin(cur, username)
         cur.close()
 
-        if admin and check_password_hash(admin[2], password):
-            session['admin_id']   = admin[0]
-            session['admin_name'] = admin[1]
+        if admin and check_password_hash(admin.password, password):
+            session['admin_id']   = admin.admin_id
+            session['admin_name'] = admin.username
             return redirect(url_for('admin.admin_dashboard'))
         else:
             flash("Invalid Username or Password", "danger")
@@ -59,73 +65,70 @@ def admin_logout():
 @admin_bp.route('/dashboard')
 @admin_required
 def admin_dashboard():
-    cur = mysql.connection.cursor()
-
-    cur.execute("SELECT COUNT(*) FROM volunteer")
-    volunteers = cur.fetchone()[0]
-
-    cur.execute("SELECT COUNT(*) FROM organization")
-    orgs = cur.fetchone()[0]
-
-    cur.execute("SELECT COUNT(*) FROM activity")
-    activities = cur.fetchone()[0]
-
-    # Full volunteer list
-    cur.execute("""
-        SELECT volunteer_id, first_name, last_name, email,
-               gender, phone, skills, profile_picture, created_at
-        FROM volunteer ORDER BY created_at DESC
-    """)
-    rows = cur.fetchall()
-    vcols = ['volunteer_id','first_name','last_name','email',
-             'gender','phone','skills','profile_picture','created_at']
-    volunteer_list = [dict(zip(vcols, r)) for r in rows]
-
-    # Full organization list with activity count
-    cur.execute("""
-        SELECT o.org_id, o.name, o.email, o.phone,
-               o.address, o.representative, o.profile_picture, o.created_at,
-               COUNT(a.activity_id) AS activity_count
-        FROM organization o
-        LEFT JOIN activity a ON o.org_id = a.org_id
-        GROUP BY o.org_id
-        ORDER BY o.created_at DESC
-    """)
-    rows = cur.fetchall()
-    ocols = ['org_id','name','email','phone','address',
-             'representative','profile_picture','created_at','activity_count']
-    org_list = [dict(zip(ocols, r)) for r in rows]
-
-    # Full activity list with org name + volunteer count
-    cur.execute("""
-        SELECT a.activity_id, a.name, a.type, a.place,
-               a.start_date, a.end_date, a.reg_open, a.reg_close,
-               o.name AS org_name,
-               COUNT(va.id) AS volunteer_count
-        FROM activity a
-        JOIN organization o ON a.org_id = o.org_id
-        LEFT JOIN volunteer_activity va ON a.activity_id = va.activity_id
-        GROUP BY a.activity_id
-        ORDER BY a.start_date DESC
-    """)
-    rows = cur.fetchall()
-    acols = ['activity_id','name','type','place','start_date','end_date',
-             'reg_open','reg_close','org_name','volunteer_count']
-    activity_list = [dict(zip(acols, r)) for r in rows]
+    # First paint: the counters and the first page of the open tab only;
+    # the other tabs fetch their rows from tab_rows when opened.
+    tab = request.args.get('tab', 'volunteers')
+    if tab not in admin_repo.LISTINGS:
+        tab = 'volunteers'
 
+    cur = mysql.connection.cursor()
+    totals = counters.totals(cur)
+    rows, next_cursor = admin_repo.page(cur, tab)
     cur.close()
+
     return render_template(
         'admin_dashboard.html',
-        volunteers     = volunteers,
-        orgs           = orgs,
-        activities     = activities,
-        volunteer_list = volunteer_list,
-        org_list       = org_list,
-        activity_list  = activity_list,
-        now            = datetime.now(),
+        volunteers  = totals['volunteers'],
+        orgs        = totals['organizations'],
+        activities  = totals['activities'],
+        signups     = totals['signups'],
+        tab         = tab,
+        rows        = rows,
+        next_cursor = next_cursor,
+        now         = datetime.now(),
     )
 
 
+# ─────────────────────────────────────────
+# DASHBOARD ROWS  (one page of a tab)
+# ─────────────────────────────────────────
+@admin_bp.route('/<tab>/rows')
+@admin_required
+def tab_rows(tab):
+    """
+    ?sort=&dir=asc|desc&q=&cursor=&limit=&format=json|html
+    html returns the <tr> fragment with the next cursor in the
+    X-Next-Cursor header; json returns {rows, next_cursor}.
+    """
+    if tab not in admin_repo.LISTINGS:
+        abort(404)
+    args = request.args
+    try:
+        limit = int(args.get('limit', admin_repo.PAGE_SIZE))
+    except ValueError:
+        limit = admin_repo.PAGE_SIZE
+
+    cur = mysql.connection.cursor()
+    rows, next_cursor = admin_repo.page(
+        cur, tab,
+        sort      = args.get('sort'),
+        direction = args.get('dir', 'desc'),
+        q         = args.get('q', ''),
+        cursor    = args.get('cursor'),
+        limit     = limit,
+    )
+    cur.close()
+
+    if args.get('format') == 'html':
+        partial = {'volunteers': '_volunteer_rows.html',
+                   'organizations': '_org_rows.html',
+                   'activities': '_activity_rows.html'}[tab]
+        resp = make_response(render_template(partial, rows=rows, now=datetime.now()))
+        resp.headers['X-Next-Cursor'] = next_cursor or ''
+        return resp
+    return jsonify(rows=[r._asdict() for r in rows], next_cursor=next_cursor)
+
+
 # ─────────────────────────────────────────
 # VIEW VOLUNTEERS  (kept for compatibility)
 # ─────────────────────────────────────────
@@ -133,8 +136,7 @@ def admin_dashboard():
 @admin_required
 def view_volunteers():
     cur = mysql.connection.cursor()
-    cur.execute("SELECT volunteer_id, first_name, last_name, email, gender, phone FROM volunteer")
-    volunteers = cur.fetchall()
+    volunteers = admin_repo.all_volunteers(cur)
     cur.close()
     return render_template('view_volunteers.html', volunteers=volunteers)
 
@@ -159,13 +161,12 @@ def add_volunteer():
 
     cur = mysql.connection.cursor()
     try:
-        cur.execute("""
-            INSERT INTO volunteer
-            (first_name, last_name, email, password, phone, gender, skills)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, (first, last, email,
-              generate_password_hash(pw),
-              phone or None, gender or None, skills))
+        skills = vocabulary.canonical(cur, skills)
+        volunteer_id = accounts.create_volunteer(
+            cur, first, last, email, generate_password_hash(pw),
+            gender or None, phone or None, skills
+        )
+        sync_volunteer_skills(cur, volunteer_id, skills)
         mysql.connection.commit()
         flash(f"Volunteer {first} {last} added successfully.", "success")
     except Exception:
@@ -184,10 +185,10 @@ def add_volunteer():
 @admin_required
 def delete_volunteer(volunteer_id):
     cur = mysql.connection.cursor()
-    cur.execute("SELECT first_name, last_name FROM volunteer WHERE volunteer_id=%s", (volunteer_id,))
-    vol = cur.fetchone()
+    vol = admin_repo.volunteer_name(cur, volunteer_id)
     if vol:
-        cur.execute("DELETE FROM volunteer WHERE volunteer_id=%s", (volunteer_id,))
+        signups.release_for_volunteer(cur, volunteer_id)
+        admin_repo.delete_volunteer(cur, volunteer_id)
         mysql.connection.commit()
         flash(f"Volunteer {vol[0]} {vol[1]} deleted.", "success")
     else:
@@ -203,8 +204,7 @@ def delete_volunteer(volunteer_id):
 @admin_required
 def view_organizations():
     cur = mysql.connection.cursor()
-    cur.execute("SELECT org_id, name, email, phone, address, representative FROM organization")
-    orgs = cur.fetchall()
+    orgs = admin_repo.all_organizations(cur)
     cur.close()
     return render_template('view_organizations.html', orgs=orgs)
 
@@ -228,13 +228,10 @@ def add_org():
 
     cur = mysql.connection.cursor()
     try:
-        cur.execute("""
-            INSERT INTO organization
-            (name, email, password, phone, representative, address)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (name, email,
-              generate_password_hash(pw),
-              phone or None, rep or None, addr or None))
+        accounts.create_organization(
+            cur, name, email, generate_password_hash(pw),
+            phone or None, addr or None, rep or None
+        )
         mysql.connection.commit()
         flash(f"Organization '{name}' added successfully.", "success")
     except Exception:
@@ -253,12 +250,11 @@ def add_org():
 @admin_required
 def delete_org(org_id):
     cur = mysql.connection.cursor()
-    cur.execute("SELECT name FROM organization WHERE org_id=%s", (org_id,))
-    org = cur.fetchone()
+    org = admin_repo.organization_name(cur, org_id)
     if org:
-        cur.execute("DELETE FROM organization WHERE org_id=%s", (org_id,))
+        admin_repo.delete_organization(cur, org_id)
         mysql.connection.commit()
-        flash(f"Organization '{org[0]}' deleted.", "success")
+        flash(f"Organization '{org}' deleted.", "success")
     else:
         flash("Organization not found.", "danger")
     cur.close()
@@ -272,8 +268,7 @@ def delete_org(org_id):
 @admin_required
 def manage_activities():
     cur = mysql.connection.cursor()
-    cur.execute("SELECT activity_id, name, type, place, start_date, end_date, org_id FROM activity")
-    activities = cur.fetchall()
+    activities = admin_repo.all_activities(cur)
     cur.close()
     return render_template('manage_activities.html', activities=activities)
 
@@ -285,12 +280,11 @@ def manage_activities():
 @admin_required
 def delete_activity(activity_id):
     cur = mysql.connection.cursor()
-    cur.execute("SELECT name FROM activity WHERE activity_id=%s", (activity_id,))
-    act = cur.fetchone()
+    act = admin_repo.activity_name(cur, activity_id)
     if act:
-        cur.execute("DELETE FROM activity WHERE activity_id=%s", (activity_id,))
+        admin_repo.delete_activity(cur, activity_id)
         mysql.connection.commit()
-        flash(f"Activity '{act[0]}' deleted.", "success")
+        flash(f"Activity '{act}' deleted.", "success")
     else:
         flash("Activity not found.", "danger")
     cur.close()
@@ -1,8 +1,11 @@
-from flask import Flask, render_template, request, redirect, session, flash
+from flask import Flask, render_template, request, redirect, session, flash, jsonify
 from config import Config
 from db import mysql
 from werkzeug.security import generate_password_hash, check_password_hash
-import requests
+from recaptcha import verifier
+from repository import accounts
+from vocabulary import vocabulary
+import migrations
 import os
 
 from admin.routes import admin_bp
@@ -21,6 +24,8 @@ app.config['MAX_CONTENT_LENGTH'] = 2 * 1024 * 1024  # 2 MB max upload
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 mysql.init_app(app)
+verifier.init_app(app)
+migrations.init_app(app)
 
 # ==========================
 # Register blueprints
@@ -43,19 +48,9 @@ def index():
 def login():
     if request.method == "POST":
 
-        # reCAPTCHA verification
-        recaptcha_response = request.form.get("g-recaptcha-response")
-        payload = {
-            "secret": app.config["RECAPTCHA_SECRET"],
-            "response": recaptcha_response
-        }
-        r = requests.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data=payload
-        )
-        result = r.json()
-
-        if not result.get("success"):
+        # reCAPTCHA verification (pooled, time-boxed, see recaptcha.py)
+        if not verifier.verify(request.form.get("g-recaptcha-response"),
+                               request.remote_addr):
             flash("reCAPTCHA verification failed", "error")
             return redirect("/login")
 
@@ -64,28 +59,16 @@ def login():
         password = request.form["password"]
 
         cur = mysql.connection.cursor()
-
-        if role == "volunteer":
-            cur.execute(
-                "SELECT volunteer_id, password FROM volunteer WHERE email=%s",
-                (email,)
-            )
-        else:
-            cur.execute(
-                "SELECT org_id, password FROM organization WHERE email=%s",
-                (email,)
-            )
-
-        user = cur.fetchone()
+        user = accounts.find_credentials(cur, role, email)
         cur.close()
 
-        if user and check_password_hash(user[1], password):
-            session["user_id"] = user[0]
+        if user and check_password_hash(user.password, password):
+            session["user_id"] = user.id
             session["role"] = role
             if role == "volunteer":
-                session["volunteer_id"] = user[0]
+                session["volunteer_id"] = user.id
             else:
-                session["org_id"] = user[0]
+                session["org_id"] = user.id
             return redirect(f"/{role}/dashboard")
 
         flash("Invalid email or password", "error")
@@ -100,19 +83,9 @@ def login():
 def register():
     if request.method == "POST":
 
-        # reCAPTCHA verification
-        recaptcha_response = request.form.get("g-recaptcha-response")
-        payload = {
-            "secret": app.config["RECAPTCHA_SECRET"],
-            "response": recaptcha_response
-        }
-        r = requests.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data=payload
-        )
-        result = r.json()
-
-        if not result.get("success"):
+        # reCAPTCHA verification (pooled, time-boxed, see recaptcha.py)
+        if not verifier.verify(request.form.get("g-recaptcha-response"),
+                               request.remote_addr):
             flash("reCAPTCHA verification failed", "error")
             return redirect("/register")
 
@@ -125,12 +98,7 @@ def register():
         # ==========================
         # CHECK DUPLICATE EMAIL
         # ==========================
-        if role == "volunteer":
-            cur.execute("SELECT volunteer_id FROM volunteer WHERE email=%s", (email,))
-        else:
-            cur.execute("SELECT org_id FROM organization WHERE email=%s", (email,))
-
-        if cur.fetchone():
+        if accounts.email_taken(cur, role, email):
             cur.close()
             flash("Email already registered", "warning")
             return redirect("/register")
@@ -144,11 +112,8 @@ def register():
             gender     = request.form.get("gender")
             phone      = request.form.get("phone")
 
-            cur.execute("""
-                INSERT INTO volunteer
-                (first_name, last_name, email, password, gender, phone)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (first_name, last_name, email, password, gender, phone))
+            accounts.create_volunteer(cur, first_name, last_name, email,
+                                      password, gender, phone)
 
         else:
             name           = request.form["name"]
@@ -156,11 +121,8 @@ def register():
             phone          = request.form.get("org_phone")
             address        = request.form.get("address")
 
-            cur.execute("""
-                INSERT INTO organization
-                (name, email, password, phone, address, representative)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (name, email, password, phone, address, representative))
+            accounts.create_organization(cur, name, email, password,
+                                         phone, address, representative)
 
         mysql.connection.commit()
         cur.close()
@@ -179,6 +141,19 @@ def logout():
     flash("Logged out successfully", "success")
     return redirect("/")
 
+# ==========================
+# SKILL AUTOCOMPLETE  (skill fields on every dashboard)
+# ==========================
+@app.route("/skills/suggest")
+def suggest_skills():
+    if not any(k in session for k in ("user_id", "volunteer_id", "org_id", "admin_id")):
+        return jsonify(error="login required"), 401
+
+    cur = mysql.connection.cursor()
+    skills = vocabulary.suggest(cur, request.args.get("q", ""))
+    cur.close()
+    return jsonify(skills=skills)
+
 # ==========================
 # RUN
 # ==========================
@@ -0,0 +1,584 @@
+# ================================================================
+# bench/run.py  — route-level benchmark
+#
+#   python -m bench.run [-n 50] [--only admin.] [--baseline bench/baseline.json]
+#                       [--save] [--tolerance 0.2]
+#
+# Drives every route of app.py and the three blueprints through the
+# Flask test client against the database in MYSQL_* (seed it first
+# with bench.seed). For each route it reports p50/p95/p99 latency,
+# queries per request (read from the Server-Timing header querylog
+# adds), non-2xx/3xx responses and the process peak RSS after the
+# route ran.
+#
+# With --baseline the run is compared to a stored report and any
+# route whose p95 or query count grew by more than --tolerance is
+# listed; the exit status is 1 when there is a regression. --save
+# writes the run as the new baseline.
+#
+# Routes that write use rows the run created itself or fail
+# validation on purpose (wrong current password), so the seeded data
+# is left as it was. RunRows sets up an organization, volunteers,
+# activities and sign-ups for the run (slots partly taken, a waitlist
+# behind them) and deletes them through the admin repository at the
+# end, keeping the summary counters right; rows the add routes create
+# are consumed by the delete routes. Run positions require
+# FIXTURE_SKILL, which only run volunteers hold, so the notification
+# jobs they enqueue reach no seeded volunteer.
+# ================================================================
+
+import argparse
+import datetime
+import io
+import json
+import os
+import random
+import re
+import resource
+import statistics
+import sys
+import time
+
+os.environ.setdefault("RECAPTCHA_BACKEND", "stub")
+
+from bench.seed import BENCH_ADMIN, BENCH_PASSWORD  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 1x1 transparent PNG for the upload routes
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63000100000500010d0a2db40000000049454e44ae426082"
+)
+
+_SERVER_TIMING = re.compile(r'desc="(\d+) queries"')
+
+FIXTURE_SKILL = "bench fixture"
+
+
+# ── Fixtures ─────────────────────────────────────────────────────
+class Fixtures:
+    """Ids of seeded rows to aim the routes at, sampled once per run."""
+
+    def __init__(self, cur, rng, sample=200):
+        self.rng = rng
+
+        def ids(sql):
+            cur.execute(sql, (sample,))
+            return [r[0] for r in cur.fetchall()]
+
+        self.volunteers = ids("SELECT volunteer_id FROM volunteer "
+                              "WHERE email LIKE 'vol%%@bench.test' ORDER BY RAND() LIMIT %s")
+        self.orgs       = ids("SELECT org_id FROM organization "
+                              "WHERE email LIKE 'org%%@bench.test' ORDER BY RAND() LIMIT %s")
+        cur.execute("""
+            SELECT a.activity_id, a.org_id, MIN(p.position_id)
+            FROM activity a JOIN activity_position p ON p.activity_id = a.activity_id
+            WHERE a.activity_id IN (
+                SELECT activity_id FROM (
+                    SELECT activity_id FROM activity ORDER BY RAND() LIMIT %s
+                ) s
+            )
+            GROUP BY a.activity_id, a.org_id
+        """, (sample,))
+        self.activities = cur.fetchall()
+        cur.execute("SELECT admin_id FROM admin WHERE username=%s", (BENCH_ADMIN,))
+        row = cur.fetchone()
+        self.admin_id = row[0] if row else None
+        self.created  = {}      # rows this run added, for the delete routes
+        self.run      = None    # RunRows, for the routes that write
+
+        if not (self.volunteers and self.orgs and self.activities and self.admin_id):
+            raise SystemExit("no seeded data found, run `python -m bench.seed` first")
+
+    def volunteer(self):
+        return self.rng.choice(self.volunteers)
+
+    def org(self):
+        return self.rng.choice(self.orgs)
+
+    def activity(self):
+        """(activity_id, org_id, position_id)"""
+        return self.rng.choice(self.activities)
+
+
+
+class RunRows:
+    """
+    Rows the write routes act on, created for one run: `n` volunteers
+    (one per request, so every join is a first sign-up) and an
+    organization owning a roster activity, whose sign-ups hold three
+    quarters of its slots with the rest waitlisted, and an empty
+    activity to join.
+    """
+
+    def __init__(self, cur, tag, n):
+        import counters
+        from notifications import inbox, templates
+        from skill_index import sync_activity_skills, sync_volunteer_skills
+
+        n = max(n, 2)
+        skills = f"teamwork, {FIXTURE_SKILL}"
+        cur.execute(
+            "INSERT INTO organization (name, email, password) VALUES (%s, %s, 'x')",
+            (f"{tag} fixtures", f"{tag}.fixture-org@bench.test"),
+        )
+        self.org_id = cur.lastrowid
+
+        self.volunteers = []
+        for i in range(n):
+            cur.execute("""
+                INSERT INTO volunteer (first_name, last_name, email, password, skills)
+                VALUES ('Bench', 'Fixture', %s, 'x', %s)
+            """, (f"{tag}.fixture-{i}@bench.test", skills))
+            self.volunteers.append(cur.lastrowid)
+            sync_volunteer_skills(cur, cur.lastrowid, skills)
+
+        def activity(name, slots):
+            cur.execute("""
+                INSERT INTO activity (name, type, place, start_date, end_date, org_id,
+                                      required_skills, description)
+                VALUES (%s, 'Workshop', 'Bench Hall', '2030-01-01', '2030-01-02', %s, %s,
+                        'benchmark fixture')
+            """, (name, self.org_id, FIXTURE_SKILL))
+            aid = cur.lastrowid
+            sync_activity_skills(cur, aid, FIXTURE_SKILL)
+            cur.execute("""
+                INSERT INTO activity_position (activity_id, title, required_skills, slots)
+                VALUES (%s, 'Runner', %s, %s)
+            """, (aid, FIXTURE_SKILL, slots))
+            return aid, cur.lastrowid
+
+        holding = n * 3 // 4
+        self.roster, self.position = activity(f"{tag}.fixture-roster", holding)
+        cur.executemany("""
+            INSERT INTO volunteer_activity (volunteer_id, activity_id, position_id, status)
+            VALUES (%s, %s, %s, %s)
+        """, [(vid, self.roster, self.position, "pending" if k < holding else "waitlisted")
+              for k, vid in enumerate(self.volunteers)])
+        cur.execute("UPDATE activity_position SET filled = %s WHERE position_id = %s",
+                    (holding, self.position))
+        cur.execute("SELECT id FROM volunteer_activity WHERE activity_id = %s ORDER BY id",
+                    (self.roster,))
+        self.signups = [r[0] for r in cur.fetchall()]
+
+        # Half the joins get a slot, the rest are waitlisted
+        self.join_activity, _ = activity(f"{tag}.fixture-join", n // 2)
+
+        # Something for mark_read to clear
+        inbox.add_direct(cur, [
+            (vid, self.roster, self.position, templates.APPROVED, None)
+            for vid in self.volunteers
+        ])
+        counters.bump(cur, organizations=1, volunteers=n, activities=2, signups=n)
+
+    def volunteer(self, i):
+        return self.volunteers[i % len(self.volunteers)]
+
+    def signup(self, i):
+        """(volunteer_activity id, activity_id, org_id)"""
+        return self.signups[i % len(self.signups)], self.roster, self.org_id
+
+    def delete(self, cur, upload_dir):
+        from repository import admin as admin_repo
+
+        cur.execute(f"""
+            SELECT profile_picture FROM volunteer
+            WHERE volunteer_id IN ({', '.join(['%s'] * len(self.volunteers))})
+            UNION ALL
+            SELECT profile_picture FROM organization WHERE org_id = %s
+        """, (*self.volunteers, self.org_id))
+        for (picture,) in cur.fetchall():
+            path = os.path.join(upload_dir, picture or "")
+            if picture and os.path.exists(path):
+                os.remove(path)
+
+        # The activities and their sign-ups go with the organization
+        admin_repo.delete_organization(cur, self.org_id)
+        for vid in self.volunteers:
+            admin_repo.delete_volunteer(cur, vid)
+
+
+# ── Sessions ─────────────────────────────────────────────────────
+def as_volunteer(client, vid):
+    with client.session_transaction() as s:
+        s.clear()
+        s.update(volunteer_id=vid, user_id=vid, role="volunteer")
+
+
+def as_org(client, org_id):
+    with client.session_transaction() as s:
+        s.clear()
+        s.update(org_id=org_id, user_id=org_id, role="organization")
+
+
+def as_admin(client, fx):
+    with client.session_transaction() as s:
+        s.clear()
+        s.update(admin_id=fx.admin_id, admin_name=BENCH_ADMIN)
+
+
+def anonymous(client):
+    with client.session_transaction() as s:
+        s.clear()
+
+
+# ── Scenarios ────────────────────────────────────────────────────
+# Each scenario is (name, prepare) where prepare(client, fx, i) sets
+# up the session and returns (method, path, kwargs) for request i.
+def _form(**data):
+    return {"data": data, "headers": {"Referer": "/"}}
+
+
+def _upload(field):
+    return {"data": {field: (io.BytesIO(PNG), "bench.png")},
+            "content_type": "multipart/form-data", "headers": {"Referer": "/"}}
+
+
+def _created(cur, sql, pattern):
+    cur.execute(sql, (pattern,))
+    return [r[0] for r in cur.fetchall()]
+
+
+def scenarios(run_tag):
+    tag = f"bench-run-{run_tag}"
+    # A page a few weeks into the feed, as after some scrolling
+    feed_cursor = f"{datetime.date.today() + datetime.timedelta(days=21)}.0"
+
+    def vol(method, path, **kw):
+        def prepare(client, fx, i):
+            vid = fx.volunteer()
+            as_volunteer(client, vid)
+            return method, path.format(vid=vid, i=i, aid=fx.activity()[0]), kw
+        return prepare
+
+    def own_vol(method, path, **kw):
+        # Writes, as one of the run's volunteers
+        def prepare(client, fx, i):
+            as_volunteer(client, fx.run.volunteer(i))
+            return method, path.format(aid=fx.run.join_activity), kw
+        return prepare
+
+    def org(method, path, **kw):
+        def prepare(client, fx, i):
+            aid, org_id, pos_id = fx.activity()
+            as_org(client, org_id)
+            return method, path.format(aid=aid, pos=pos_id, i=i), kw
+        return prepare
+
+    def own_org(method, path, **kw):
+        # Writes, as the run's organization on its roster activity
+        def prepare(client, fx, i):
+            as_org(client, fx.run.org_id)
+            return method, path.format(aid=fx.run.roster, pos=fx.run.position), kw
+        return prepare
+
+    def signup(method, path, body):
+        # Routes on one of the run's sign-ups, as the run's organization
+        def prepare(client, fx, i):
+            sid, aid, org_id = fx.run.signup(i)
+            as_org(client, org_id)
+            kw = {"headers": {"Referer": "/"}}
+            if body == "form":
+                kw["data"] = {"attendance": "1", "rating": "4"}
+            elif body == "grid":
+                kw["json"] = {"rows": [{"id": sid, "attendance": i % 2 == 0, "rating": 4}]}
+            else:
+                kw["json"] = {"decisions": {str(sid): ("approved", "rejected")[i % 2]}}
+            return method, path.format(sid=sid, aid=aid), kw
+        return prepare
+
+    def admin(method, path, **kw):
+        def prepare(client, fx, i):
+            as_admin(client, fx)
+            return method, path.format(i=i), kw
+        return prepare
+
+    def public(method, path, **kw):
+        def prepare(client, fx, i):
+            anonymous(client)
+            return method, path, kw
+        return prepare
+
+    def login(path, **fields):
+        def prepare(client, fx, i):
+            anonymous(client)
+            data = {k: v.format(vid=fx.volunteer(), org=fx.org()) for k, v in fields.items()}
+            data.update(password=BENCH_PASSWORD)
+            data["g-recaptcha-response"] = "bench"
+            return "POST", path, {"data": data}
+        return prepare
+
+    def per_item(kind):
+        # Delete routes consume the rows the matching add route created
+        def prepare(client, fx, i):
+            as_admin(client, fx)
+            pending = fx.created[kind]
+            target = pending.pop() if pending else 0
+            return "POST", f"/admin/{kind}/delete/{target}", {}
+        return prepare
+
+    def register(client, fx, i):
+        anonymous(client)
+        return "POST", "/register", {"data": {
+            "role": "volunteer", "email": f"{tag}-reg-{i}@bench.test",
+            "password": BENCH_PASSWORD, "first_name": "Bench", "last_name": "Register",
+            "g-recaptcha-response": "bench",
+        }}
+
+    def create_activity(client, fx, i):
+        as_org(client, fx.run.org_id)
+        return "POST", "/organization/create_activity", _form(
+            name=f"{tag}-{i}", type="Workshop", place="Bench Hall",
+            start_date="2030-01-01", end_date="2030-01-02",
+            reg_open="2029-12-01T09:00", reg_close="2029-12-31T23:59",
+            description="benchmark", **{
+                "position_title[]": "Runner", "position_skills[]": FIXTURE_SKILL,
+                "position_slots[]": "3",
+            })
+
+    return [
+        # app.py
+        ("index",                     public("GET", "/")),
+        ("login.get",                 public("GET", "/login")),
+        ("login.post.volunteer",      login("/login", role="volunteer", email="vol{vid}@bench.test")),
+        ("login.post.organization",   login("/login", role="organization", email="org{org}@bench.test")),
+        ("register.get",              public("GET", "/register")),
+        ("register.post.volunteer",   register),
+        ("logout",                    public("GET", "/logout")),
+        # volunteer blueprint
+        ("volunteer.login.get",       public("GET", "/volunteer/login")),
+        ("volunteer.login.post",      login("/volunteer/login", email="vol{vid}@bench.test")),
+        ("volunteer.dashboard",       vol("GET", "/volunteer/dashboard")),
+        ("volunteer.feed",            vol("GET", "/volunteer/feed?cursor=" + feed_cursor)),
+        ("volunteer.search",          vol("GET", "/volunteer/search?q=first+aid")),
+        ("volunteer.skills.update",   own_vol("POST", "/volunteer/skills/update",
+                                          **_form(skills=f"teamwork, first aid, {FIXTURE_SKILL}"))),
+        ("volunteer.picture",         own_vol("POST", "/volunteer/profile/picture",
+                                          **_upload("profile_picture"))),
+        ("volunteer.password",        vol("POST", "/volunteer/profile/password",
+                                          **_form(current_password="wrong", new_password="x",
+                                                  confirm_password="x"))),
+        ("volunteer.digest",          own_vol("POST", "/volunteer/profile/digest",
+                                          **_form(digest_email="on"))),
+        ("volunteer.notifications",   vol("GET", "/volunteer/notifications")),
+        ("volunteer.unread",          vol("GET", "/volunteer/notifications/unread")),
+        ("volunteer.mark_read",       own_vol("POST", "/volunteer/notifications/read")),
+        ("volunteer.stream",          vol("GET", "/volunteer/stream", buffered=False)),
+        ("volunteer.join",            own_vol("GET", "/volunteer/join/{aid}")),
+        # organization blueprint
+        ("organization.login.get",    public("GET", "/organization/login")),
+        ("organization.login.post",   login("/organization/login", email="org{org}@bench.test")),
+        ("organization.dashboard",    org("GET", "/organization/dashboard")),
+        ("organization.profile",      own_org("POST", "/organization/profile/update",
+                                          **_form(name="Bench Org", phone="9000000000",
+                                                  address="Bench", representative="Bench"))),
+        ("organization.picture",      own_org("POST", "/organization/profile/picture",
+                                          **_upload("picture"))),
+        ("organization.picture.rm",   own_org("POST", "/organization/profile/remove_picture",
+                                          **_form())),
+        ("organization.password",     org("POST", "/organization/profile/password",
+                                          **_form(current_password="wrong", new_password="x",
+                                                  confirm_password="x"))),
+        ("organization.create",       create_activity),
+        ("organization.volunteers",   org("GET", "/organization/volunteers/{aid}")),
+        ("organization.stream",       org("GET", "/organization/volunteers/{aid}/stream",
+                                          buffered=False)),
+        ("organization.update",       signup("POST", "/organization/update/{sid}", "form")),
+        ("organization.attendance",   signup("POST", "/organization/attendance/{aid}", "grid")),
+        ("organization.status",       signup("POST", "/organization/volunteers/{aid}/status",
+                                             "decisions")),
+        ("organization.notify",       own_org("POST", "/organization/notify/{aid}/{pos}", **_form())),
+        ("organization.announce",     own_org("POST", "/organization/announce/{aid}",
+                                          **_form(message="Benchmark announcement"))),
+        # admin blueprint
+        ("admin.login.get",           public("GET", "/admin/login")),
+        ("admin.login.post",          public("POST", "/admin/login", data={
+                                          "username": BENCH_ADMIN, "password": BENCH_PASSWORD})),
+        ("admin.dashboard",           admin("GET", "/admin/dashboard")),
+        ("admin.rows.volunteers",     admin("GET", "/admin/volunteers/rows?format=html&sort=name&q=a")),
+        ("admin.rows.organizations",  admin("GET", "/admin/organizations/rows?format=json")),
+        ("admin.rows.activities",     admin("GET", "/admin/activities/rows?format=html&sort=start")),
+        ("admin.search.volunteers",   admin("GET", "/admin/volunteers/rows?format=html&q=first+aid")),
+        ("admin.search.activities",   admin("GET", "/admin/activities/rows?format=json&q=workshop")),
+        ("admin.volunteers",          admin("GET", "/admin/volunteers")),
+        ("admin.organizations",       admin("GET", "/admin/organizations")),
+        ("admin.activities",          admin("GET", "/admin/activities")),
+        ("admin.volunteer.add",       admin("POST", "/admin/volunteer/add", **_form(
+                                          first_name="Bench", last_name="Run",
+                                          email=f"{tag}-{{i}}@bench.test", password="x",
+                                          skills="teamwork, logistics"))),
+        ("admin.volunteer.delete",    per_item("volunteer")),
+        ("admin.org.add",             admin("POST", "/admin/org/add", **_form(
+                                          name=f"{tag}-{{i}}", email=f"{tag}-org-{{i}}@bench.test",
+                                          password="x"))),
+        ("admin.org.delete",          per_item("org")),
+        ("admin.activity.delete",     per_item("activity")),
+        ("admin.logout",              admin("GET", "/admin/logout")),
+    ], tag
+
+
+def _request_kwargs(kw, i):
+    """Per-request copy of a scenario's kwargs: {i} filled, uploads rewound."""
+    kw = dict(kw)
+    data = kw.get("data")
+    if isinstance(data, dict):
+        kw["data"] = {
+            k: (v.format(i=i) if isinstance(v, str) else
+                (io.BytesIO(v[0].getvalue()), v[1]) if isinstance(v, tuple) else v)
+            for k, v in data.items()
+        }
+    return kw
+
+
+# ── Runner ───────────────────────────────────────────────────────
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scenario(app, fx, name, prepare, n):
+    client = app.test_client()
+    timings, queries, errors = [], [], 0
+    for i in range(n):
+        method, path, kw = prepare(client, fx, i)
+        kw = _request_kwargs(kw, i)
+        buffered = kw.pop("buffered", True)
+
+        start = time.perf_counter()
+        resp = client.open(path, method=method, buffered=buffered, **kw)
+        elapsed = time.perf_counter() - start
+        resp.close()
+
+        timings.append(elapsed * 1000)
+        m = _SERVER_TIMING.search(resp.headers.get("Server-Timing", ""))
+        queries.append(int(m.group(1)) if m else 0)
+        if resp.status_code >= 400:
+            errors += 1
+
+    timings.sort()
+    return {
+        "n":        n,
+        "p50_ms":   round(percentile(timings, 50), 2),
+        "p95_ms":   round(percentile(timings, 95), 2),
+        "p99_ms":   round(percentile(timings, 99), 2),
+        "queries":  round(statistics.mean(queries), 1),
+        "errors":   errors,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Routes whose p95 or queries/request grew past the tolerance."""
+    regressions = []
+    for name, now in current["routes"].items():
+        before = baseline.get("routes", {}).get(name)
+        if not before:
+            continue
+        for metric in ("p95_ms", "queries"):
+            old, new = before[metric], now[metric]
+            if new > old * (1 + tolerance) and new - old > (1.0 if metric == "p95_ms" else 0):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.run")
+    parser.add_argument("-n", "--requests", type=int, default=50,
+                        help="requests per route")
+    parser.add_argument("--only", help="run routes whose name starts with this")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--json", help="also write this run's report to a file")
+    args = parser.parse_args(argv)
+
+    from app import app
+    from db import mysql
+
+    # Rows created by this run are named after it
+    routes, tag = scenarios(str(int(time.time())))
+
+    rng = random.Random(args.seed)
+    with app.app_context():
+        cur = mysql.connection.cursor()
+        fx  = Fixtures(cur, rng)
+        fx.run = RunRows(cur, tag, args.requests)
+        mysql.connection.commit()
+        cur.close()
+
+    try:
+        return _run(app, fx, routes, tag, args)
+    finally:
+        with app.app_context():
+            cur = mysql.connection.cursor()
+            fx.run.delete(cur, app.config.get("UPLOAD_FOLDER", "static/uploads/avatars"))
+            mysql.connection.commit()
+            cur.close()
+
+
+def _run(app, fx, routes, tag, args):
+    report = {"requests": args.requests, "routes": {}}
+    print(f"{'route':<28} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'errors':>6} {'rss MB':>8}")
+    for name, prepare in routes:
+        if args.only and not name.startswith(args.only):
+            continue
+        if name.endswith(".delete"):
+            _collect_created(app, fx, tag)
+        result = run_scenario(app, fx, name, prepare, args.requests)
+        report["routes"][name] = result
+        print(f"{name:<28} {result['p50_ms']:>8} {result['p95_ms']:>8} {result['p99_ms']:>8} "
+              f"{result['queries']:>8} {result['errors']:>6} {result['peak_rss_mb']:>8}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name}: {metric} {old} -> {new}")
+        if regressions:
+            status = 1
+        else:
+            print(f"no regressions against {args.baseline}")
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+    return status
+
+
+def _collect_created(app, fx, tag):
+    from db import mysql
+
+    with app.app_context():
+        cur = mysql.connection.cursor()
+        fx.created = {
+            "volunteer": _created(cur, "SELECT volunteer_id FROM volunteer WHERE email LIKE %s",
+                                  f"{tag}-%@bench.test"),
+            "org":       _created(cur, "SELECT org_id FROM organization WHERE email LIKE %s",
+                                  f"{tag}-org-%@bench.test"),
+            "activity":  _created(cur, "SELECT activity_id FROM activity WHERE name LIKE %s",
+                                  f"{tag}-%"),
+        }
+        cur.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+# ================================================================
+# bench/rush.py  — registration-open rush
+#
+#   python -m bench.rush [--clients 1000] [--url http://127.0.0.1:8000]
+#                        [--spawn] [--workers 4] [--json report.json]
+#
+# Reproduces the moment a popular activity's reg_open arrives: a
+# fresh activity is created with reg_open a few seconds ahead, every
+# client logs in as a different seeded volunteer beforehand, then all
+# of them request /volunteer/join/<id> at once (--repeat sends the
+# request again, like a double click).
+#
+# Runs against a real gunicorn server: either one already listening
+# on --url, or one started with --spawn using the production worker
+# class. The report gives throughput, latency percentiles, error
+# rate, sign-ups actually recorded, and the InnoDB row-lock waits and
+# deadlocks that happened during the burst, with the peak number of
+# transactions waiting on volunteer_activity locks at one time.
+#
+# Exit status is 1 when the error rate exceeds --max-error-rate, a
+# deadlock occurred or a position ended up overbooked or with a
+# filled counter that disagrees with its sign-ups, so it can gate a
+# release.
+# ================================================================
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+import counters
+from bench.run import percentile
+from bench.seed import BENCH_PASSWORD
+from repository import admin as admin_repo
+
+LEAD_SECONDS = 3        # reg_open is this far ahead once every client is logged in
+
+
+# ── Database side ────────────────────────────────────────────────
+def _status(cur):
+    cur.execute("SHOW GLOBAL STATUS WHERE Variable_name IN "
+                "('Innodb_row_lock_waits', 'Innodb_row_lock_time', 'Innodb_deadlocks')")
+    counters = {k: int(v) for k, v in cur.fetchall()}
+    if "Innodb_deadlocks" not in counters:
+        # MySQL 8 only exposes the deadlock count through INNODB_METRICS
+        try:
+            cur.execute("SELECT `count` FROM information_schema.INNODB_METRICS "
+                        "WHERE name = 'lock_deadlocks'")
+            row = cur.fetchone()
+            counters["Innodb_deadlocks"] = int(row[0]) if row else 0
+        except Exception:
+            counters["Innodb_deadlocks"] = 0
+    return counters
+
+
+def _latest_deadlock(cur):
+    cur.execute("SHOW ENGINE INNODB STATUS")
+    text = cur.fetchone()[2]
+    marker = "LATEST DETECTED DEADLOCK"
+    if marker not in text:
+        return None
+    section = text.split(marker, 1)[1].split("------------\nTRANSACTIONS", 1)[0]
+    return section.strip()
+
+
+def prepare(cur, clients, lead):
+    """Create the target activity and pick `clients` volunteers who may join it."""
+    cur.execute("SELECT org_id FROM organization ORDER BY org_id LIMIT 1")
+    org_id = cur.fetchone()[0]
+    now = datetime.datetime.now()
+    reg_open = now + datetime.timedelta(seconds=lead)
+    cur.execute("""
+        INSERT INTO activity
+        (name, type, place, start_date, end_date, org_id, description, reg_open, reg_close)
+        VALUES (%s, 'Cultural', 'Main Auditorium', %s, %s, %s, 'registration rush', %s, %s)
+    """, (f"bench-rush-{int(now.timestamp())}", now.date() + datetime.timedelta(days=30),
+          now.date() + datetime.timedelta(days=31), org_id, reg_open,
+          reg_open + datetime.timedelta(days=7)))
+    activity_id = cur.lastrowid
+    counters.bump(cur, activities=1)
+    cur.executemany("""
+        INSERT INTO activity_position (activity_id, title, required_skills, slots)
+        VALUES (%s, %s, '', %s)
+    """, [(activity_id, "Usher", 50), (activity_id, "Stage Crew", 20),
+          (activity_id, "Registration Desk", 10)])
+
+    # join_activity requires at least two skills
+    cur.execute("""
+        SELECT v.volunteer_id, v.email
+        FROM volunteer v
+        JOIN volunteer_skill vs ON vs.volunteer_id = v.volunteer_id
+        WHERE v.email LIKE 'vol%%@bench.test'
+        GROUP BY v.volunteer_id
+        HAVING COUNT(*) >= 2
+        LIMIT %s
+    """, (clients,))
+    volunteers = cur.fetchall()
+    return activity_id, reg_open, volunteers
+
+
+def count_signups(cur, activity_id):
+    """Sign-up totals, and positions whose slot count was exceeded."""
+    cur.execute("""
+        SELECT COUNT(*), COUNT(DISTINCT volunteer_id),
+               COALESCE(SUM(status = 'waitlisted'), 0)
+        FROM volunteer_activity WHERE activity_id = %s
+    """, (activity_id,))
+    rows, volunteers, waitlisted = cur.fetchone()
+    cur.execute("""
+        SELECT p.position_id
+        FROM activity_position p
+        LEFT JOIN volunteer_activity va
+          ON va.position_id = p.position_id AND va.status IN ('pending', 'approved')
+        WHERE p.activity_id = %s
+        GROUP BY p.position_id, p.slots, p.filled
+        HAVING COUNT(va.id) > p.slots OR COUNT(va.id) <> p.filled
+    """, (activity_id,))
+    return {"signup_rows": rows, "signup_volunteers": volunteers,
+            "waitlisted": int(waitlisted),
+            "inconsistent_positions": [r[0] for r in cur.fetchall()]}
+
+
+class LockMonitor(threading.Thread):
+    """Polls performance_schema for transactions waiting on volunteer_activity."""
+
+    SQL = """
+        SELECT COUNT(*)
+        FROM performance_schema.data_lock_waits w
+        JOIN performance_schema.data_locks l
+          ON l.ENGINE_LOCK_ID = w.REQUESTING_ENGINE_LOCK_ID
+        WHERE l.OBJECT_NAME = 'volunteer_activity'
+    """
+
+    def __init__(self, pool, interval=0.05):
+        super().__init__(daemon=True)
+        self.pool      = pool
+        self.interval  = interval
+        self.peak      = 0
+        self.supported = True
+        self._done     = threading.Event()
+
+    def run(self):
+        conn = self.pool.acquire()
+        try:
+            with conn.cursor() as cur:
+                while not self._done.is_set():
+                    try:
+                        cur.execute(self.SQL)
+                    except Exception:
+                        self.supported = False  # MariaDB / performance_schema off
+                        return
+                    self.peak = max(self.peak, cur.fetchone()[0])
+                    self._done.wait(self.interval)
+        finally:
+            self.pool.release(conn)
+
+    def stop(self):
+        self._done.set()
+        self.join(timeout=5)
+
+
+# ── Client side ──────────────────────────────────────────────────
+class Client(threading.Thread):
+
+    def __init__(self, base_url, email, activity_id, start, repeat, timeout):
+        super().__init__(daemon=True)
+        self.base_url    = base_url
+        self.email       = email
+        self.activity_id = activity_id
+        self.start_event = start
+        self.repeat      = repeat
+        self.timeout     = timeout
+        self.session     = requests.Session()
+        self.ready       = False
+        self.results     = []   # (started_at, latency_s, status or exception name)
+
+    def login(self):
+        r = self.session.post(
+            f"{self.base_url}/volunteer/login",
+            data={"email": self.email, "password": BENCH_PASSWORD},
+            allow_redirects=False, timeout=30,
+        )
+        self.ready = r.status_code == 302 and "dashboard" in r.headers.get("Location", "")
+        return self.ready
+
+    def run(self):
+        self.start_event.wait()
+        url = f"{self.base_url}/volunteer/join/{self.activity_id}"
+        for _ in range(self.repeat):
+            t0 = time.perf_counter()
+            try:
+                r = self.session.get(url, allow_redirects=False, timeout=self.timeout)
+                outcome = r.status_code
+            except requests.RequestException as e:
+                outcome = type(e).__name__
+            self.results.append((t0, time.perf_counter() - t0, outcome))
+
+
+def _login_all(clients, parallel=32):
+    pending = list(clients)
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                c = pending.pop()
+            try:
+                c.login()
+            except requests.RequestException:
+                pass
+
+    threads = [threading.Thread(target=worker) for _ in range(parallel)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return [c for c in clients if c.ready]
+
+
+# ── Server ───────────────────────────────────────────────────────
+def spawn_gunicorn(port, workers):
+    env = dict(os.environ, RECAPTCHA_BACKEND="stub")
+    proc = subprocess.Popen([
+        sys.executable, "-m", "gunicorn", "app:app",
+        "--bind", f"127.0.0.1:{port}",
+        "--worker-class", "gevent", "--worker-connections", "1000",
+        "--workers", str(workers), "--log-level", "warning",
+    ], env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{url}/login", timeout=1)
+            return proc, url
+        except requests.RequestException:
+            time.sleep(0.3)
+    proc.terminate()
+    raise SystemExit("gunicorn did not come up within 30s")
+
+
+# ── Report ───────────────────────────────────────────────────────
+def summarize(clients, before, after, monitor, signups, deadlock):
+    results = [r for c in clients for r in c.results]
+    latencies = sorted(r[1] * 1000 for r in results)
+    ok = sum(1 for r in results if r[2] == 302)
+    first = min(r[0] for r in results)
+    last  = max(r[0] + r[1] for r in results)
+    window = max(last - first, 1e-6)
+
+    outcomes = {}
+    for r in results:
+        outcomes[str(r[2])] = outcomes.get(str(r[2]), 0) + 1
+
+    return {
+        "clients":         len(clients),
+        "requests":        len(results),
+        "duration_s":      round(window, 3),
+        "throughput_rps":  round(len(results) / window, 1),
+        "error_rate":      round(1 - ok / len(results), 4) if results else 0.0,
+        "outcomes":        outcomes,
+        "p50_ms":          round(percentile(latencies, 50), 1),
+        "p95_ms":          round(percentile(latencies, 95), 1),
+        "p99_ms":          round(percentile(latencies, 99), 1),
+        "max_ms":          round(latencies[-1], 1) if latencies else 0.0,
+        **signups,
+        "row_lock_waits":  after["Innodb_row_lock_waits"] - before["Innodb_row_lock_waits"],
+        "row_lock_time_ms": after["Innodb_row_lock_time"] - before["Innodb_row_lock_time"],
+        "deadlocks":       after["Innodb_deadlocks"] - before["Innodb_deadlocks"],
+        "peak_waiting_on_volunteer_activity": monitor.peak if monitor.supported else None,
+        "latest_deadlock": deadlock,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.rush")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="join requests per client (2 = double click)")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--spawn", action="store_true", help="start gunicorn for the run")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--keep", action="store_true", help="keep the rush activity afterwards")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    from app import app
+    from db import mysql
+
+    with app.app_context():
+        cur = mysql.connection.cursor()
+        activity_id, _, volunteers = prepare(cur, args.clients, LEAD_SECONDS)
+        mysql.connection.commit()
+        cur.close()
+    if len(volunteers) < args.clients:
+        print(f"only {len(volunteers)} seeded volunteers qualify, using those")
+
+    proc, url = spawn_gunicorn(args.port, args.workers) if args.spawn else (None, args.url)
+    try:
+        start = threading.Event()
+        clients = [Client(url, email, activity_id, start, args.repeat, args.timeout)
+                   for _, email in volunteers]
+        t0 = time.monotonic()
+        clients = _login_all(clients)
+        print(f"{len(clients)} clients logged in in {time.monotonic() - t0:.1f}s")
+
+        for c in clients:
+            c.start()
+        monitor = LockMonitor(mysql.pool)
+
+        with app.app_context():
+            cur = mysql.connection.cursor()
+            # Logging in takes a while; move the opening just ahead of now
+            reg_open = datetime.datetime.now() + datetime.timedelta(seconds=LEAD_SECONDS)
+            cur.execute("UPDATE activity SET reg_open=%s WHERE activity_id=%s",
+                        (reg_open, activity_id))
+            mysql.connection.commit()
+            time.sleep(max(0.0, (reg_open - datetime.datetime.now()).total_seconds()))
+            before = _status(cur)
+            monitor.start()
+            start.set()                     # registration opens
+            for c in clients:
+                c.join()
+            monitor.stop()
+            after = _status(cur)
+            mysql.connection.commit()       # fresh snapshot for the count
+            signups  = count_signups(cur, activity_id)
+            deadlock = _latest_deadlock(cur) if after["Innodb_deadlocks"] > before["Innodb_deadlocks"] else None
+            if not args.keep:
+                # Through the repository, so the summary counters drop too
+                admin_repo.delete_activity(cur, activity_id)
+                mysql.connection.commit()
+            cur.close()
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    if not clients:
+        raise SystemExit("no client could log in")
+    report = summarize(clients, before, after, monitor, signups, deadlock)
+    for key, value in report.items():
+        if key != "latest_deadlock":
+            print(f"{key:<36} {value}")
+    if deadlock:
+        print("\nlatest deadlock:\n" + deadlock)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+    failed = (report["error_rate"] > args.max_error_rate or report["deadlocks"] > 0
+              or report["inconsistent_positions"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+# ================================================================
+# bench/seed.py  — synthetic data generator
+#
+#   python -m bench.seed [--scale 1.0] [--seed 42] [--truncate]
+#
+# Fills a migrated database with deterministic fake data. At
+# --scale 1.0: 1M volunteers, 50k organizations, 200k activities
+# (1-4 positions each), ~0.9 sign-ups and ~1.5 notifications per
+# volunteer. Individual counts can be overridden (--volunteers ...).
+#
+# Skills follow a Zipf distribution over the vocabulary, so a few
+# skills are held by a large share of volunteers and the long tail
+# by very few, as in production. Activity popularity is skewed the
+# same way, which gives the rosters a realistic hot set. Sign-ups
+# never overbook a position: once its slots are held, further
+# sign-ups for it are waitlisted, as signups.join() would do.
+#
+# Every account uses the password in BENCH_PASSWORD; bench.run logs
+# in with it. Rows are written with explicit ids after the current
+# maximum, in multi-row INSERTs of CHUNK rows, one commit per chunk.
+#
+# Run it against a dedicated database only: --truncate empties every
+# table it fills.
+# ================================================================
+
+import argparse
+import datetime
+import itertools
+import logging
+import random
+import time
+
+from werkzeug.security import generate_password_hash
+
+import counters
+from db import mysql
+
+BENCH_PASSWORD = "bench-password"
+BENCH_ADMIN    = "bench-admin"
+CHUNK          = 5000
+
+DEFAULTS = dict(
+    volunteers    = 1_000_000,
+    orgs          = 50_000,
+    activities    = 200_000,
+    vocabulary    = 200,
+)
+
+BASE_SKILLS = [
+    "first aid", "teamwork", "communication", "leadership", "event planning",
+    "photography", "video editing", "social media", "public speaking",
+    "logistics", "cooking", "driving", "teaching", "tutoring", "fundraising",
+    "graphic design", "web development", "data entry", "translation",
+    "sign language", "counseling", "childcare", "elder care", "gardening",
+    "carpentry", "painting", "music", "sound engineering", "stage management",
+    "security", "crowd control", "ticketing", "customer service", "cleaning",
+    "sports coaching", "nursing", "it support", "accounting", "marketing",
+    "writing",
+]
+
+FIRST_NAMES = ["Aarav", "Aisha", "Ben", "Chen", "Diya", "Elena", "Farid", "Grace",
+               "Hiro", "Isha", "Jonas", "Kavya", "Liam", "Maya", "Noah", "Omar",
+               "Priya", "Quinn", "Rohan", "Sara", "Tariq", "Uma", "Vikram", "Wen",
+               "Yusuf", "Zara"]
+LAST_NAMES  = ["Patel", "Smith", "Khan", "Garcia", "Nguyen", "Sharma", "Müller",
+               "Kim", "Singh", "Brown", "Rossi", "Silva", "Das", "Ali", "Chen",
+               "Iyer", "Lopez", "Okafor", "Sato", "Wilson"]
+ACTIVITY_TYPES = ["Cultural", "Technical", "Sports", "Workshop", "Outreach",
+                  "Fundraiser", "Cleanup", "Conference"]
+PLACES = ["Main Auditorium", "Open Air Theatre", "Seminar Hall", "Sports Complex",
+          "Library Lawn", "Block A", "Block B", "City Park", "Community Centre"]
+POSITION_TITLES = ["Coordinator", "Usher", "Registration Desk", "Stage Crew",
+                   "Photographer", "Runner", "Hospitality", "Tech Support",
+                   "First Aid", "Security"]
+
+log = logging.getLogger(__name__)
+
+
+# ── Distributions ────────────────────────────────────────────────
+def vocabulary(size):
+    extra = (f"skill {i}" for i in itertools.count(len(BASE_SKILLS) + 1))
+    return (BASE_SKILLS + list(itertools.islice(extra, max(0, size - len(BASE_SKILLS)))))[:size]
+
+
+class Zipf:
+    """Draws indexes 0..n-1 with P(i) proportional to 1 / (i+1)^s."""
+
+    def __init__(self, rng, n, s=1.1):
+        self.rng = rng
+        self.population = range(n)
+        self.cum = list(itertools.accumulate(1 / (i + 1) ** s for i in range(n)))
+
+    def one(self):
+        return self.rng.choices(self.population, cum_weights=self.cum)[0]
+
+    def distinct(self, k):
+        k = min(k, len(self.population))
+        out = set()
+        while len(out) < k:
+            out.add(self.one())
+        return out
+
+
+# ── Writing ──────────────────────────────────────────────────────
+def _insert(table, cols, rows, chunk=CHUNK, on_chunk=None):
+    """
+    Multi-row INSERT of an iterable of tuples, one commit per chunk.
+    on_chunk(cur) runs before each commit, for dependent rows.
+    """
+    conn = mysql.connection
+    cur  = conn.cursor()
+    sql  = (f"INSERT INTO {table} ({', '.join(cols)}) "
+            f"VALUES ({', '.join(['%s'] * len(cols))})")
+    total, start = 0, time.monotonic()
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, chunk))
+        if not batch:
+            break
+        cur.executemany(sql, batch)
+        if on_chunk:
+            on_chunk(cur)
+        conn.commit()
+        total += len(batch)
+    cur.close()
+    log.info("%-20s %9d rows in %.1fs", table, total, time.monotonic() - start)
+    return total
+
+
+def _next_id(table, column):
+    cur = mysql.connection.cursor()
+    cur.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}")
+    first = cur.fetchone()[0]
+    cur.close()
+    return first
+
+
+TABLES = [  # children first, for --truncate
+    "recommendation", "recommendation_run",
+    "notification_counter", "broadcast_cursor", "broadcast_skill", "broadcast",
+    "notification_archive", "notification", "notification_job", "event_log",
+    "volunteer_activity", "activity_position", "activity_skill", "activity", "volunteer_skill",
+    "skill", "volunteer", "organization",
+]
+
+
+def truncate():
+    cur = mysql.connection.cursor()
+    cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for table in TABLES:
+        cur.execute(f"TRUNCATE TABLE {table}")
+    cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cur.close()
+
+
+# ── Generator ────────────────────────────────────────────────────
+def seed(volunteers, orgs, activities, vocabulary_size=DEFAULTS["vocabulary"],
+         random_seed=42):
+    rng   = random.Random(random_seed)
+    vocab = vocabulary(vocabulary_size)
+    zipf  = Zipf(rng, len(vocab))
+    pw    = generate_password_hash(BENCH_PASSWORD)
+    today = datetime.date.today()
+
+    cur = mysql.connection.cursor()
+    # Bulk load: the generator guarantees referential integrity itself
+    cur.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+    cur.execute("INSERT IGNORE INTO skill (name) VALUES " +
+                ", ".join(["(%s)"] * len(vocab)), vocab)
+    cur.execute("SELECT name, skill_id FROM skill")
+    skill_ids = dict(cur.fetchall())
+    cur.execute(
+        "INSERT INTO admin (username, password) VALUES (%s, %s) "
+        "ON DUPLICATE KEY UPDATE password = VALUES(password)",
+        (BENCH_ADMIN, pw),
+    )
+    mysql.connection.commit()
+    cur.close()
+
+    # ── Organizations ──
+    first_org = _next_id("organization", "org_id")
+    _insert("organization",
+            ("org_id", "name", "email", "password", "phone", "address", "representative"),
+            ((first_org + i, f"Bench Org {first_org + i}", f"org{first_org + i}@bench.test",
+              pw, f"9{rng.randrange(10**9):09d}", rng.choice(PLACES),
+              f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}")
+             for i in range(orgs)))
+
+    # ── Volunteers + skill index ──
+    first_vol = _next_id("volunteer", "volunteer_id")
+    vol_skills = []     # (volunteer_id, skill_id) of the current chunk
+
+    def volunteer_rows():
+        for i in range(volunteers):
+            vid   = first_vol + i
+            names = [vocab[j] for j in zipf.distinct(rng.choices(
+                range(7), weights=(4, 6, 20, 30, 22, 12, 6))[0])]
+            vol_skills.extend((vid, skill_ids[n]) for n in names)
+            yield (vid, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                   f"vol{vid}@bench.test", pw,
+                   rng.choice(("Male", "Female", "Other")),
+                   f"8{rng.randrange(10**9):09d}",
+                   ",".join(names), rng.random() < 0.1)
+
+    def flush_skills(cur):
+        cur.executemany(
+            "INSERT INTO volunteer_skill (volunteer_id, skill_id) VALUES (%s, %s)",
+            vol_skills,
+        )
+        vol_skills.clear()
+
+    _insert("volunteer",
+            ("volunteer_id", "first_name", "last_name", "email", "password",
+             "gender", "phone", "skills", "digest_email"),
+            volunteer_rows(), on_chunk=flush_skills)
+    cur = mysql.connection.cursor()
+    cur.execute("UPDATE volunteer SET skills_updated_at = NOW() WHERE volunteer_id >= %s",
+                (first_vol,))
+    mysql.connection.commit()
+    cur.close()
+
+    # ── Activities + positions ──
+    first_act = _next_id("activity", "activity_id")
+    first_pos = _next_id("activity_position", "position_id")
+    positions  = []     # per activity: (first position_id, count)
+    slots_of   = {}     # position_id -> slots
+    pos_rows   = []
+    act_skills = []     # (activity_id, skill_id) of the current chunk
+
+    def activity_rows():
+        next_pos = first_pos
+        for i in range(activities):
+            aid   = first_act + i
+            start = today + datetime.timedelta(days=rng.randint(-180, 180))
+            end   = start + datetime.timedelta(days=rng.choice((0, 0, 1, 2, 6)))
+            reg_open  = datetime.datetime.combine(
+                start - datetime.timedelta(days=rng.randint(14, 60)), datetime.time(9))
+            reg_close = datetime.datetime.combine(
+                start - datetime.timedelta(days=rng.randint(0, 7)), datetime.time(23, 59))
+            names    = [vocab[j] for j in zipf.distinct(rng.choice((0, 0, 1, 1, 2)))]
+            required = ",".join(names)
+            act_skills.extend((aid, skill_ids[n]) for n in names)
+
+            n_pos = rng.randint(1, 4)
+            positions.append((next_pos, n_pos))
+            for title in rng.sample(POSITION_TITLES, n_pos):
+                pos_skills = ",".join(vocab[j] for j in zipf.distinct(rng.randint(1, 3)))
+                slots_of[next_pos] = rng.choice((1, 2, 5, 10, 25))
+                pos_rows.append((next_pos, aid, title, pos_skills, slots_of[next_pos]))
+                next_pos += 1
+
+            yield (aid, f"{rng.choice(ACTIVITY_TYPES)} Event {aid}",
+                   rng.choice(ACTIVITY_TYPES), rng.choice(PLACES), start, end,
+                   first_org + rng.randrange(orgs) if orgs else None,
+                   required, f"Synthetic activity {aid}.", reg_open, reg_close)
+
+    def flush_activity_skills(cur):
+        cur.executemany(
+            "INSERT INTO activity_skill (activity_id, skill_id) VALUES (%s, %s)",
+            act_skills,
+        )
+        act_skills.clear()
+
+    _insert("activity",
+            ("activity_id", "name", "type", "place", "start_date", "end_date", "org_id",
+             "required_skills", "description", "reg_open", "reg_close"),
+            activity_rows(), on_chunk=flush_activity_skills)
+    _insert("activity_position",
+            ("position_id", "activity_id", "title", "required_skills", "slots"),
+            pos_rows)
+    pos_rows.clear()
+
+    # ── Sign-ups and notifications ──
+    def hot_activity():
+        # Squared uniform: low indexes are drawn far more often
+        return int(activities * rng.random() ** 2)
+
+    held = {}           # position_id -> slots taken so far
+
+    def signup_rows():
+        for i in range(volunteers):
+            vid = first_vol + i
+            for a in {hot_activity() for _ in range(rng.choices((0, 1, 2, 3),
+                                                               weights=(45, 30, 17, 8))[0])}:
+                pos, n = positions[a]
+                pid    = pos + rng.randrange(n)
+                status = rng.choices(("pending", "approved", "rejected"),
+                                     weights=(50, 40, 10))[0]
+                if status != "rejected":
+                    if held.get(pid, 0) < slots_of[pid]:
+                        held[pid] = held.get(pid, 0) + 1
+                    else:
+                        status = "waitlisted"
+                yield (vid, first_act + a, pid, status,
+                       status == "approved" and rng.random() < 0.5,
+                       rng.randint(1, 5) if status == "approved" and rng.random() < 0.3 else None)
+
+    def notification_rows():
+        for i in range(volunteers):
+            vid = first_vol + i
+            for _ in range(rng.choices((0, 1, 2, 3, 4), weights=(30, 25, 20, 15, 10))[0]):
+                a = hot_activity()
+                pos, n = positions[a]
+                yield (vid, first_act + a, pos + rng.randrange(n),
+                       rng.choice((1, 2)), None, rng.random() < 0.6)
+
+    if activities:
+        _insert("volunteer_activity",
+                ("volunteer_id", "activity_id", "position_id", "status",
+                 "attendance", "performance_rating"),
+                signup_rows())
+        _insert("notification",
+                ("volunteer_id", "activity_id", "position_id", "template_id",
+                 "params", "is_read"),
+                notification_rows())
+
+    cur = mysql.connection.cursor()
+    cur.execute("""
+        UPDATE activity_position p
+        JOIN (
+            SELECT position_id, COUNT(*) AS n
+            FROM volunteer_activity
+            WHERE position_id >= %s AND status IN ('pending', 'approved')
+            GROUP BY position_id
+        ) va ON va.position_id = p.position_id
+        SET p.filled = va.n
+    """, (first_pos,))
+    cur.execute("""
+        INSERT INTO notification_counter (volunteer_id, unread)
+        SELECT volunteer_id, SUM(is_read = FALSE) FROM notification
+        WHERE volunteer_id >= %s
+        GROUP BY volunteer_id
+        ON DUPLICATE KEY UPDATE unread = VALUES(unread)
+    """, (first_vol,))
+    cur.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+    mysql.connection.commit()
+    cur.close()
+
+
+# ==========================
+# python -m bench.seed
+# ==========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.seed")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiplier for the default row counts")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true",
+                        help="empty the generated tables first")
+    for name in ("volunteers", "orgs", "activities", "vocabulary"):
+        parser.add_argument(f"--{name}", type=int)
+    args = parser.parse_args(argv)
+
+    counts = {k: getattr(args, k) or max(1, int(v * args.scale))
+              for k, v in DEFAULTS.items()}
+    counts["vocabulary"] = args.vocabulary or DEFAULTS["vocabulary"]
+
+    from app import app
+
+    with app.app_context():
+        if args.truncate:
+            truncate()
+        start = time.monotonic()
+        seed(counts["volunteers"], counts["orgs"], counts["activities"],
+             counts["vocabulary"], args.seed)
+        # Rows went in behind the write paths; bring the dashboard totals in line
+        counters.reconcile_all()
+        log.info("seeded %s in %.0fs", counts, time.monotonic() - start)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -0,0 +1,94 @@
+# ================================================================
+# counters.py  — admin summary counters
+#
+# Run hourly (cron):   python -m counters [name ...]
+#
+# The dashboard totals (volunteers, organizations, activities,
+# sign-ups) live in summary_counter instead of being COUNT(*)ed on
+# every load. The write paths bump them in their own transaction, so a
+# counter changes exactly when the rows it counts commit or roll back.
+#
+# Each counter is split over SHARDS rows and a bump picks one at
+# random: concurrent sign-ups at registration open update different
+# rows instead of queueing on one hot row lock. Reading is one SUM
+# over a few dozen rows.
+#
+# reconcile() repairs drift from writes that bypass the app (bulk
+# imports, manual SQL, the bench seeder). It locks a counter's shards
+# before counting, so writers bumping that counter wait for it and
+# nothing is lost or counted twice; run it off-peak for `signups`.
+# ================================================================
+
+import logging
+import random
+import sys
+
+from db import mysql
+
+SHARDS = 16
+
+# counter name -> the query it caches
+SOURCES = {
+    'volunteers':    "SELECT COUNT(*) FROM volunteer",
+    'organizations': "SELECT COUNT(*) FROM organization",
+    'activities':    "SELECT COUNT(*) FROM activity",
+    'signups':       "SELECT COUNT(*) FROM volunteer_activity",
+}
+
+log = logging.getLogger(__name__)
+
+
+def bump(cur, **deltas):
+    """bump(cur, volunteers=1, signups=-3); zero deltas are skipped."""
+    rows = [(name, random.randrange(SHARDS), d) for name, d in deltas.items() if d]
+    if rows:
+        cur.executemany("""
+            INSERT INTO summary_counter (name, shard, value) VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE value = value + VALUES(value)
+        """, rows)
+
+
+def totals(cur):
+    """{name: value} for every counter, 0 for counters never bumped."""
+    cur.execute("SELECT name, SUM(value) FROM summary_counter GROUP BY name")
+    found = {name: int(value) for name, value in cur.fetchall()}
+    return {name: found.get(name, 0) for name in SOURCES}
+
+
+def reconcile(cur, name):
+    """Reset one counter to its true count. Returns the drift repaired."""
+    cur.execute(
+        "SELECT COALESCE(SUM(value), 0) FROM summary_counter WHERE name = %s FOR UPDATE",
+        (name,)
+    )
+    cached = int(cur.fetchone()[0])
+    cur.execute(SOURCES[name])
+    actual = cur.fetchone()[0]
+    if actual != cached:
+        cur.execute("DELETE FROM summary_counter WHERE name = %s", (name,))
+        cur.execute(
+            "INSERT INTO summary_counter (name, shard, value) VALUES (%s, 0, %s)",
+            (name, actual)
+        )
+    return actual - cached
+
+
+def reconcile_all(names=None):
+    cur = mysql.connection.cursor()
+    for name in names or SOURCES:
+        drift = reconcile(cur, name)
+        mysql.connection.commit()
+        if drift:
+            log.warning("counter %s was off by %+d; repaired", name, -drift)
+    cur.close()
+
+
+if __name__ == "__main__":
+    from app import app
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    unknown = [n for n in sys.argv[1:] if n not in SOURCES]
+    if unknown:
+        sys.exit(f"unknown counter(s): {', '.join(unknown)}; known: {', '.join(SOURCES)}")
+    with app.app_context():
+        reconcile_all(sys.argv[1:])
@@ -0,0 +1,57 @@
+-- Normalized skill index (skill_index.py).
+--
+--   skill              one row per distinct lowercase skill name
+--   volunteer_skill    volunteer.skills one row per skill, so "holds every
+--                      required skill" is an indexed set query
+--
+-- The backfill splits volunteer.skills with a recursive CTE and applies
+-- the same trim + lowercase as skill_index.parse_skills.
+
+-- migrate:up
+CREATE TABLE skill (
+    skill_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) UNIQUE NOT NULL
+);
+
+CREATE TABLE volunteer_skill (
+    volunteer_id INT,
+    skill_id INT,
+    PRIMARY KEY (volunteer_id, skill_id),
+    INDEX idx_volunteer_skill_skill (skill_id, volunteer_id),
+    FOREIGN KEY (volunteer_id)
+        REFERENCES volunteer(volunteer_id)
+        ON DELETE CASCADE,
+    FOREIGN KEY (skill_id)
+        REFERENCES skill(skill_id)
+        ON DELETE CASCADE
+);
+
+CREATE TEMPORARY TABLE volunteer_skill_split AS
+WITH RECURSIVE parts (volunteer_id, name, rest) AS (
+    SELECT volunteer_id,
+           SUBSTRING_INDEX(skills, ',', 1),
+           SUBSTRING(skills, LENGTH(SUBSTRING_INDEX(skills, ',', 1)) + 2)
+    FROM volunteer
+    WHERE skills <> ''
+    UNION ALL
+    SELECT volunteer_id,
+           SUBSTRING_INDEX(rest, ',', 1),
+           SUBSTRING(rest, LENGTH(SUBSTRING_INDEX(rest, ',', 1)) + 2)
+    FROM parts
+    WHERE rest <> ''
+)
+SELECT DISTINCT volunteer_id, LOWER(TRIM(name)) AS name FROM parts WHERE TRIM(name) <> '';
+
+INSERT IGNORE INTO skill (name)
+SELECT DISTINCT name FROM volunteer_skill_split;
+
+INSERT IGNORE INTO volunteer_skill (volunteer_id, skill_id)
+SELECT v.volunteer_id, s.skill_id
+FROM volunteer_skill_split v
+JOIN skill s ON s.name = v.name;
+
+DROP TEMPORARY TABLE volunteer_skill_split;
+
+-- migrate:down
+DROP TABLE volunteer_skill;
+DROP TABLE skill;
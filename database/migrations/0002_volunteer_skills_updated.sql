@@ -0,0 +1,13 @@
+-- volunteer.skills_updated_at: stamped by skill_index.sync_volunteer_skills
+-- so the match engine (matching.py) and recommend.py can pick up only
+-- the volunteers whose skills changed.
+
+-- migrate:up
+ALTER TABLE volunteer
+    ADD COLUMN skills_updated_at TIMESTAMP NULL DEFAULT NULL AFTER skills,
+    ADD INDEX idx_volunteer_skills_updated (skills_updated_at);
+
+-- migrate:down
+ALTER TABLE volunteer
+    DROP INDEX idx_volunteer_skills_updated,
+    DROP COLUMN skills_updated_at;
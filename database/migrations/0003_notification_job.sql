@@ -0,0 +1,30 @@
+-- Notification fan-out jobs, claimed and processed in batches by
+-- notifications.worker instead of inside the request.
+
+-- migrate:up
+CREATE TABLE notification_job (
+    job_id INT AUTO_INCREMENT PRIMARY KEY,
+    activity_id INT,
+    position_id INT,
+    kind ENUM('new_position','reminder') NOT NULL,
+    status ENUM('queued','running','done','failed') DEFAULT 'queued',
+    attempts INT DEFAULT 0,
+    total INT DEFAULT NULL,
+    processed INT DEFAULT 0,
+    last_volunteer_id INT DEFAULT 0,
+    last_error TEXT,
+    claim_token CHAR(32) DEFAULT NULL,
+    locked_at DATETIME DEFAULT NULL,
+    run_after DATETIME DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_job_status_run (status, run_after),
+    FOREIGN KEY (activity_id)
+        REFERENCES activity(activity_id)
+        ON DELETE CASCADE,
+    FOREIGN KEY (position_id)
+        REFERENCES activity_position(position_id)
+        ON DELETE CASCADE
+);
+
+-- migrate:down
+DROP TABLE notification_job;
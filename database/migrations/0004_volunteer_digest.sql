@@ -0,0 +1,12 @@
+-- Daily digest opt-in (notifications.digest): volunteer.digest_email and
+-- the time the last digest went out.
+
+-- migrate:up
+ALTER TABLE volunteer
+    ADD COLUMN digest_email BOOLEAN DEFAULT FALSE AFTER profile_picture,
+    ADD COLUMN digest_sent_at DATETIME DEFAULT NULL AFTER digest_email;
+
+-- migrate:down
+ALTER TABLE volunteer
+    DROP COLUMN digest_sent_at,
+    DROP COLUMN digest_email;
@@ -0,0 +1,55 @@
+-- Announcements stored once and matched to volunteers on read
+-- (notifications.broadcast).
+--
+--   broadcast              one row per announcement
+--   broadcast_skill        skills a 'skills' broadcast is targeted at
+--   broadcast_cursor       highest broadcast_id each volunteer has read
+--   notification_job.broadcast_id
+--                          the broadcast a fan-out job published
+
+-- migrate:up
+CREATE TABLE broadcast (
+    broadcast_id INT AUTO_INCREMENT PRIMARY KEY,
+    activity_id INT,
+    position_id INT DEFAULT NULL,
+    target ENUM('activity','skills') NOT NULL,
+    min_skills INT DEFAULT 1,
+    message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_broadcast_created (created_at),
+    FOREIGN KEY (activity_id)
+        REFERENCES activity(activity_id)
+        ON DELETE CASCADE,
+    FOREIGN KEY (position_id)
+        REFERENCES activity_position(position_id)
+        ON DELETE CASCADE
+);
+
+CREATE TABLE broadcast_skill (
+    broadcast_id INT,
+    skill_id INT,
+    PRIMARY KEY (broadcast_id, skill_id),
+    FOREIGN KEY (broadcast_id)
+        REFERENCES broadcast(broadcast_id)
+        ON DELETE CASCADE,
+    FOREIGN KEY (skill_id)
+        REFERENCES skill(skill_id)
+        ON DELETE CASCADE
+);
+
+CREATE TABLE broadcast_cursor (
+    volunteer_id INT PRIMARY KEY,
+    last_read_id INT DEFAULT 0,
+    FOREIGN KEY (volunteer_id)
+        REFERENCES volunteer(volunteer_id)
+        ON DELETE CASCADE
+);
+
+ALTER TABLE notification_job
+    ADD COLUMN broadcast_id INT DEFAULT NULL AFTER last_volunteer_id;
+
+-- migrate:down
+ALTER TABLE notification_job DROP COLUMN broadcast_id;
+DROP TABLE broadcast_cursor;
+DROP TABLE broadcast_skill;
+DROP TABLE broadcast;
@@ -0,0 +1,31 @@
+-- Paginated inbox (notifications.inbox).
+--
+--   notification(volunteer_id, is_read, created_at)
+--                              one volunteer's notices, newest first
+--   notification_counter       unread direct notices per volunteer, read
+--                              by the dashboard badge; backfilled here
+
+-- migrate:up
+ALTER TABLE notification
+    ADD INDEX idx_notification_inbox (volunteer_id, is_read, created_at);
+
+CREATE TABLE notification_counter (
+    volunteer_id INT PRIMARY KEY,
+    unread INT DEFAULT 0,
+    FOREIGN KEY (volunteer_id)
+        REFERENCES volunteer(volunteer_id)
+        ON DELETE CASCADE
+);
+
+INSERT INTO notification_counter (volunteer_id, unread)
+SELECT volunteer_id, COUNT(*)
+FROM notification
+WHERE is_read = FALSE AND volunteer_id IS NOT NULL
+GROUP BY volunteer_id;
+
+-- migrate:down
+DROP TABLE notification_counter;
+
+ALTER TABLE notification
+    ADD INDEX idx_notification_volunteer (volunteer_id),
+    DROP INDEX idx_notification_inbox;
@@ -0,0 +1,14 @@
+-- Short-lived pub/sub feed tailed by the SSE hubs (events.py).
+
+-- migrate:up
+CREATE TABLE event_log (
+    event_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    channel VARCHAR(64) NOT NULL,
+    event VARCHAR(32) NOT NULL,
+    payload TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_event_log_created (created_at)
+);
+
+-- migrate:down
+DROP TABLE event_log;
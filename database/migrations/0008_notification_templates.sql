@@ -0,0 +1,56 @@
+-- Notices stored as (template_id, params) (notifications.templates).
+--
+--   notification.message, broadcast.message -> template_id + params
+--   notification_archive       read notices moved out by
+--                              notifications.retention
+--
+-- Existing sentences cannot be mapped back to their template, so they
+-- are kept verbatim under templates.LEGACY (0) with params {"text": ...}.
+-- The down section restores message from params the same way; notices
+-- written with other templates come back without a message.
+
+-- migrate:up
+ALTER TABLE notification
+    ADD COLUMN template_id TINYINT UNSIGNED NOT NULL DEFAULT 0 AFTER position_id,
+    ADD COLUMN params VARCHAR(1024) DEFAULT NULL AFTER template_id;
+
+UPDATE notification
+SET params = JSON_OBJECT('text', LEFT(COALESCE(message, ''), 400));
+
+ALTER TABLE notification
+    ALTER COLUMN template_id DROP DEFAULT,
+    DROP COLUMN message;
+
+ALTER TABLE broadcast
+    ADD COLUMN template_id TINYINT UNSIGNED NOT NULL DEFAULT 0 AFTER min_skills,
+    ADD COLUMN params VARCHAR(1024) DEFAULT NULL AFTER template_id;
+
+UPDATE broadcast
+SET params = JSON_OBJECT('text', LEFT(COALESCE(message, ''), 400));
+
+ALTER TABLE broadcast
+    ALTER COLUMN template_id DROP DEFAULT,
+    DROP COLUMN message;
+
+CREATE TABLE notification_archive (
+    notification_id INT PRIMARY KEY,
+    volunteer_id INT,
+    activity_id INT,
+    position_id INT,
+    template_id TINYINT UNSIGNED NOT NULL,
+    params VARCHAR(1024) DEFAULT NULL,
+    created_at TIMESTAMP NULL,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_archive_volunteer (volunteer_id)
+);
+
+-- migrate:down
+DROP TABLE notification_archive;
+
+ALTER TABLE broadcast ADD COLUMN message TEXT AFTER min_skills;
+UPDATE broadcast SET message = JSON_UNQUOTE(JSON_EXTRACT(params, '$.text')) WHERE template_id = 0;
+ALTER TABLE broadcast DROP COLUMN params, DROP COLUMN template_id;
+
+ALTER TABLE notification ADD COLUMN message TEXT AFTER position_id;
+UPDATE notification SET message = JSON_UNQUOTE(JSON_EXTRACT(params, '$.text')) WHERE template_id = 0;
+ALTER TABLE notification DROP COLUMN params, DROP COLUMN template_id;
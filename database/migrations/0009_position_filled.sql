@@ -0,0 +1,18 @@
+-- activity_position.filled: slots taken, read by the volunteers page.
+-- Backfilled from the sign-ups that still hold a slot.
+
+-- migrate:up
+ALTER TABLE activity_position
+    ADD COLUMN filled INT NOT NULL DEFAULT 0 AFTER slots;
+
+UPDATE activity_position p
+JOIN (
+    SELECT position_id, COUNT(*) AS n
+    FROM volunteer_activity
+    WHERE position_id IS NOT NULL AND status <> 'rejected'
+    GROUP BY position_id
+) va ON va.position_id = p.position_id
+SET p.filled = va.n;
+
+-- migrate:down
+ALTER TABLE activity_position DROP COLUMN filled;
@@ -0,0 +1,9 @@
+-- organization.profile_picture: avatar file name, set by the
+-- organization profile upload.
+
+-- migrate:up
+ALTER TABLE organization
+    ADD COLUMN profile_picture VARCHAR(255) DEFAULT NULL AFTER representative;
+
+-- migrate:down
+ALTER TABLE organization DROP COLUMN profile_picture;
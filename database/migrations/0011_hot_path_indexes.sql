@@ -0,0 +1,30 @@
+-- Indexes for the queries every page runs.
+--
+--   activity(start_date)                       listings ordered / ranged by date
+--   activity(reg_open, reg_close)              "registration open now" filters
+--   volunteer_activity(activity_id, position_id, status)
+--                                              rosters and slot counts per
+--                                              position; covers the count, and
+--                                              replaces the implicit FK index
+--                                              on activity_id
+--
+-- notification(volunteer_id, is_read) is already served by the prefix of
+-- idx_notification_inbox (volunteer_id, is_read, created_at), so no
+-- duplicate is added here.
+
+-- migrate:up
+ALTER TABLE activity
+    ADD INDEX idx_activity_start (start_date),
+    ADD INDEX idx_activity_reg_window (reg_open, reg_close);
+
+ALTER TABLE volunteer_activity
+    ADD INDEX idx_va_activity_position (activity_id, position_id, status);
+
+-- migrate:down
+ALTER TABLE volunteer_activity
+    ADD INDEX idx_va_activity (activity_id),
+    DROP INDEX idx_va_activity_position;
+
+ALTER TABLE activity
+    DROP INDEX idx_activity_start,
+    DROP INDEX idx_activity_reg_window;
@@ -0,0 +1,17 @@
+-- Position waitlist (signups.py): full positions queue volunteers
+-- with status 'waitlisted', in volunteer_activity.id order.
+-- idx_va_position_queue finds the head of a position's queue and
+-- replaces the implicit FK index on position_id.
+
+-- migrate:up
+ALTER TABLE volunteer_activity
+    MODIFY status ENUM('pending','approved','rejected','waitlisted') DEFAULT 'pending',
+    ADD INDEX idx_va_position_queue (position_id, status, id);
+
+-- migrate:down
+UPDATE volunteer_activity SET status = 'rejected' WHERE status = 'waitlisted';
+
+ALTER TABLE volunteer_activity
+    ADD INDEX idx_va_position (position_id),
+    DROP INDEX idx_va_position_queue,
+    MODIFY status ENUM('pending','approved','rejected') DEFAULT 'pending';
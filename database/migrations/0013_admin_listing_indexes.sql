@@ -0,0 +1,34 @@
+-- Indexes behind the admin dashboard's keyset-paged tabs
+-- (repository/admin.py: page). Each sort column is indexed so a page
+-- is an index range read of LIMIT + 1 rows, and the name columns
+-- double as the prefix-search indexes (LIKE 'q%'). email already has
+-- its UNIQUE index on volunteer and organization; activity.start_date
+-- has idx_activity_start from 0011.
+
+-- migrate:up
+ALTER TABLE volunteer
+    ADD INDEX idx_volunteer_created (created_at),
+    ADD INDEX idx_volunteer_last_name (last_name),
+    ADD INDEX idx_volunteer_first_name (first_name);
+
+ALTER TABLE organization
+    ADD INDEX idx_organization_created (created_at),
+    ADD INDEX idx_organization_name (name);
+
+ALTER TABLE activity
+    ADD INDEX idx_activity_name (name),
+    ADD INDEX idx_activity_reg_close (reg_close);
+
+-- migrate:down
+ALTER TABLE activity
+    DROP INDEX idx_activity_name,
+    DROP INDEX idx_activity_reg_close;
+
+ALTER TABLE organization
+    DROP INDEX idx_organization_created,
+    DROP INDEX idx_organization_name;
+
+ALTER TABLE volunteer
+    DROP INDEX idx_volunteer_created,
+    DROP INDEX idx_volunteer_last_name,
+    DROP INDEX idx_volunteer_first_name;
@@ -0,0 +1,20 @@
+-- Admin dashboard totals (counters.py). Each counter is spread over
+-- up to counters.SHARDS rows; its value is SUM(value) over its rows.
+-- Backfilled into shard 0 from the current row counts.
+
+-- migrate:up
+CREATE TABLE summary_counter (
+    name VARCHAR(32) NOT NULL,
+    shard TINYINT UNSIGNED NOT NULL,
+    value BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, shard)
+);
+
+INSERT INTO summary_counter (name, shard, value)
+SELECT 'volunteers', 0, COUNT(*) FROM volunteer
+UNION ALL SELECT 'organizations', 0, COUNT(*) FROM organization
+UNION ALL SELECT 'activities', 0, COUNT(*) FROM activity
+UNION ALL SELECT 'signups', 0, COUNT(*) FROM volunteer_activity;
+
+-- migrate:down
+DROP TABLE summary_counter;
@@ -0,0 +1,62 @@
+-- Volunteer activity feed (volunteer/feed.py).
+--
+--   activity_skill                normalized copy of activity.required_skills,
+--                                 like volunteer_skill, so eligibility is a join
+--   activity(start_date, activity_id, reg_open, reg_close)
+--                                 the feed's keyset order plus the registration
+--                                 window, checked in the index before any row
+--                                 is read; replaces idx_activity_start, its prefix
+--
+-- The backfill splits required_skills with a recursive CTE and applies
+-- the same trim + lowercase as skill_index.parse_skills.
+
+-- migrate:up
+CREATE TABLE activity_skill (
+    activity_id INT,
+    skill_id INT,
+    PRIMARY KEY (activity_id, skill_id),
+    INDEX idx_activity_skill_skill (skill_id, activity_id),
+    FOREIGN KEY (activity_id)
+        REFERENCES activity(activity_id)
+        ON DELETE CASCADE,
+    FOREIGN KEY (skill_id)
+        REFERENCES skill(skill_id)
+        ON DELETE CASCADE
+);
+
+CREATE TEMPORARY TABLE required_skill_split AS
+WITH RECURSIVE parts (activity_id, name, rest) AS (
+    SELECT activity_id,
+           SUBSTRING_INDEX(required_skills, ',', 1),
+           SUBSTRING(required_skills, LENGTH(SUBSTRING_INDEX(required_skills, ',', 1)) + 2)
+    FROM activity
+    WHERE required_skills <> ''
+    UNION ALL
+    SELECT activity_id,
+           SUBSTRING_INDEX(rest, ',', 1),
+           SUBSTRING(rest, LENGTH(SUBSTRING_INDEX(rest, ',', 1)) + 2)
+    FROM parts
+    WHERE rest <> ''
+)
+SELECT DISTINCT activity_id, LOWER(TRIM(name)) AS name FROM parts WHERE TRIM(name) <> '';
+
+INSERT IGNORE INTO skill (name)
+SELECT DISTINCT name FROM required_skill_split;
+
+INSERT IGNORE INTO activity_skill (activity_id, skill_id)
+SELECT r.activity_id, s.skill_id
+FROM required_skill_split r
+JOIN skill s ON s.name = r.name;
+
+DROP TEMPORARY TABLE required_skill_split;
+
+ALTER TABLE activity
+    ADD INDEX idx_activity_feed (start_date, activity_id, reg_open, reg_close),
+    DROP INDEX idx_activity_start;
+
+-- migrate:down
+ALTER TABLE activity
+    ADD INDEX idx_activity_start (start_date),
+    DROP INDEX idx_activity_feed;
+
+DROP TABLE activity_skill;
@@ -0,0 +1,33 @@
+-- Precomputed activity recommendations (recommend.py): the top
+-- recommend.TOP_N open activities per volunteer, score in thousandths.
+-- recommendation_run records each batch; the incremental run works
+-- from the last finished one.
+
+-- migrate:up
+CREATE TABLE recommendation (
+    volunteer_id INT NOT NULL,
+    rank_no TINYINT UNSIGNED NOT NULL,
+    activity_id INT NOT NULL,
+    score SMALLINT UNSIGNED NOT NULL,
+    PRIMARY KEY (volunteer_id, rank_no),
+    INDEX idx_recommendation_activity (activity_id),
+    FOREIGN KEY (volunteer_id)
+        REFERENCES volunteer(volunteer_id)
+        ON DELETE CASCADE,
+    FOREIGN KEY (activity_id)
+        REFERENCES activity(activity_id)
+        ON DELETE CASCADE
+);
+
+CREATE TABLE recommendation_run (
+    run_id INT AUTO_INCREMENT PRIMARY KEY,
+    kind ENUM('full','incremental') NOT NULL,
+    started_at DATETIME NOT NULL,
+    finished_at DATETIME DEFAULT NULL,
+    max_activity_id INT NOT NULL,
+    volunteers INT NOT NULL
+);
+
+-- migrate:down
+DROP TABLE recommendation_run;
+DROP TABLE recommendation;
@@ -0,0 +1,75 @@
+-- Canonical skill vocabulary (vocabulary.py).
+--
+--   skill.label                   display form of a skill ("IT Support");
+--                                 skill.name stays its lowercase key
+--   skill_alias                   normalized spellings that mean an existing
+--                                 skill ("photographer" -> photography)
+--
+-- Seeds the curated skills and their aliases. Skills created before
+-- this keep a NULL label and are shown title-cased until
+-- `python -m vocabulary rebuild` rewrites the stored skill strings.
+
+-- migrate:up
+ALTER TABLE skill ADD COLUMN label VARCHAR(100) DEFAULT NULL;
+
+CREATE TABLE skill_alias (
+    alias VARCHAR(100) PRIMARY KEY,
+    skill_id INT NOT NULL,
+    FOREIGN KEY (skill_id)
+        REFERENCES skill(skill_id)
+        ON DELETE CASCADE
+);
+
+INSERT INTO skill (name, label) VALUES
+    ('first aid',        'First Aid'),
+    ('cpr',              'CPR'),
+    ('photography',      'Photography'),
+    ('teaching',         'Teaching'),
+    ('communication',    'Communication'),
+    ('event management', 'Event Management'),
+    ('cooking',          'Cooking'),
+    ('logistics',        'Logistics'),
+    ('it support',       'IT Support'),
+    ('graphic design',   'Graphic Design'),
+    ('leadership',       'Leadership'),
+    ('music',            'Music'),
+    ('sports coaching',  'Sports Coaching'),
+    ('translation',      'Translation'),
+    ('fundraising',      'Fundraising'),
+    ('social media',     'Social Media'),
+    ('driving',          'Driving')
+ON DUPLICATE KEY UPDATE label = VALUES(label);
+
+INSERT INTO skill_alias (alias, skill_id)
+SELECT a.alias, s.skill_id
+FROM (
+    SELECT 'photographer' AS alias, 'photography' AS name
+    UNION ALL SELECT 'photo',              'photography'
+    UNION ALL SELECT 'tutoring',           'teaching'
+    UNION ALL SELECT 'tutor',              'teaching'
+    UNION ALL SELECT 'teacher',            'teaching'
+    UNION ALL SELECT 'tech support',       'it support'
+    UNION ALL SELECT 'computer support',   'it support'
+    UNION ALL SELECT 'it',                 'it support'
+    UNION ALL SELECT 'event planning',     'event management'
+    UNION ALL SELECT 'events',             'event management'
+    UNION ALL SELECT 'fund raising',       'fundraising'
+    UNION ALL SELECT 'translator',         'translation'
+    UNION ALL SELECT 'interpreting',       'translation'
+    UNION ALL SELECT 'smm',                'social media'
+    UNION ALL SELECT 'social media management', 'social media'
+    UNION ALL SELECT 'cook',               'cooking'
+    UNION ALL SELECT 'chef',               'cooking'
+    UNION ALL SELECT 'driver',             'driving'
+    UNION ALL SELECT 'design',             'graphic design'
+    UNION ALL SELECT 'graphic designer',   'graphic design'
+    UNION ALL SELECT 'coaching',           'sports coaching'
+    UNION ALL SELECT 'coach',              'sports coaching'
+    UNION ALL SELECT 'musician',           'music'
+    UNION ALL SELECT 'basic life support', 'cpr'
+) a
+JOIN skill s ON s.name = a.name;
+
+-- migrate:down
+DROP TABLE skill_alias;
+ALTER TABLE skill DROP COLUMN label;
@@ -0,0 +1,20 @@
+-- Full-text search (search.py).
+--
+--   activity(name, description, place, type)   volunteer activity search and
+--                                               the admin Activities tab
+--   organization(name)                          admin Organizations tab
+--   volunteer(first_name, last_name, skills)    admin Volunteers tab
+--
+-- InnoDB maintains these on every write. The first FULLTEXT index on a
+-- table adds the hidden FTS_DOC_ID column and rebuilds the table, so
+-- run this off-peak on large installs.
+
+-- migrate:up
+ALTER TABLE activity ADD FULLTEXT INDEX ft_activity (name, description, place, type);
+ALTER TABLE organization ADD FULLTEXT INDEX ft_organization (name);
+ALTER TABLE volunteer ADD FULLTEXT INDEX ft_volunteer (first_name, last_name, skills);
+
+-- migrate:down
+ALTER TABLE volunteer DROP INDEX ft_volunteer;
+ALTER TABLE organization DROP INDEX ft_organization;
+ALTER TABLE activity DROP INDEX ft_activity;
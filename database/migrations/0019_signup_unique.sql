@@ -0,0 +1,45 @@
+-- One sign-up per volunteer and activity (signups.join).
+--
+-- The baseline UNIQUE(volunteer_id, activity_id, position_id) never
+-- fires for activities without positions (position_id NULL) and allows
+-- one row per position. Duplicates are removed first, keeping the
+-- strongest row (approved, pending, waitlisted, rejected, then oldest),
+-- and activity_position.filled and the 'signups' summary counter
+-- (backfilled by 0014) are recounted from what is left, the way
+-- counters.reconcile does.
+
+-- migrate:up
+DELETE va FROM volunteer_activity va
+JOIN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+                   PARTITION BY volunteer_id, activity_id
+                   ORDER BY FIELD(status, 'approved', 'pending', 'waitlisted', 'rejected'), id
+               ) AS n
+        FROM volunteer_activity
+    ) ranked
+    WHERE n > 1
+) dup ON dup.id = va.id;
+
+UPDATE activity_position p
+LEFT JOIN (
+    SELECT position_id, COUNT(*) AS n
+    FROM volunteer_activity
+    WHERE position_id IS NOT NULL AND status IN ('pending', 'approved')
+    GROUP BY position_id
+) va ON va.position_id = p.position_id
+SET p.filled = COALESCE(va.n, 0);
+
+DELETE FROM summary_counter WHERE name = 'signups';
+
+INSERT INTO summary_counter (name, shard, value)
+SELECT 'signups', 0, COUNT(*) FROM volunteer_activity;
+
+ALTER TABLE volunteer_activity
+    ADD UNIQUE INDEX uq_va_volunteer_activity (volunteer_id, activity_id),
+    DROP INDEX volunteer_id;
+
+-- migrate:down
+ALTER TABLE volunteer_activity
+    ADD UNIQUE INDEX volunteer_id (volunteer_id, activity_id, position_id),
+    DROP INDEX uq_va_volunteer_activity;
@@ -0,0 +1,15 @@
+-- volunteer_deleted: ids of deleted volunteers, written by
+-- repository.admin.delete_volunteer. matching.py reads the rows since
+-- its last refresh to drop those volunteers from its bitsets. One
+-- short row per deleted volunteer; kept so a worker that has been idle
+-- for a long time still sees every deletion.
+
+-- migrate:up
+CREATE TABLE volunteer_deleted (
+    volunteer_id INT PRIMARY KEY,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_volunteer_deleted_at (deleted_at)
+);
+
+-- migrate:down
+DROP TABLE volunteer_deleted;
@@ -0,0 +1,15 @@
+-- Notice params as TEXT. An announcement's params hold the organizer's
+-- text JSON-encoded, and quotes, backslashes and newlines grow under
+-- encoding, so 900 characters of message could overflow VARCHAR(1024).
+-- notification and notification_archive are widened with it so
+-- archiving copies rows unchanged.
+
+-- migrate:up
+ALTER TABLE broadcast            MODIFY params TEXT DEFAULT NULL;
+ALTER TABLE notification         MODIFY params TEXT DEFAULT NULL;
+ALTER TABLE notification_archive MODIFY params TEXT DEFAULT NULL;
+
+-- migrate:down
+ALTER TABLE broadcast            MODIFY params VARCHAR(1024) DEFAULT NULL;
+ALTER TABLE notification         MODIFY params VARCHAR(1024) DEFAULT NULL;
+ALTER TABLE notification_archive MODIFY params VARCHAR(1024) DEFAULT NULL;
@@ -0,0 +1,43 @@
+-- notification_counter.unread counts unread broadcasts as well as
+-- direct notices: notifications.broadcast.publish bumps it for the
+-- audience, so the badge no longer resolves broadcasts on every read.
+-- Backfilled with each volunteer's broadcasts above their
+-- broadcast_cursor, by the audience rules of broadcast.for_volunteer.
+
+-- migrate:up
+INSERT INTO notification_counter (volunteer_id, unread)
+SELECT v.volunteer_id, COUNT(*)
+FROM volunteer v
+LEFT JOIN broadcast_cursor c ON c.volunteer_id = v.volunteer_id
+JOIN broadcast b
+  ON b.created_at >= v.created_at
+ AND b.broadcast_id > COALESCE(c.last_read_id, 0)
+WHERE (b.target = 'activity' AND EXISTS (
+        SELECT 1 FROM volunteer_activity va
+        WHERE va.volunteer_id = v.volunteer_id
+          AND va.activity_id  = b.activity_id
+      ))
+   OR (b.target = 'skills'
+       AND NOT EXISTS (
+        SELECT 1 FROM broadcast_skill bs
+        LEFT JOIN volunteer_skill vs
+               ON vs.skill_id = bs.skill_id
+              AND vs.volunteer_id = v.volunteer_id
+        WHERE bs.broadcast_id = b.broadcast_id
+          AND vs.skill_id IS NULL
+       )
+       AND (EXISTS (
+              SELECT 1 FROM broadcast_skill bs
+              WHERE bs.broadcast_id = b.broadcast_id
+            )
+            OR (SELECT COUNT(*) FROM volunteer_skill
+                WHERE volunteer_id = v.volunteer_id) >= b.min_skills))
+GROUP BY v.volunteer_id
+ON DUPLICATE KEY UPDATE unread = unread + VALUES(unread);
+
+-- migrate:down
+UPDATE notification_counter c
+SET unread = (
+    SELECT COUNT(*) FROM notification n
+    WHERE n.volunteer_id = c.volunteer_id AND n.is_read = FALSE
+);
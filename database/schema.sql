@@ -1,3 +1,6 @@
+-- Baseline schema. Later changes live in database/migrations/ and are
+-- applied with `python -m migrations up` (see migrations.py).
+
 CREATE DATABASE IF NOT EXISTS fest_management;
 USE fest_management;
 
@@ -122,4 +125,4 @@ CREATE TABLE notification (
     FOREIGN KEY (position_id)
         REFERENCES activity_position(position_id)
         ON DELETE CASCADE
-);
\ No newline at end of file
+);
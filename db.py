@@ -1,5 +1,62 @@
 import pymysql
-pymysql.install_as_MySQLdb()
-from flask_mysqldb import MySQL
+from flask import g
 
-mysql = MySQL()
\ No newline at end of file
+import querylog
+from pool import ConnectionPool
+
+
+class MySQL:
+    """
+    Drop-in replacement for flask_mysqldb.MySQL backed by pool.py.
+
+    `mysql.connection` borrows one pooled connection per app context
+    and hands it back (rolled back if uncommitted) at teardown, so
+    routes keep using mysql.connection.cursor() / .commit() unchanged.
+    """
+
+    def __init__(self, app=None):
+        self.pool = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        cfg = app.config
+
+        def connect():
+            return pymysql.connect(
+                host     = cfg["MYSQL_HOST"],
+                user     = cfg["MYSQL_USER"],
+                password = cfg["MYSQL_PASSWORD"],
+                database = cfg["MYSQL_DB"],
+                port     = int(cfg["MYSQL_PORT"]),
+                charset  = "utf8mb4",
+                connect_timeout = 10,
+                cursorclass     = querylog.InstrumentedCursor,
+            )
+
+        self.pool = ConnectionPool(
+            connect,
+            size         = cfg.get("MYSQL_POOL_SIZE", 5),
+            max_overflow = cfg.get("MYSQL_POOL_MAX_OVERFLOW", 10),
+            timeout      = cfg.get("MYSQL_POOL_TIMEOUT", 10),
+            recycle      = cfg.get("MYSQL_POOL_RECYCLE", 1800),
+            ping_after   = cfg.get("MYSQL_POOL_PING_AFTER", 5),
+        )
+        app.teardown_appcontext(self.teardown)
+        querylog.init_app(app)
+        app.extensions["mysql"] = self
+
+    @property
+    def connection(self):
+        conn = g.get("_mysql_conn")
+        if conn is None:
+            conn = g._mysql_conn = self.pool.acquire()
+        return conn
+
+    def teardown(self, exception):
+        conn = g.pop("_mysql_conn", None)
+        if conn is not None:
+            self.pool.release(conn)
+
+
+mysql = MySQL()
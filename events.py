@@ -0,0 +1,206 @@
+# ================================================================
+# events.py  — cross-worker publish/subscribe for Server-Sent Events
+#
+# Writers append to event_log inside their own transaction, so an
+# event becomes visible exactly when the change it describes commits.
+# Each worker process runs ONE hub thread that tails event_log and
+# hands events to the local SSE subscribers through in-memory queues;
+# open streams never poll the database themselves.
+#
+# AUTO_INCREMENT ids are handed out at INSERT but become visible at
+# COMMIT, so a lower id can appear after a higher one has been read.
+# Every id skipped over is remembered as a gap and looked up again on
+# each poll until it shows up or GAP_SECONDS pass (a rolled-back
+# insert leaves a hole that never fills).
+#
+# Streams are long-lived, so gunicorn runs gevent workers (see
+# Procfile): the hub and every stream are greenlets, not OS workers.
+#
+# Channels:
+#   volunteer:<id>   direct notices for one volunteer
+#   broadcast        a broadcast was published; only subscribers whose
+#                    `accept` filter matches the payload get it (see
+#                    notifications.broadcast.audience)
+#   activity:<id>    sign-ups / attendance changes for one activity
+# ================================================================
+
+import json
+import logging
+import queue
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+POLL_SECONDS      = 1
+HEARTBEAT_SECONDS = 15
+# Longer than any transaction that publishes; also bounds MAX_GAPS
+GAP_SECONDS       = 30
+MAX_GAPS          = 1000
+# Events are only needed until every hub has read them
+RETENTION_MINUTES = 60
+
+
+def publish(cur, channel, event, **data):
+    """Queue one event for `channel`. Caller commits."""
+    cur.execute(
+        "INSERT INTO event_log (channel, event, payload) VALUES (%s, %s, %s)",
+        (channel, event, json.dumps(data, default=str))
+    )
+
+
+def publish_many(cur, events):
+    """`events` are (channel, event, data) tuples. Caller commits."""
+    if events:
+        cur.executemany(
+            "INSERT INTO event_log (channel, event, payload) VALUES (%s, %s, %s)",
+            [(c, e, json.dumps(d, default=str)) for c, e, d in events]
+        )
+
+
+class Hub:
+
+    def __init__(self):
+        self._lock        = threading.Lock()
+        self._subscribers = {}     # channel -> set of queues
+        self._filters     = {}     # queue -> accept(data) predicate
+        self._thread      = None
+        self._app         = None
+
+    def start(self, app):
+        with self._lock:
+            if self._thread is None:
+                self._app = app
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def subscribe(self, channels, accept=None):
+        """
+        A queue receiving (event, payload) for `channels`. With
+        `accept`, only events whose decoded payload it returns true for.
+        """
+        q = queue.Queue(maxsize=100)
+        with self._lock:
+            for c in channels:
+                self._subscribers.setdefault(c, set()).add(q)
+            if accept is not None:
+                self._filters[q] = accept
+        return q
+
+    def unsubscribe(self, q, channels):
+        with self._lock:
+            for c in channels:
+                subs = self._subscribers.get(c)
+                if subs:
+                    subs.discard(q)
+                    if not subs:
+                        del self._subscribers[c]
+            self._filters.pop(q, None)
+
+    def _dispatch(self, channel, event, payload):
+        with self._lock:
+            targets = [(q, self._filters.get(q)) for q in self._subscribers.get(channel, ())]
+        data = None
+        for q, accept in targets:
+            if accept is not None:
+                if data is None:
+                    data = json.loads(payload)
+                if not accept(data):
+                    continue
+            try:
+                q.put_nowait((event, payload))
+            except queue.Full:
+                pass    # slow client; it will resync on reconnect
+
+    def _run(self):
+        from db import mysql
+
+        last_id, last_prune = None, 0
+        gaps = {}     # event_id skipped over -> time first missed
+        while True:
+            try:
+                with self._app.app_context():
+                    cur = mysql.connection.cursor()
+                    if last_id is None:
+                        cur.execute("SELECT COALESCE(MAX(event_id), 0) FROM event_log")
+                        last_id = cur.fetchone()[0]
+
+                    while True:
+                        cur.execute("""
+                            SELECT event_id, channel, event, payload
+                            FROM event_log WHERE event_id > %s
+                            ORDER BY event_id LIMIT 500
+                        """, (last_id,))
+                        rows = cur.fetchall()
+                        if gaps:
+                            placeholders = ', '.join(['%s'] * len(gaps))
+                            cur.execute(f"""
+                                SELECT event_id, channel, event, payload
+                                FROM event_log WHERE event_id IN ({placeholders})
+                                ORDER BY event_id
+                            """, tuple(gaps))
+                            late = cur.fetchall()
+                        else:
+                            late = ()
+                        mysql.connection.commit()   # fresh snapshot next poll
+
+                        now = time.time()
+                        for event_id, channel, event, payload in late:
+                            del gaps[event_id]
+                            self._dispatch(channel, event, payload)
+                        for event_id, channel, event, payload in rows:
+                            for missing in range(max(last_id + 1, event_id - MAX_GAPS), event_id):
+                                gaps[missing] = now
+                            self._dispatch(channel, event, payload)
+                            last_id = event_id
+                        for event_id, seen in list(gaps.items()):
+                            if now - seen > GAP_SECONDS:
+                                del gaps[event_id]
+                        if len(gaps) > MAX_GAPS:
+                            for event_id in sorted(gaps)[:len(gaps) - MAX_GAPS]:
+                                del gaps[event_id]
+
+                        if time.time() - last_prune > 60:
+                            cur.execute(f"""
+                                DELETE FROM event_log
+                                WHERE created_at < NOW() - INTERVAL {RETENTION_MINUTES} MINUTE
+                                LIMIT 1000
+                            """)
+                            mysql.connection.commit()
+                            last_prune = time.time()
+
+                        if len(rows) < 500:
+                            time.sleep(POLL_SECONDS)
+            except Exception:
+                log.exception("event hub poll failed; retrying")
+                time.sleep(POLL_SECONDS * 5)
+
+
+hub = Hub()
+
+
+def stream(channels, accept=None):
+    """Generator of SSE frames for a Flask streaming response."""
+    q = hub.subscribe(channels, accept)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event, payload = q.get(timeout=HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event}\ndata: {payload}\n\n"
+    finally:
+        hub.unsubscribe(q, channels)
+
+
+def sse_response(channels, accept=None):
+    from flask import Response, current_app
+
+    hub.start(current_app._get_current_object())
+    return Response(
+        stream(channels, accept),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,186 @@
+# ================================================================
+# matching.py  — in-process skill-match engine
+#
+# Keeps one bitset per skill (a Python int, bit i = volunteer row i)
+# built from the volunteer_skill index. "Has all required skills" for
+# a position is then an AND of a few bitsets, so every position of an
+# activity is scored in one pass without touching volunteer rows.
+#
+# Each worker holds its own copy. It is loaded lazily on first use and
+# refreshed incrementally from volunteer.skills_updated_at, so changes
+# made through any worker are picked up on the next request.
+# skills_updated_at is stamped when the statement runs but becomes
+# visible only at commit, possibly after a refresh has read past that
+# time, so every refresh re-reads a trailing SAFETY_SECONDS window
+# (re-applying an unchanged volunteer is a no-op). Deleted volunteers
+# are read from volunteer_deleted over the same window and cleared
+# from every bitset.
+# ================================================================
+
+import heapq
+import re
+import threading
+from datetime import timedelta
+
+SAFETY_SECONDS = 120     # longer than any transaction that stamps skills
+
+_NONZERO = re.compile(rb'[^\x00]')
+
+
+def _from_rows(rows):
+    """Build a bitset from an iterable of row numbers in one allocation."""
+    rows = list(rows)
+    if not rows:
+        return 0
+    buf = bytearray(max(rows) // 8 + 1)
+    for r in rows:
+        buf[r >> 3] |= 1 << (r & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def _iter_rows(bits):
+    """Yield the row numbers set in a bitset, skipping empty bytes in C."""
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for m in _NONZERO.finditer(raw):
+        i, byte = m.start(), raw[m.start()]
+        for j in range(8):
+            if byte >> j & 1:
+                yield (i << 3) | j
+
+
+class SkillMatcher:
+
+    def __init__(self):
+        self._lock    = threading.Lock()
+        self._loaded  = False
+        self._since   = None     # DB time of the last load/refresh
+        self._row_of  = {}       # volunteer_id -> row
+        self._vid_of  = []       # row -> volunteer_id
+        self._skills  = []       # row -> set of skill names
+        self._bits    = {}       # skill name -> bitset of rows
+        self._any     = 0        # rows holding at least one skill
+
+    # ── Loading ──────────────────────────────────────────────────
+    def _load(self, cur):
+        cur.execute("SELECT NOW()")
+        since = cur.fetchone()[0]
+
+        cur.execute("""
+            SELECT vs.volunteer_id, s.name
+            FROM volunteer_skill vs
+            JOIN skill s ON s.skill_id = vs.skill_id
+            ORDER BY vs.volunteer_id
+        """)
+        row_of, vid_of, skills, rows_by_skill = {}, [], [], {}
+        for vid, name in cur.fetchall():
+            row = row_of.get(vid)
+            if row is None:
+                row = row_of[vid] = len(vid_of)
+                vid_of.append(vid)
+                skills.append(set())
+            skills[row].add(name)
+            rows_by_skill.setdefault(name, []).append(row)
+
+        self._row_of = row_of
+        self._vid_of = vid_of
+        self._skills = skills
+        self._bits   = {n: _from_rows(r) for n, r in rows_by_skill.items()}
+        self._any    = _from_rows(range(len(vid_of)))
+        self._since  = since
+        self._loaded = True
+
+    def _refresh(self, cur):
+        cur.execute("SELECT NOW()")
+        now = cur.fetchone()[0]
+        since = self._since - timedelta(seconds=SAFETY_SECONDS)
+
+        cur.execute("""
+            SELECT v.volunteer_id, s.name
+            FROM volunteer v
+            LEFT JOIN volunteer_skill vs ON vs.volunteer_id = v.volunteer_id
+            LEFT JOIN skill s ON s.skill_id = vs.skill_id
+            WHERE v.skills_updated_at >= %s
+        """, (since,))
+        changed = {}
+        for vid, name in cur.fetchall():
+            names = changed.setdefault(vid, set())
+            if name is not None:
+                names.add(name)
+
+        for vid, names in changed.items():
+            self.update_volunteer(vid, names)
+
+        cur.execute(
+            "SELECT volunteer_id FROM volunteer_deleted WHERE deleted_at >= %s", (since,)
+        )
+        for (vid,) in cur.fetchall():
+            self.remove_volunteer(vid)
+        self._since = now
+
+    def update_volunteer(self, volunteer_id, names):
+        """Replace one volunteer's skills in place."""
+        row = self._row_of.get(volunteer_id)
+        if row is None:
+            row = self._row_of[volunteer_id] = len(self._vid_of)
+            self._vid_of.append(volunteer_id)
+            self._skills.append(set())
+
+        bit = 1 << row
+        old = self._skills[row]
+        for name in old - names:
+            self._bits[name] &= ~bit
+        for name in names - old:
+            self._bits[name] = self._bits.get(name, 0) | bit
+        self._skills[row] = set(names)
+
+        if names:
+            self._any |= bit
+        else:
+            self._any &= ~bit
+
+    def remove_volunteer(self, volunteer_id):
+        """Clear a deleted volunteer from every bitset; its row stays unused."""
+        if volunteer_id in self._row_of:
+            self.update_volunteer(volunteer_id, set())
+
+    def sync(self, cur):
+        """Load on first use, otherwise apply changes since last call."""
+        with self._lock:
+            if self._loaded:
+                self._refresh(cur)
+            else:
+                self._load(cur)
+
+    # ── Scoring ──────────────────────────────────────────────────
+    def rank(self, requirements, exclude=(), k=50):
+        """
+        Score every position at once.
+
+        `requirements` maps position_id -> list of parsed skill names.
+        Returns position_id -> (total, [(volunteer_id, matched), ...])
+        holding the top `k` volunteers that have every required skill
+        and are not in `exclude`, broadest skill set first.
+        """
+        excluded = _from_rows(
+            self._row_of[v] for v in exclude if v in self._row_of
+        )
+        skills = self._skills
+
+        result = {}
+        for pos_id, required in requirements.items():
+            bits = self._any & ~excluded
+            for name in required:
+                bits &= self._bits.get(name, 0)
+                if not bits:
+                    break
+
+            rows  = list(_iter_rows(bits)) if bits else []
+            top   = heapq.nlargest(k, rows, key=lambda r: (len(skills[r]), -r))
+            result[pos_id] = (
+                len(rows),
+                [(self._vid_of[r], len(required)) for r in top],
+            )
+        return result
+
+
+matcher = SkillMatcher()
@@ -0,0 +1,254 @@
+# ================================================================
+# migrations.py  — versioned schema migrations
+#
+#   python -m migrations status          applied / pending / modified
+#   python -m migrations up [version]    apply pending (up to version)
+#   python -m migrations down [steps]    roll back the last step(s)
+#   python -m migrations verify          exit 1 unless schema is current
+#
+# database/schema.sql is the baseline; every change after it is a
+# file database/migrations/NNNN_name.sql with a "-- migrate:up" and a
+# "-- migrate:down" section. Applied versions are recorded in
+# schema_migrations with the file's SHA-256, so an edited migration is
+# reported instead of silently diverging between environments.
+#
+# init_app() makes the web app refuse requests (503) while migrations
+# are pending or modified; the check runs once per process and is
+# cached once the schema is current.
+# ================================================================
+
+import hashlib
+import logging
+import os
+import re
+import sys
+
+from flask import abort
+
+from db import mysql
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "database", "migrations")
+
+_FILENAME = re.compile(r"^(\d{4})_(\w+)\.sql$")
+_SECTION  = re.compile(r"^--\s*migrate:(up|down)\s*$", re.MULTILINE)
+
+log = logging.getLogger(__name__)
+
+
+class MigrationError(Exception):
+    """A migration file is malformed or the recorded history disagrees with it."""
+
+
+class Migration:
+
+    __slots__ = ("version", "name", "checksum", "up", "down")
+
+    def __init__(self, version, name, text):
+        self.version  = version
+        self.name     = name
+        self.checksum = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+        parts = _SECTION.split(text)
+        sections = dict(zip(parts[1::2], parts[2::2]))
+        if "up" not in sections:
+            raise MigrationError(f"{version:04d}_{name}: no '-- migrate:up' section")
+        self.up   = _statements(sections["up"])
+        self.down = _statements(sections.get("down", ""))
+
+
+def _statements(sql):
+    body = "\n".join(l for l in sql.splitlines() if not l.lstrip().startswith("--"))
+    return [s.strip() for s in body.split(";") if s.strip()]
+
+
+def load(directory=MIGRATIONS_DIR):
+    """All migration files, ordered by version."""
+    found = {}
+    for fname in sorted(os.listdir(directory)):
+        m = _FILENAME.match(fname)
+        if not m:
+            continue
+        version = int(m.group(1))
+        if version in found:
+            raise MigrationError(f"duplicate migration version {version:04d}")
+        with open(os.path.join(directory, fname), encoding="utf-8") as f:
+            found[version] = Migration(version, m.group(2), f.read())
+    return [found[v] for v in sorted(found)]
+
+
+# ── History ──────────────────────────────────────────────────────
+def _ensure_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied(cur):
+    """{version: checksum} of recorded migrations."""
+    _ensure_table(cur)
+    cur.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cur.fetchall())
+
+
+def status(cur, migrations=None):
+    """
+    (pending, modified, unknown): migrations not yet applied, applied
+    ones whose file changed since, and recorded versions with no file.
+    """
+    migrations = migrations if migrations is not None else load()
+    done = applied(cur)
+    known = {m.version for m in migrations}
+    pending  = [m for m in migrations if m.version not in done]
+    modified = [m for m in migrations
+                if m.version in done and done[m.version] != m.checksum]
+    unknown  = sorted(v for v in done if v not in known)
+    return pending, modified, unknown
+
+
+def problems(cur):
+    """Human-readable reasons the schema is not current (empty if it is)."""
+    pending, modified, unknown = status(cur)
+    out  = [f"pending {m.version:04d}_{m.name}" for m in pending]
+    out += [f"modified since applied {m.version:04d}_{m.name}" for m in modified]
+    out += [f"applied but missing file {v:04d}" for v in unknown]
+    return out
+
+
+# ── Apply / roll back ────────────────────────────────────────────
+def _run(conn, migration, statements, record):
+    # MySQL commits DDL implicitly; the history row is written last so
+    # a failure leaves the migration pending and the error is reported.
+    cur = conn.cursor()
+    try:
+        for sql in statements:
+            cur.execute(sql)
+        cur.execute(*record)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        raise MigrationError(
+            f"{migration.version:04d}_{migration.name} failed: {e}"
+        ) from e
+    finally:
+        cur.close()
+
+
+def upgrade(conn, target=None):
+    """Apply pending migrations in order, up to `target`. Returns those applied."""
+    cur = conn.cursor()
+    pending, modified, unknown = status(cur)
+    cur.close()
+    if modified:
+        raise MigrationError(
+            "refusing to migrate, applied files changed: "
+            + ", ".join(f"{m.version:04d}_{m.name}" for m in modified)
+        )
+
+    done = []
+    for m in pending:
+        if target is not None and m.version > target:
+            break
+        log.info("applying %04d_%s", m.version, m.name)
+        _run(conn, m, m.up, (
+            "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+            (m.version, m.name, m.checksum),
+        ))
+        done.append(m)
+    return done
+
+
+def downgrade(conn, steps=1):
+    """Roll back the last `steps` applied migrations. Returns those rolled back."""
+    cur = conn.cursor()
+    recorded = applied(cur)
+    cur.close()
+    by_version = {m.version: m for m in load()}
+
+    done = []
+    for version in sorted(recorded, reverse=True)[:steps]:
+        m = by_version.get(version)
+        if m is None:
+            raise MigrationError(f"no file for applied migration {version:04d}")
+        if recorded[version] != m.checksum:
+            raise MigrationError(f"{version:04d}_{m.name} changed since it was applied")
+        if not m.down:
+            raise MigrationError(f"{version:04d}_{m.name} has no down section")
+        log.info("rolling back %04d_%s", m.version, m.name)
+        _run(conn, m, m.down, (
+            "DELETE FROM schema_migrations WHERE version=%s", (m.version,),
+        ))
+        done.append(m)
+    return done
+
+
+# ── Startup check ────────────────────────────────────────────────
+def init_app(app):
+    state = {"current": False}
+
+    @app.before_request
+    def require_current_schema():
+        if state["current"] or not app.config.get("SCHEMA_CHECK", True):
+            return None
+        cur = mysql.connection.cursor()
+        found = problems(cur)
+        mysql.connection.commit()
+        cur.close()
+        if found:
+            log.error("database schema is out of date: %s "
+                      "(run `python -m migrations up`)", "; ".join(found))
+            abort(503)
+        state["current"] = True
+        return None
+
+
+# ==========================
+# python -m migrations <command>
+# ==========================
+def main(argv):
+    from app import app
+
+    command = argv[0] if argv else "status"
+    arg     = int(argv[1]) if len(argv) > 1 else None
+
+    with app.app_context():
+        conn = mysql.connection
+        cur  = conn.cursor()
+
+        if command == "status":
+            pending, modified, unknown = status(cur)
+            done = applied(cur)
+            for m in load():
+                mark = ("modified" if m in modified else
+                        "applied"  if m.version in done else "pending")
+                print(f"{m.version:04d}  {mark:<8}  {m.name}")
+            for v in unknown:
+                print(f"{v:04d}  missing   (no file)")
+        elif command == "up":
+            for m in upgrade(conn, arg):
+                print(f"applied {m.version:04d}_{m.name}")
+        elif command == "down":
+            for m in downgrade(conn, arg or 1):
+                print(f"rolled back {m.version:04d}_{m.name}")
+        elif command == "verify":
+            found = problems(cur)
+            for p in found:
+                print(p)
+            return 1 if found else 0
+        else:
+            print("usage: python -m migrations status|up [version]|down [steps]|verify")
+            return 2
+
+        conn.commit()
+        cur.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    sys.exit(main(sys.argv[1:]))
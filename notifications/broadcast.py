@@ -0,0 +1,149 @@
+# ================================================================
+# notifications/broadcast.py  — fan-out-on-read announcements
+#
+# An announcement is one broadcast row, whatever the audience size:
+#   target='activity'  everyone who joined the activity
+#   target='skills'    everyone holding all broadcast_skill rows; with
+#                      no broadcast_skill rows, everyone holding at
+#                      least min_skills skills (position notices, the
+#                      same rule as skill_index.match_subquery)
+# Audiences are resolved when a volunteer reads the inbox, and a
+# per-volunteer cursor (broadcast_cursor) tracks what has been read.
+# Direct notices stay in `notification`; notifications.inbox merges
+# both streams. Only the unread badge is fanned out on write: publish()
+# bumps notification_counter for the audience at that moment, in one
+# INSERT ... SELECT, and mark_all_read() resets it with the cursor.
+#
+# The live 'broadcast' event carries the targeting, and each
+# volunteer's stream only passes on the ones audience() accepts, so a
+# broadcast wakes (and sends to /notifications/unread) its audience
+# only, not every open dashboard.
+# ================================================================
+
+import events
+from skill_index import ensure_skills, match_subquery
+
+
+def publish(cur, activity_id, template_id, params=None, position_id=None,
+            skills=None, min_skills=1):
+    """
+    Store one announcement (see notifications.templates). `skills=None`
+    targets the activity's volunteers; a list (possibly empty) targets
+    by skill. Caller commits.
+    """
+    target = 'activity' if skills is None else 'skills'
+    cur.execute("""
+        INSERT INTO broadcast
+        (activity_id, position_id, target, min_skills, template_id, params)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, (activity_id, position_id, target, min_skills, template_id, params))
+    broadcast_id = cur.lastrowid
+
+    skill_ids = []
+    if skills:
+        ensure_skills(cur, skills)
+        placeholders = ', '.join(['%s'] * len(skills))
+        cur.execute(f"SELECT skill_id FROM skill WHERE name IN ({placeholders})", tuple(skills))
+        skill_ids = [r[0] for r in cur.fetchall()]
+        cur.executemany(
+            "INSERT INTO broadcast_skill (broadcast_id, skill_id) VALUES (%s, %s)",
+            [(broadcast_id, sid) for sid in skill_ids]
+        )
+
+    _count_unread(cur, activity_id, skills, min_skills)
+    events.publish(
+        cur, 'broadcast', 'notification', broadcast_id=broadcast_id,
+        target=target, activity_id=activity_id, skill_ids=skill_ids,
+        min_skills=min_skills,
+    )
+    return broadcast_id
+
+
+def _count_unread(cur, activity_id, skills, min_skills):
+    """One more unread notice for every volunteer in the audience."""
+    if skills is None:
+        sql, params = """
+            SELECT DISTINCT volunteer_id FROM volunteer_activity
+            WHERE activity_id = %s
+        """, (activity_id,)
+    else:
+        sql, params = match_subquery(skills, min_skills)
+    # In volunteer_id order, so concurrent publishes lock counters alike
+    cur.execute(f"""
+        INSERT INTO notification_counter (volunteer_id, unread)
+        SELECT m.volunteer_id, 1 FROM ({sql}) m
+        ORDER BY m.volunteer_id
+        ON DUPLICATE KEY UPDATE unread = unread + 1
+    """, params)
+
+
+def audience(cur, volunteer_id):
+    """
+    Filter for events.sse_response(): true for 'broadcast' events the
+    volunteer is in the audience of, by the same rules as
+    for_volunteer(). Reads the volunteer's sign-ups and skills once, when
+    the stream opens; joining or editing skills reloads the page and so
+    reopens the stream.
+    """
+    cur.execute(
+        "SELECT activity_id FROM volunteer_activity WHERE volunteer_id = %s", (volunteer_id,)
+    )
+    joined = {r[0] for r in cur.fetchall()}
+    cur.execute(
+        "SELECT skill_id FROM volunteer_skill WHERE volunteer_id = %s", (volunteer_id,)
+    )
+    held = {r[0] for r in cur.fetchall()}
+
+    def accept(data):
+        if data.get('target') == 'activity':
+            return data.get('activity_id') in joined
+        skill_ids = data.get('skill_ids')
+        if skill_ids:
+            return held.issuperset(skill_ids)
+        return len(held) >= data.get('min_skills', 1)
+    return accept
+
+
+def for_volunteer(cur, volunteer_id, since=None, limit=50, before_id=None, after_id=None):
+    """
+    Broadcasts addressed to one volunteer, newest first, as
+    (broadcast_id, activity_id, position_id, template_id, params,
+    created_at).
+    Only announcements made after the volunteer signed up count;
+    before_id / after_id bound the broadcast_id range for paging.
+    """
+    cur.execute("""
+        SELECT b.broadcast_id, b.activity_id, b.position_id,
+               b.template_id, b.params, b.created_at
+        FROM volunteer v
+        JOIN broadcast b ON b.created_at >= GREATEST(v.created_at, COALESCE(%s, v.created_at))
+        WHERE v.volunteer_id = %s
+          AND b.broadcast_id < COALESCE(%s, ~0)
+          AND b.broadcast_id > COALESCE(%s, 0)
+          AND (
+            (b.target = 'activity' AND EXISTS (
+                SELECT 1 FROM volunteer_activity va
+                WHERE va.volunteer_id = v.volunteer_id
+                  AND va.activity_id  = b.activity_id
+            ))
+            OR
+            (b.target = 'skills'
+             AND NOT EXISTS (
+                SELECT 1 FROM broadcast_skill bs
+                LEFT JOIN volunteer_skill vs
+                       ON vs.skill_id = bs.skill_id
+                      AND vs.volunteer_id = v.volunteer_id
+                WHERE bs.broadcast_id = b.broadcast_id
+                  AND vs.skill_id IS NULL
+             )
+             AND (EXISTS (
+                    SELECT 1 FROM broadcast_skill bs
+                    WHERE bs.broadcast_id = b.broadcast_id
+                  )
+                  OR (SELECT COUNT(*) FROM volunteer_skill
+                      WHERE volunteer_id = v.volunteer_id) >= b.min_skills))
+          )
+        ORDER BY b.broadcast_id DESC
+        LIMIT %s
+    """, (since, volunteer_id, before_id, after_id, limit))
+    return cur.fetchall()
@@ -0,0 +1,69 @@
+# ================================================================
+# notifications/digest.py  — daily email digest
+#
+# Run once a day (cron):   python -m notifications.digest
+#
+# Volunteers who opted into digest_email get one message listing
+# every direct and broadcast notice since their last digest, instead
+# of one email per position from notifications.worker.
+# ================================================================
+
+import logging
+
+from flask import current_app
+from db import mysql
+from notifications import inbox
+from notifications.mailer import Mailer, digest_message
+
+# Most notices listed in one digest email
+DIGEST_LIMIT = 50
+
+log = logging.getLogger(__name__)
+
+
+def send_digests():
+    cur = mysql.connection.cursor()
+    cur.execute("SELECT NOW()")
+    now = cur.fetchone()[0]
+
+    cur.execute("""
+        SELECT volunteer_id, email, CONCAT(first_name, ' ', last_name),
+               COALESCE(digest_sent_at, %s - INTERVAL 1 DAY)
+        FROM volunteer
+        WHERE digest_email = TRUE
+    """, (now,))
+    subscribers = cur.fetchall()
+
+    # Position notices are broadcasts, so each audience is resolved here
+    pending = {}
+    for vid, email, name, since in subscribers:
+        notices, _ = inbox.page(cur, vid, since=since, limit=DIGEST_LIMIT)
+        items = [n['message'] for n in notices if n['created_at'] > since]
+        if items:
+            pending[vid] = (email, name, items)
+
+    with Mailer.from_config(current_app.config) as mailer:
+        mailer.send([
+            digest_message(email, name, items)
+            for email, name, items in pending.values()
+        ])
+
+    if pending:
+        placeholders = ', '.join(['%s'] * len(pending))
+        cur.execute(f"""
+            UPDATE volunteer SET digest_sent_at=%s
+            WHERE volunteer_id IN ({placeholders})
+        """, (now, *pending))
+        mysql.connection.commit()
+    cur.close()
+
+    log.info("sent %d digest(s)", len(pending))
+    return len(pending)
+
+
+if __name__ == "__main__":
+    from app import app
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    with app.app_context():
+        send_digests()
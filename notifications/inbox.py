@@ -0,0 +1,153 @@
+# ================================================================
+# notifications/inbox.py  — volunteer inbox
+#
+# Merges direct notification rows with broadcasts, paged by keyset,
+# and renders only the page being returned (notifications.templates):
+# the cursor "<notification_id>.<broadcast_id>" holds the oldest id
+# already shown from each stream, so every page is two index range
+# scans no matter how deep the volunteer scrolls.
+#
+# The badge reads notification_counter alone: add_direct and
+# broadcast.publish bump it, mark_all_read resets it, so it never
+# runs COUNT(*) over notification or resolves broadcast audiences.
+# ================================================================
+
+import heapq
+
+import events
+from notifications import broadcast, templates
+
+PAGE_SIZE = 20
+
+
+def _decode(cursor):
+    try:
+        n_id, b_id = (int(x) if x else None for x in (cursor or '').split('.'))
+        return n_id, b_id
+    except ValueError:
+        return None, None
+
+
+def _encode(n_id, b_id):
+    return f"{n_id or ''}.{b_id or ''}"
+
+
+def page(cur, volunteer_id, cursor=None, limit=PAGE_SIZE, since=None):
+    """
+    One page of the merged inbox, newest first.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    before_n, before_b = _decode(cursor)
+
+    sql = """
+        SELECT notification_id, activity_id, position_id,
+               template_id, params, created_at, is_read
+        FROM notification
+        WHERE volunteer_id = %s
+    """
+    params = [volunteer_id]
+    if before_n:
+        sql += " AND notification_id < %s"
+        params.append(before_n)
+    if since:
+        sql += " AND created_at >= %s"
+        params.append(since)
+    sql += " ORDER BY notification_id DESC LIMIT %s"
+    params.append(limit + 1)
+
+    cur.execute(sql, params)
+    direct = [
+        dict(kind='direct', id=r[0], activity_id=r[1], position_id=r[2],
+             template_id=r[3], params=r[4], created_at=r[5], is_read=bool(r[6]))
+        for r in cur.fetchall()
+    ]
+
+    last_read = _read_cursor(cur, volunteer_id)
+    broadcasts = [
+        dict(kind='broadcast', id=r[0], activity_id=r[1], position_id=r[2],
+             template_id=r[3], params=r[4], created_at=r[5], is_read=r[0] <= last_read)
+        for r in broadcast.for_volunteer(
+            cur, volunteer_id, since, limit + 1, before_id=before_b
+        )
+    ]
+
+    merged = list(heapq.merge(
+        direct, broadcasts, key=lambda n: n['created_at'], reverse=True
+    ))
+    items = templates.render(cur, merged[:limit])
+    if len(merged) <= limit:
+        return items, None
+
+    for item in items:
+        if item['kind'] == 'direct':
+            before_n = item['id']
+        else:
+            before_b = item['id']
+    return items, _encode(before_n, before_b)
+
+
+def _read_cursor(cur, volunteer_id):
+    cur.execute(
+        "SELECT last_read_id FROM broadcast_cursor WHERE volunteer_id=%s",
+        (volunteer_id,)
+    )
+    row = cur.fetchone()
+    return row[0] if row else 0
+
+
+def unread_count(cur, volunteer_id):
+    """Unread direct notices and broadcasts, from the counter."""
+    cur.execute(
+        "SELECT unread FROM notification_counter WHERE volunteer_id=%s",
+        (volunteer_id,)
+    )
+    row = cur.fetchone()
+    return row[0] if row else 0
+
+
+def add_direct(cur, rows):
+    """
+    Insert direct notices and bump the counters. `rows` are
+    (volunteer_id, activity_id, position_id, template_id, params).
+    Caller commits.
+    """
+    if not rows:
+        return
+    # Both statements are rewritten by pymysql into multi-row INSERTs
+    cur.executemany("""
+        INSERT INTO notification
+        (volunteer_id, activity_id, position_id, template_id, params)
+        VALUES (%s, %s, %s, %s, %s)
+    """, rows)
+
+    per_volunteer = {}
+    for r in rows:
+        per_volunteer[r[0]] = per_volunteer.get(r[0], 0) + 1
+    cur.executemany("""
+        INSERT INTO notification_counter (volunteer_id, unread)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE unread = unread + VALUES(unread)
+    """, sorted(per_volunteer.items()))
+
+    events.publish_many(cur, [
+        (f'volunteer:{vid}', 'notification', {'new': n})
+        for vid, n in per_volunteer.items()
+    ])
+
+
+def mark_all_read(cur, volunteer_id):
+    """Mark every direct and broadcast notice read. Caller commits."""
+    cur.execute("""
+        UPDATE notification SET is_read=TRUE
+        WHERE volunteer_id=%s AND is_read=FALSE
+    """, (volunteer_id,))
+    cur.execute("""
+        INSERT INTO notification_counter (volunteer_id, unread)
+        VALUES (%s, 0)
+        ON DUPLICATE KEY UPDATE unread = 0
+    """, (volunteer_id,))
+    cur.execute("""
+        INSERT INTO broadcast_cursor (volunteer_id, last_read_id)
+        SELECT %s, COALESCE(MAX(broadcast_id), 0) FROM broadcast
+        ON DUPLICATE KEY UPDATE last_read_id = VALUES(last_read_id)
+    """, (volunteer_id,))
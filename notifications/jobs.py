@@ -0,0 +1,127 @@
+# ================================================================
+# notifications/jobs.py  — DB-backed fan-out job queue
+#
+# Routes only enqueue; notifications.worker claims jobs, resolves the
+# recipients and writes the notification rows in batches.
+#
+# Every write after claim() is conditional on the claim_token, so a
+# worker whose lease expired and whose job was reclaimed cannot
+# overwrite the new owner's progress or status; it gets ClaimLost and
+# stops.
+# ================================================================
+
+import uuid
+
+# A running job whose worker stopped heart-beating is reclaimed
+LEASE_MINUTES = 10
+MAX_ATTEMPTS  = 5
+
+
+class ClaimLost(Exception):
+    """The job was reclaimed by another worker after its lease expired."""
+
+
+def enqueue(cur, activity_id, position_id, kind):
+    """Queue a fan-out for one position. Caller commits."""
+    cur.execute("""
+        INSERT INTO notification_job (activity_id, position_id, kind)
+        VALUES (%s, %s, %s)
+    """, (activity_id, position_id, kind))
+    return cur.lastrowid
+
+
+def claim(cur):
+    """
+    Atomically take the next runnable job, or return None. The row
+    ends with the claim token the other calls below need.
+
+    Uses a single conditional UPDATE with a random token rather than
+    SELECT ... FOR UPDATE SKIP LOCKED so it works on MySQL and MariaDB.
+    Caller commits.
+    """
+    token = uuid.uuid4().hex
+    cur.execute(f"""
+        UPDATE notification_job
+        SET status='running', claim_token=%s, locked_at=NOW(),
+            attempts = attempts + 1
+        WHERE (status='queued' AND run_after <= NOW())
+           OR (status='running'
+               AND locked_at < NOW() - INTERVAL {LEASE_MINUTES} MINUTE)
+        ORDER BY job_id
+        LIMIT 1
+    """, (token,))
+    if not cur.rowcount:
+        return None
+
+    cur.execute("""
+        SELECT job_id, activity_id, position_id, kind, attempts,
+               total, processed, last_volunteer_id, claim_token
+        FROM notification_job WHERE claim_token=%s
+    """, (token,))
+    return cur.fetchone()
+
+
+def _owned(cur, job_id):
+    if cur.rowcount == 0:
+        raise ClaimLost(job_id)
+
+
+def start(cur, job_id, token, total, broadcast_id):
+    """Record the recipient count and the published broadcast. Caller commits."""
+    cur.execute("""
+        UPDATE notification_job SET total=%s, broadcast_id=%s
+        WHERE job_id=%s AND claim_token=%s
+    """, (total, broadcast_id, job_id, token))
+    _owned(cur, job_id)
+
+
+def heartbeat(cur, job_id, token, processed, last_volunteer_id):
+    """Record progress after a committed batch. Caller commits."""
+    cur.execute("""
+        UPDATE notification_job
+        SET processed=%s, last_volunteer_id=%s, locked_at=NOW()
+        WHERE job_id=%s AND claim_token=%s
+    """, (processed, last_volunteer_id, job_id, token))
+    _owned(cur, job_id)
+
+
+def finish(cur, job_id, token):
+    cur.execute("""
+        UPDATE notification_job
+        SET status='done', claim_token=NULL, last_error=NULL
+        WHERE job_id=%s AND claim_token=%s
+    """, (job_id, token))
+    _owned(cur, job_id)
+
+
+def fail(cur, job_id, token, attempts, error):
+    """Requeue with exponential backoff, or give up after MAX_ATTEMPTS."""
+    if attempts >= MAX_ATTEMPTS:
+        cur.execute("""
+            UPDATE notification_job
+            SET status='failed', claim_token=NULL, last_error=%s
+            WHERE job_id=%s AND claim_token=%s
+        """, (error, job_id, token))
+    else:
+        cur.execute("""
+            UPDATE notification_job
+            SET status='queued', claim_token=NULL, last_error=%s,
+                run_after = NOW() + INTERVAL %s SECOND
+            WHERE job_id=%s AND claim_token=%s
+        """, (error, 30 * 2 ** (attempts - 1), job_id, token))
+    _owned(cur, job_id)
+
+
+def recent_for_org(cur, org_id, limit=10):
+    """Latest jobs of an organization for the dashboard status panel."""
+    cur.execute("""
+        SELECT j.job_id, a.name, ap.title, j.kind, j.status,
+               j.processed, j.total, j.attempts, j.last_error, j.created_at
+        FROM notification_job j
+        JOIN activity a ON a.activity_id = j.activity_id
+        LEFT JOIN activity_position ap ON ap.position_id = j.position_id
+        WHERE a.org_id = %s
+        ORDER BY j.job_id DESC
+        LIMIT %s
+    """, (org_id, limit))
+    return cur.fetchall()
@@ -0,0 +1,172 @@
+# ================================================================
+# notifications/mailer.py  — pooled SMTP sender
+#
+# One Mailer holds one SMTP connection and reuses it for every
+# message it sends, pausing MAIL_BATCH_DELAY seconds after each
+# MAIL_BATCH_SIZE messages so the relay does not throttle us.
+# Templates are compiled once at import; subjects are plain text and
+# use an environment without HTML autoescaping.
+#
+# For local testing point MAIL_SERVER/MAIL_PORT at a sink, e.g.
+#   python -m aiosmtpd -n -l localhost:8025
+# with MAIL_USE_TLS=false.
+# ================================================================
+
+import logging
+import smtplib
+import time
+from email.message import EmailMessage
+
+from jinja2 import Environment
+
+log = logging.getLogger(__name__)
+
+_env  = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+_text = Environment(autoescape=False)
+
+POSITION_SUBJECT = _text.from_string(
+    "{{ 'Reminder' if kind == 'reminder' else 'New Volunteer Position' }}: "
+    "{{ position }} — {{ activity }}"
+)
+POSITION_HTML = _env.from_string("""
+<h2>{{ 'Position still open' if kind == 'reminder' else 'New Volunteer Opportunity!' }}</h2>
+<p>Hi {{ name }},</p>
+<p>A position matching your skills is open:</p>
+<ul>
+    <li><strong>Activity:</strong> {{ activity }}</li>
+    <li><strong>Position:</strong> {{ position }}</li>
+    <li><strong>Registration closes:</strong> {{ reg_close }}</li>
+</ul>
+<p>Log in to your dashboard to apply.</p>
+""")
+
+DIGEST_SUBJECT = _text.from_string(
+    "{{ items | length }} new volunteer update{{ 's' if items | length != 1 }}"
+)
+DIGEST_HTML = _env.from_string("""
+<h2>Your daily VolunteerHub digest</h2>
+<p>Hi {{ name }},</p>
+<ul>
+{% for message in items %}
+    <li>{{ message }}</li>
+{% endfor %}
+</ul>
+<p>Log in to your dashboard to apply.</p>
+""")
+
+
+def position_message(to_email, name, activity, position, reg_close, kind='new_position'):
+    ctx = dict(name=name, activity=activity, position=position,
+               reg_close=reg_close or 'Open', kind=kind)
+    return _build(to_email, POSITION_SUBJECT.render(ctx), POSITION_HTML.render(ctx))
+
+
+def digest_message(to_email, name, items):
+    ctx = dict(name=name, items=items)
+    return _build(to_email, DIGEST_SUBJECT.render(ctx), DIGEST_HTML.render(ctx))
+
+
+def _build(to_email, subject, html):
+    msg = EmailMessage()
+    msg['To']      = to_email
+    msg['Subject'] = subject
+    msg.set_content("Please view this message in an HTML-capable mail client.")
+    msg.add_alternative(html, subtype='html')
+    return msg
+
+
+class Mailer:
+
+    def __init__(self, server, port=587, username=None, password=None,
+                 use_tls=True, sender=None, batch_size=50, batch_delay=1.0,
+                 timeout=30):
+        self.server      = server
+        self.port        = port
+        self.username    = username
+        self.password    = password
+        self.use_tls     = use_tls
+        self.sender      = sender or username
+        self.batch_size  = batch_size
+        self.batch_delay = batch_delay
+        self.timeout     = timeout
+        self._smtp       = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            server      = config.get('MAIL_SERVER'),
+            port        = config.get('MAIL_PORT', 587),
+            username    = config.get('MAIL_USERNAME'),
+            password    = config.get('MAIL_PASSWORD'),
+            use_tls     = config.get('MAIL_USE_TLS', True),
+            sender      = config.get('MAIL_SENDER'),
+            batch_size  = config.get('MAIL_BATCH_SIZE', 50),
+            batch_delay = config.get('MAIL_BATCH_DELAY', 1.0),
+        )
+
+    @property
+    def enabled(self):
+        return bool(self.server)
+
+    # ── Connection ───────────────────────────────────────────────
+    def open(self):
+        if self._smtp is not None:
+            return
+        smtp = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        if self.use_tls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password)
+        self._smtp = smtp
+
+    def close(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except smtplib.SMTPException:
+            pass
+        self._smtp = None
+
+    def __enter__(self):
+        if self.enabled:
+            self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── Sending ──────────────────────────────────────────────────
+    def send(self, messages):
+        """
+        Send messages over the shared connection.
+
+        Returns the addresses the server refused. Connection-level
+        errors propagate so the caller can retry the whole batch.
+        """
+        if not self.enabled:
+            log.warning("MAIL_SERVER not configured; %d message(s) not sent", len(messages))
+            return []
+
+        refused = []
+        for i, msg in enumerate(messages):
+            if i and i % self.batch_size == 0 and self.batch_delay:
+                time.sleep(self.batch_delay)
+            if 'From' not in msg:
+                msg['From'] = self.sender
+            try:
+                self._send_one(msg)
+            except smtplib.SMTPRecipientsRefused:
+                refused.append(msg['To'])
+                log.warning("recipient refused: %s", msg['To'])
+        return refused
+
+    def _send_one(self, msg):
+        self.open()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Relays drop idle or long-lived sessions; reconnect once
+            self._smtp = None
+            self.open()
+            self._smtp.send_message(msg)
@@ -0,0 +1,78 @@
+# ================================================================
+# notifications/retention.py  — archive old read notifications
+#
+# Run daily (cron):   python -m notifications.retention [days]
+#
+# Walks notification in primary-key order BATCH_SIZE rows at a time
+# and moves read rows older than the cutoff into notification_archive,
+# one short transaction per batch, so it never holds long locks or
+# scans the table in one statement. Unread rows are left in place.
+# ================================================================
+
+import logging
+import sys
+
+from db import mysql
+
+RETENTION_DAYS = 90
+BATCH_SIZE     = 1000
+
+log = logging.getLogger(__name__)
+
+
+def archive(days=RETENTION_DAYS, batch_size=BATCH_SIZE):
+    cur = mysql.connection.cursor()
+    cur.execute("SELECT NOW() - INTERVAL %s DAY", (days,))
+    cutoff = cur.fetchone()[0]
+
+    last_id, moved = 0, 0
+    while True:
+        cur.execute("""
+            SELECT notification_id, is_read, created_at
+            FROM notification
+            WHERE notification_id > %s
+            ORDER BY notification_id
+            LIMIT %s
+        """, (last_id, batch_size))
+        rows = cur.fetchall()
+        if not rows:
+            break
+
+        # ids grow with created_at, so the first recent row ends the walk
+        old  = [r for r in rows if r[2] < cutoff]
+        done = len(old) < len(rows)
+        ids  = [r[0] for r in old if r[1]]
+
+        if ids:
+            placeholders = ', '.join(['%s'] * len(ids))
+            cur.execute(f"""
+                INSERT IGNORE INTO notification_archive
+                (notification_id, volunteer_id, activity_id, position_id,
+                 template_id, params, created_at)
+                SELECT notification_id, volunteer_id, activity_id, position_id,
+                       template_id, params, created_at
+                FROM notification WHERE notification_id IN ({placeholders})
+            """, tuple(ids))
+            cur.execute(
+                f"DELETE FROM notification WHERE notification_id IN ({placeholders})",
+                tuple(ids)
+            )
+            mysql.connection.commit()
+            moved += len(ids)
+
+        if done:
+            break
+        last_id = rows[-1][0]
+
+    cur.close()
+    log.info("archived %d notification(s) older than %s", moved, cutoff)
+    return moved
+
+
+if __name__ == "__main__":
+    from app import app
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else RETENTION_DAYS
+    with app.app_context():
+        archive(days)
@@ -0,0 +1,73 @@
+# ================================================================
+# notifications/templates.py  — compact notice storage
+#
+# Notices are stored as (template_id, params) instead of a formatted
+# sentence. Activity and position details are NOT copied into params:
+# they are looked up by activity_id / position_id when a page of
+# notices is rendered, with one query per table for the whole page.
+# ================================================================
+
+import json
+
+LEGACY       = 0      # sentences stored before templates (migration 0008)
+NEW_POSITION = 1
+REMINDER     = 2
+ANNOUNCEMENT = 3
+PROMOTED     = 4
+APPROVED     = 5
+REJECTED     = 6
+
+_TEXT = {
+    LEGACY:       "{text}",
+    NEW_POSITION: ("New position open: '{position}' for '{activity}'. "
+                   "Required skills: {skills}. Registration closes: {reg_close}."),
+    REMINDER:     ("Reminder: Position '{position}' is still open for '{activity}'. "
+                   "Registration closes: {reg_close}."),
+    ANNOUNCEMENT: "{activity}: {text}",
+    PROMOTED:     ("A slot opened up: you are off the waitlist for '{position}' "
+                   "in '{activity}'."),
+    APPROVED:     "You have been approved for '{position}' in '{activity}'.",
+    REJECTED:     "Your sign-up for '{position}' in '{activity}' was not accepted.",
+}
+
+
+def dump(**params):
+    """Params as the shortest JSON string, or None when empty."""
+    return json.dumps(params, separators=(',', ':'), ensure_ascii=False) if params else None
+
+
+def _lookup(cur, sql, ids):
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    placeholders = ', '.join(['%s'] * len(ids))
+    cur.execute(sql.format(placeholders=placeholders), tuple(ids))
+    return {r[0]: r[1:] for r in cur.fetchall()}
+
+
+def render(cur, items):
+    """
+    Fill item['message'] for a list of notice dicts carrying
+    activity_id, position_id, template_id and params.
+    """
+    activities = _lookup(cur, """
+        SELECT activity_id, name, reg_close FROM activity
+        WHERE activity_id IN ({placeholders})
+    """, (i['activity_id'] for i in items))
+    positions = _lookup(cur, """
+        SELECT position_id, title, required_skills FROM activity_position
+        WHERE position_id IN ({placeholders})
+    """, (i['position_id'] for i in items))
+
+    for item in items:
+        act = activities.get(item['activity_id'], ('an activity', None))
+        pos = positions.get(item['position_id'], ('a position', ''))
+        ctx = dict(
+            activity  = act[0],
+            reg_close = act[1] or 'Open',
+            position  = pos[0],
+            skills    = pos[1] or 'None',
+        )
+        ctx.update(json.loads(item.pop('params') or '{}'))
+        item['message'] = _TEXT[item.pop('template_id')].format_map(ctx)
+    return items
@@ -0,0 +1,141 @@
+# ================================================================
+# notifications/worker.py  — fan-out worker process
+#
+# Run alongside gunicorn:   python -m notifications.worker
+#
+# Claims queued notification_job rows and publishes the notice as a
+# single broadcast row (see notifications.broadcast), so the in-app
+# cost is O(1) however many volunteers match. Emails still need the
+# recipients: they are resolved once through the skill index and
+# mailed BATCH_SIZE at a time with one progress commit per batch, so
+# a retry resumes after the last committed batch.
+#
+# Emails of a batch go out over one SMTP connection before the batch
+# commits, so a mail failure retries the batch (at-least-once email).
+# Volunteers with digest_email set are skipped here and get the
+# notice in notifications.digest instead.
+# ================================================================
+
+import logging
+import time
+
+from flask import current_app
+from db import mysql
+from skill_index import parse_skills, matching_volunteer_ids
+from notifications import jobs, broadcast, templates
+from notifications.mailer import Mailer, position_message
+
+BATCH_SIZE   = 500
+POLL_SECONDS = 2
+
+log = logging.getLogger(__name__)
+
+
+# ================================================================
+# PROCESS ONE JOB
+# ================================================================
+def process(cur, job):
+    job_id, activity_id, position_id, kind, _, total, processed, last_vid, token = job
+
+    cur.execute("""
+        SELECT ap.title, ap.required_skills, a.name, a.reg_close
+        FROM activity_position ap
+        JOIN activity a ON ap.activity_id = a.activity_id
+        WHERE ap.position_id = %s
+    """, (position_id,))
+    pos = cur.fetchone()
+    if not pos:
+        jobs.finish(cur, job_id, token)
+        mysql.connection.commit()
+        return
+
+    pos_title, req_skills_str, act_name, reg_close = pos
+    req_list = parse_skills(req_skills_str)
+
+    # Volunteers holding every required skill. With no requirement, new
+    # positions go to volunteers with 2+ skills and manual reminders to
+    # anyone with a skill, as before.
+    min_skills = 2 if kind == 'new_position' else 1
+    recipients = sorted(matching_volunteer_ids(cur, req_list, min_skills))
+
+    if total is None:
+        broadcast_id = broadcast.publish(
+            cur, activity_id,
+            templates.REMINDER if kind == 'reminder' else templates.NEW_POSITION,
+            position_id = position_id,
+            skills      = req_list,
+            min_skills  = min_skills,
+        )
+        jobs.start(cur, job_id, token, len(recipients), broadcast_id)
+        mysql.connection.commit()
+
+    pending = [v for v in recipients if v > last_vid]
+    with Mailer.from_config(current_app.config) as mailer:
+        for i in range(0, len(pending), BATCH_SIZE):
+            batch = pending[i:i + BATCH_SIZE]
+
+            placeholders = ', '.join(['%s'] * len(batch))
+            cur.execute(f"""
+                SELECT volunteer_id, email,
+                       CONCAT(first_name, ' ', last_name), digest_email
+                FROM volunteer WHERE volunteer_id IN ({placeholders})
+            """, tuple(batch))
+            contacts = cur.fetchall()
+
+            mailer.send([
+                position_message(email, name, act_name, pos_title, reg_close, kind)
+                for _, email, name, digest in contacts if not digest
+            ])
+
+            processed += len(contacts)
+            jobs.heartbeat(cur, job_id, token, processed, batch[-1])
+            mysql.connection.commit()
+
+    jobs.finish(cur, job_id, token)
+    mysql.connection.commit()
+
+
+def run_once():
+    """Claim and run one job. Returns False when the queue is empty."""
+    cur = mysql.connection.cursor()
+    job = jobs.claim(cur)
+    mysql.connection.commit()
+    if job is None:
+        cur.close()
+        return False
+
+    job_id, attempts, token = job[0], job[4], job[8]
+    try:
+        process(cur, job)
+        log.info("job %s done", job_id)
+    except jobs.ClaimLost:
+        # Lease expired and another worker owns the job now; the batch
+        # in flight (and a broadcast not yet recorded) is rolled back.
+        mysql.connection.rollback()
+        log.warning("job %s was reclaimed by another worker, stopped", job_id)
+    except Exception as e:
+        mysql.connection.rollback()
+        try:
+            jobs.fail(cur, job_id, token, attempts, repr(e))
+            mysql.connection.commit()
+        except jobs.ClaimLost:
+            mysql.connection.rollback()
+        log.exception("job %s failed (attempt %s)", job_id, attempts)
+    finally:
+        cur.close()
+    return True
+
+
+def run(poll_seconds=POLL_SECONDS):
+    from app import app
+
+    while True:
+        with app.app_context():
+            busy = run_once()
+        if not busy:
+            time.sleep(poll_seconds)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run()
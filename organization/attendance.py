@@ -0,0 +1,92 @@
+# ================================================================
+# organization/attendance.py  — attendance / rating grid
+#
+# The whole grid of an activity is saved in one request: one SELECT
+# of the current values, one executemany() UPDATE of the rows that
+# actually changed, one commit by the caller.
+# ================================================================
+
+
+class GridError(ValueError):
+    """The submitted grid is malformed; the message is shown to the user."""
+
+
+def _attendance(value):
+    if isinstance(value, bool):
+        return value
+    if value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ('0', '1', 'true', 'false', 'present', 'pending'):
+        return value.strip().lower() in ('1', 'true', 'present')
+    raise GridError(f"attendance must be 0/1 or true/false, got {value!r}")
+
+
+def _rating(value):
+    if value is None or value == '':
+        return None
+    try:
+        rating = int(value)
+    except (TypeError, ValueError):
+        raise GridError(f"rating must be a number from 1 to 5, got {value!r}")
+    if not 1 <= rating <= 5:
+        raise GridError(f"rating must be a number from 1 to 5, got {rating}")
+    return rating
+
+
+def parse_json(payload):
+    """{"rows": [{"id", "attendance", "rating"}, ...]} -> {id: (attendance, rating)}"""
+    rows = payload.get('rows') if isinstance(payload, dict) else None
+    if not isinstance(rows, list):
+        raise GridError('expected {"rows": [...]}')
+    grid = {}
+    for row in rows:
+        if not isinstance(row, dict) or 'id' not in row:
+            raise GridError("every row needs an id")
+        try:
+            sid = int(row['id'])
+        except (TypeError, ValueError):
+            raise GridError(f"bad id {row['id']!r}")
+        grid[sid] = (_attendance(row.get('attendance', False)), _rating(row.get('rating')))
+    return grid
+
+
+def parse_form(form):
+    """attendance-<id>=0|1 and rating-<id>=1..5 fields -> {id: (attendance, rating)}"""
+    grid = {}
+    for key in form:
+        if not key.startswith('attendance-'):
+            continue
+        try:
+            sid = int(key[len('attendance-'):])
+        except ValueError:
+            raise GridError(f"bad field {key!r}")
+        grid[sid] = (_attendance(form[key]), _rating(form.get(f'rating-{sid}')))
+    return grid
+
+
+def apply(cur, activity_id, grid):
+    """
+    Write the grid for one activity. Returns the changed rows as
+    [(id, attendance, rating)]. Ids that are not sign-ups of this
+    activity raise GridError before anything is written.
+    """
+    if not grid:
+        return []
+    placeholders = ', '.join(['%s'] * len(grid))
+    cur.execute(f"""
+        SELECT id, attendance, performance_rating FROM volunteer_activity
+        WHERE activity_id = %s AND id IN ({placeholders})
+    """, (activity_id, *grid))
+    current = {r[0]: (bool(r[1]), r[2]) for r in cur.fetchall()}
+
+    unknown = sorted(set(grid) - set(current))
+    if unknown:
+        raise GridError(f"not sign-ups of this activity: {', '.join(map(str, unknown[:10]))}")
+
+    changed = [(sid, *values) for sid, values in grid.items() if current[sid] != values]
+    if changed:
+        cur.executemany("""
+            UPDATE volunteer_activity SET attendance=%s, performance_rating=%s
+            WHERE id=%s
+        """, [(att, rating, sid) for sid, att, rating in changed])
+    return changed
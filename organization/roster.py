@@ -0,0 +1,110 @@
+# ================================================================
+# organization/roster.py  — data loading for the volunteers page
+#
+# Fetches everything the page needs in a fixed number of queries,
+# independent of how many positions the activity has:
+#   activity, positions, all rosters, candidate refresh, candidate
+#   details. Grouping by position happens in memory.
+# ================================================================
+
+from matching import matcher
+from skill_index import parse_skills
+
+
+def load_rosters(cur, activity_id):
+    """
+    All sign-ups of an activity in one query.
+
+    Returns (by_position, waitlists, unassigned, joined_ids); roster
+    rows keep the (id, first, last, email, phone, skills, attendance,
+    rating, status) shape the template expects. Waitlisted sign-ups are
+    kept apart, in queue order.
+    """
+    cur.execute("""
+        SELECT va.position_id, va.volunteer_id,
+               va.id, vol.first_name, vol.last_name,
+               vol.email, vol.phone, vol.skills,
+               va.attendance, va.performance_rating, va.status
+        FROM volunteer_activity va
+        JOIN volunteer vol ON va.volunteer_id = vol.volunteer_id
+        WHERE va.activity_id = %s
+        ORDER BY vol.first_name
+    """, (activity_id,))
+
+    by_position, waitlists, unassigned, joined_ids = {}, {}, [], set()
+    for pos_id, vol_id, *row in cur.fetchall():
+        joined_ids.add(vol_id)
+        if pos_id is None:
+            unassigned.append(tuple(row))
+        elif row[-1] == 'waitlisted':
+            waitlists.setdefault(pos_id, []).append(tuple(row))
+        else:
+            by_position.setdefault(pos_id, []).append(tuple(row))
+    for queue in waitlists.values():
+        queue.sort(key=lambda r: r[0])
+    return by_position, waitlists, unassigned, joined_ids
+
+
+def load_candidates(cur, positions, exclude, limit):
+    """
+    Top `limit` available volunteers for every position, ranked once.
+
+    Returns (by_position, totals); candidate rows are
+    (volunteer_id, first, last, email, skills, match_count).
+    """
+    matcher.sync(cur)
+    ranked = matcher.rank(
+        {pos[0]: parse_skills(pos[2]) for pos in positions},
+        exclude = exclude,
+        k       = limit,
+    )
+
+    candidate_ids = {vid for _, top in ranked.values() for vid, _ in top}
+    details = {}
+    if candidate_ids:
+        placeholders = ', '.join(['%s'] * len(candidate_ids))
+        cur.execute(f"""
+            SELECT volunteer_id, first_name, last_name, email, skills
+            FROM volunteer
+            WHERE volunteer_id IN ({placeholders})
+        """, tuple(candidate_ids))
+        details = {r[0]: r for r in cur.fetchall()}
+
+    by_position, totals = {}, {}
+    for pos_id, (total, top) in ranked.items():
+        by_position[pos_id] = [
+            (*details[vid], matched) for vid, matched in top if vid in details
+        ]
+        totals[pos_id] = total
+    return by_position, totals
+
+
+def load_page(cur, activity_id, candidate_limit):
+    """Template context for organization/volunteers.html."""
+    cur.execute("""
+        SELECT a.name, a.type, a.place, a.start_date, a.end_date,
+               a.description, a.reg_open, a.reg_close
+        FROM activity a WHERE a.activity_id = %s
+    """, (activity_id,))
+    activity = cur.fetchone()
+
+    cur.execute("""
+        SELECT position_id, title, required_skills, slots, filled
+        FROM activity_position
+        WHERE activity_id = %s
+        ORDER BY position_id
+    """, (activity_id,))
+    positions = cur.fetchall()
+
+    rosters, waitlists, unassigned, joined_ids = load_rosters(cur, activity_id)
+    eligible, totals = load_candidates(cur, positions, joined_ids, candidate_limit)
+
+    return dict(
+        activity               = activity,
+        positions              = positions,
+        volunteers_by_position = {p[0]: rosters.get(p[0], []) for p in positions},
+        waitlist_by_position   = {p[0]: waitlists.get(p[0], []) for p in positions},
+        unassigned             = unassigned,
+        eligible_by_position   = eligible,
+        eligible_totals        = totals,
+    )
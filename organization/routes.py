@@ -6,14 +6,29 @@ import os
 import uuid
 from flask import (
     Blueprint, render_template, request,
-    redirect, session, flash, current_app
+    redirect, session, flash, current_app, jsonify
 )
 from db import mysql
+from notifications import jobs, broadcast, templates
+import events
+from organization.roster import load_page
+from organization import attendance
+from repository import accounts
+from repository import organizations
+import signups
+from vocabulary import vocabulary
 from werkzeug.security import check_password_hash, generate_password_hash
 from datetime import datetime
 
 org_bp = Blueprint("organization", __name__)
 
+# Candidates listed per position on the volunteers page
+CANDIDATE_LIMIT = 50
+# Decisions accepted by one bulk status request
+MAX_BULK = 1000
+# Attempts of a bulk status transaction InnoDB picked as deadlock victim
+DEADLOCK_RETRIES = 3
+
 
 # ── Auth guard ───────────────────────────────────────────────────
 def org_required(f):
@@ -27,31 +42,6 @@ def org_required(f):
     return decorated
 
 
-# ── Email helper ─────────────────────────────────────────────────
-def send_notification_email(to_email, volunteer_name, activity_name, position_title, reg_close):
-    try:
-        from flask_mail import Message
-        from app import mail
-        msg = Message(
-            subject=f"New Volunteer Position: {position_title} — {activity_name}",
-            recipients=[to_email],
-            html=f"""
-            <h2>New Volunteer Opportunity!</h2>
-            <p>Hi {volunteer_name},</p>
-            <p>A new position matching your skills is open:</p>
-            <ul>
-                <li><strong>Activity:</strong> {activity_name}</li>
-                <li><strong>Position:</strong> {position_title}</li>
-                <li><strong>Registration closes:</strong> {reg_close}</li>
-            </ul>
-            <p>Log in to your dashboard to apply.</p>
-            """
-        )
-        mail.send(msg)
-    except Exception:
-        pass
-
-
 # ================================================================
 # LOGIN
 # ================================================================
@@ -62,14 +52,11 @@ def login():
         password = request.form["password"]
 
         cur = mysql.connection.cursor()
-        cur.execute(
-            "SELECT org_id, password FROM organization WHERE email=%s", (email,)
-        )
-        user = cur.fetchone()
+        user = accounts.find_credentials(cur, "organization", email)
         cur.close()
 
-        if user and check_password_hash(user[1], password):
-            session["user_id"] = user[0]
+        if user and check_password_hash(user.password, password):
+            session["user_id"] = user.id
             session["role"]    = "organization"
             return redirect("/organization/dashboard")
 
@@ -89,38 +76,26 @@ def dashboard():
     cur    = mysql.connection.cursor()
 
     # Full org details for profile modal pre-fill
-    cur.execute("""
-        SELECT name, email, phone, address, representative, profile_picture
-        FROM organization WHERE org_id=%s
-    """, (org_id,))
-    org = cur.fetchone()
-
-    org_name            = org[0] if org else "Organization"
-    org_email           = org[1] if org else ""
-    org_phone           = org[2] if org else ""
-    org_address         = org[3] if org else ""
-    org_representative  = org[4] if org else ""
-    org_picture         = org[5] if org else None
+    org = organizations.profile(cur, org_id)
+
+    org_name            = org.name            if org else "Organization"
+    org_email           = org.email           if org else ""
+    org_phone           = org.phone           if org else ""
+    org_address         = org.address         if org else ""
+    org_representative  = org.representative  if org else ""
+    org_picture         = org.profile_picture if org else None
 
     # Activities with position + volunteer counts
-    cur.execute("""
-        SELECT a.activity_id, a.name, a.type, a.start_date, a.end_date,
-               a.place, a.description, a.reg_open, a.reg_close,
-               COUNT(DISTINCT ap.position_id) AS position_count,
-               COUNT(DISTINCT va.id)           AS volunteer_count
-        FROM activity a
-        LEFT JOIN activity_position ap ON a.activity_id = ap.activity_id
-        LEFT JOIN volunteer_activity va ON a.activity_id = va.activity_id
-        WHERE a.org_id = %s
-        GROUP BY a.activity_id
-        ORDER BY a.start_date DESC
-    """, (org_id,))
-    activities = cur.fetchall()
+    activities = organizations.activities(cur, org_id)
+
+    # Background notification fan-outs (see notifications.worker)
+    notify_jobs = jobs.recent_for_org(cur, org_id)
 
     cur.close()
     return render_template(
         "organization/dashboard.html",
         activities         = activities,
+        notify_jobs        = notify_jobs,
         org_name           = org_name,
         org_email          = org_email,
         org_phone          = org_phone,
@@ -148,11 +123,7 @@ def update_profile():
         return redirect("/organization/dashboard")
 
     cur = mysql.connection.cursor()
-    cur.execute("""
-        UPDATE organization
-        SET name=%s, phone=%s, address=%s, representative=%s
-        WHERE org_id=%s
-    """, (name, phone, address, representative, org_id))
+    organizations.update_profile(cur, org_id, name, phone, address, representative)
     mysql.connection.commit()
     cur.close()
 
@@ -185,10 +156,9 @@ def update_picture():
 
     # Delete old picture
     cur = mysql.connection.cursor()
-    cur.execute("SELECT profile_picture FROM organization WHERE org_id=%s", (org_id,))
-    old = cur.fetchone()
-    if old and old[0]:
-        old_path = os.path.join(current_app.config.get("UPLOAD_FOLDER", "static/uploads/avatars"), old[0])
+    old = accounts.picture(cur, "organization", org_id)
+    if old:
+        old_path = os.path.join(current_app.config.get("UPLOAD_FOLDER", "static/uploads/avatars"), old)
         if os.path.exists(old_path):
             os.remove(old_path)
 
@@ -198,7 +168,7 @@ def update_picture():
     os.makedirs(upload_dir, exist_ok=True)
     file.save(os.path.join(upload_dir, filename))
 
-    cur.execute("UPDATE organization SET profile_picture=%s WHERE org_id=%s", (filename, org_id))
+    accounts.set_picture(cur, "organization", org_id, filename)
     mysql.connection.commit()
     cur.close()
 
@@ -214,15 +184,14 @@ def update_picture():
 def remove_picture():
     org_id = session["user_id"]
     cur = mysql.connection.cursor()
-    cur.execute("SELECT profile_picture FROM organization WHERE org_id=%s", (org_id,))
-    row = cur.fetchone()
-    if row and row[0]:
+    old = accounts.picture(cur, "organization", org_id)
+    if old:
         old_path = os.path.join(
-            current_app.config.get("UPLOAD_FOLDER", "static/uploads/avatars"), row[0]
+            current_app.config.get("UPLOAD_FOLDER", "static/uploads/avatars"), old
         )
         if os.path.exists(old_path):
             os.remove(old_path)
-    cur.execute("UPDATE organization SET profile_picture=NULL WHERE org_id=%s", (org_id,))
+    accounts.set_picture(cur, "organization", org_id, None)
     mysql.connection.commit()
     cur.close()
     flash("Profile picture removed.", "success")
@@ -253,18 +222,14 @@ def change_password():
         return redirect("/organization/dashboard")
 
     cur = mysql.connection.cursor()
-    cur.execute("SELECT password FROM organization WHERE org_id=%s", (org_id,))
-    row = cur.fetchone()
+    stored = accounts.password_hash(cur, "organization", org_id)
 
-    if not row or not check_password_hash(row[0], current_pw):
+    if not stored or not check_password_hash(stored, current_pw):
         flash("Current password is incorrect.", "error")
         cur.close()
         return redirect("/organization/dashboard")
 
-    cur.execute(
-        "UPDATE organization SET password=%s WHERE org_id=%s",
-        (generate_password_hash(new_pw), org_id)
-    )
+    accounts.set_password(cur, "organization", org_id, generate_password_hash(new_pw))
     mysql.connection.commit()
     cur.close()
 
@@ -289,87 +254,28 @@ def create_activity():
     reg_close   = request.form.get("reg_close") or None
 
     cur = mysql.connection.cursor()
-    cur.execute("""
-        INSERT INTO activity
-        (name, type, place, start_date, end_date, org_id,
-         description, reg_open, reg_close)
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-    """, (name, type_, place, start, end, org_id,
-          description, reg_open, reg_close))
-    mysql.connection.commit()
-    activity_id = cur.lastrowid
+    activity_id = organizations.create_activity(
+        cur, org_id, name, type_, place, start, end, description, reg_open, reg_close
+    )
 
     titles  = request.form.getlist("position_title[]")
     skills  = request.form.getlist("position_skills[]")
     slots   = request.form.getlist("position_slots[]")
 
-    eligible_volunteers = {}
-
     for i, title in enumerate(titles):
         if not title.strip():
             continue
-        req_skills = skills[i].strip()  if i < len(skills)  else ''
+        req_skills = vocabulary.canonical(cur, skills[i]) if i < len(skills) else ''
         num_slots  = int(slots[i])      if i < len(slots) and slots[i].isdigit() else 1
 
-        cur.execute("""
-            INSERT INTO activity_position
-            (activity_id, title, required_skills, slots)
-            VALUES (%s, %s, %s, %s)
-        """, (activity_id, title.strip(), req_skills, num_slots))
-        mysql.connection.commit()
-        position_id = cur.lastrowid
-
-        req_list = [s.strip().lower() for s in req_skills.split(',') if s.strip()]
-
-        if req_list:
-            cur.execute("""
-                SELECT volunteer_id, email,
-                       CONCAT(first_name, ' ', last_name) AS full_name,
-                       skills
-                FROM volunteer
-                WHERE skills IS NOT NULL AND skills != ''
-            """)
-            all_vols = cur.fetchall()
-
-            matched = []
-            for vol in all_vols:
-                vol_id, vol_email, vol_name, vol_skills_str = vol
-                vol_skills = [s.strip().lower() for s in (vol_skills_str or '').split(',') if s.strip()]
-                if all(r in vol_skills for r in req_list):
-                    matched.append((vol_id, vol_email, vol_name))
-            eligible_volunteers[position_id] = matched
-        else:
-            cur.execute("""
-                SELECT volunteer_id, email,
-                       CONCAT(first_name, ' ', last_name) AS full_name
-                FROM volunteer
-                WHERE LENGTH(skills) - LENGTH(REPLACE(skills, ',', '')) >= 1
-            """)
-            eligible_volunteers[position_id] = cur.fetchall()
-
-    for position_id, volunteers in eligible_volunteers.items():
-        cur.execute(
-            "SELECT title, required_skills FROM activity_position WHERE position_id=%s",
-            (position_id,)
+        position_id = organizations.add_position(
+            cur, activity_id, title.strip(), req_skills, num_slots
         )
-        pos = cur.fetchone()
-        pos_title      = pos[0] if pos else "Volunteer"
-        pos_skills_str = pos[1] if pos else ""
-
-        for vol_id, vol_email, vol_name in volunteers:
-            cur.execute("""
-                INSERT INTO notification
-                (volunteer_id, activity_id, message)
-                VALUES (%s, %s, %s)
-            """, (
-                vol_id, activity_id,
-                f"New position open: '{pos_title}' for '{name}'. "
-                f"Required skills: {pos_skills_str or 'None'}. "
-                f"Registration closes: {reg_close or 'Open'}."
-            ))
-            mysql.connection.commit()
-            send_notification_email(vol_email, vol_name, name, pos_title, reg_close or "Open")
 
+        # Recipients are resolved and notified by notifications.worker
+        jobs.enqueue(cur, activity_id, position_id, 'new_position')
+
+    mysql.connection.commit()
     cur.close()
     flash(f"Activity '{name}' created with {len(titles)} position(s)!", "success")
     return redirect("/organization/dashboard")
@@ -381,89 +287,90 @@ def create_activity():
 @org_bp.route("/volunteers/<int:activity_id>")
 @org_required
 def volunteers(activity_id):
-    cur = mysql.connection.cursor()
-
-    cur.execute("""
-        SELECT a.name, a.type, a.place, a.start_date, a.end_date,
-               a.description, a.reg_open, a.reg_close
-        FROM activity a WHERE a.activity_id = %s
-    """, (activity_id,))
-    activity = cur.fetchone()
-
-    cur.execute("""
-        SELECT position_id, title, required_skills, slots, filled
-        FROM activity_position
-        WHERE activity_id = %s
-        ORDER BY position_id
-    """, (activity_id,))
-    positions = cur.fetchall()
-
-    volunteers_by_position = {}
-    for pos in positions:
-        pos_id = pos[0]
-        cur.execute("""
-            SELECT va.id, vol.first_name, vol.last_name,
-                   vol.email, vol.phone, vol.skills,
-                   va.attendance, va.performance_rating, va.status
-            FROM volunteer_activity va
-            JOIN volunteer vol ON va.volunteer_id = vol.volunteer_id
-            WHERE va.activity_id = %s AND va.position_id = %s
-            ORDER BY vol.first_name
-        """, (activity_id, pos_id))
-        volunteers_by_position[pos_id] = cur.fetchall()
-
-    cur.execute("""
-        SELECT va.id, vol.first_name, vol.last_name,
-               vol.email, vol.phone, vol.skills,
-               va.attendance, va.performance_rating, va.status
-        FROM volunteer_activity va
-        JOIN volunteer vol ON va.volunteer_id = vol.volunteer_id
-        WHERE va.activity_id = %s AND va.position_id IS NULL
-        ORDER BY vol.first_name
-    """, (activity_id,))
-    unassigned = cur.fetchall()
-
-    eligible_by_position = {}
-    for pos in positions:
-        pos_id     = pos[0]
-        req_skills = [s.strip().lower() for s in (pos[2] or '').split(',') if s.strip()]
-
-        cur.execute("""
-            SELECT vol.volunteer_id, vol.first_name, vol.last_name,
-                   vol.email, vol.skills
-            FROM volunteer vol
-            WHERE vol.volunteer_id NOT IN (
-                SELECT volunteer_id FROM volunteer_activity
-                WHERE activity_id = %s
-            )
-            AND vol.skills IS NOT NULL AND vol.skills != ''
-        """, (activity_id,))
-        all_available = cur.fetchall()
-
-        matched = []
-        for vol in all_available:
-            vol_id, fn, ln, email, skills_str = vol
-            vol_skills = [s.strip().lower() for s in (skills_str or '').split(',') if s.strip()]
-            if not req_skills or all(r in vol_skills for r in req_skills):
-                match_count = sum(1 for r in req_skills if r in vol_skills)
-                matched.append((vol_id, fn, ln, email, skills_str, match_count))
-
-        matched.sort(key=lambda x: x[5], reverse=True)
-        eligible_by_position[pos_id] = matched
-
+    cur  = mysql.connection.cursor()
+    page = load_page(cur, activity_id, CANDIDATE_LIMIT)
     cur.close()
+
     return render_template(
         "organization/volunteers.html",
-        activity               = activity,
-        activity_id            = activity_id,
-        positions              = positions,
-        volunteers_by_position = volunteers_by_position,
-        unassigned             = unassigned,
-        eligible_by_position   = eligible_by_position,
-        now                    = datetime.now(),
+        activity_id = activity_id,
+        now         = datetime.now(),
+        **page,
     )
 
 
+# ================================================================
+# BULK APPROVE / REJECT  (one transaction, see signups.set_status)
+#
+# Form:  ids=<volunteer_activity id>... action=approve|reject
+# JSON:  {"decisions": {"<id>": "approved" | "rejected", ...}}
+# ================================================================
+@org_bp.route("/volunteers/<int:activity_id>/status", methods=["POST"])
+@org_required
+def bulk_status(activity_id):
+    data = request.get_json(silent=True)
+    try:
+        if data is not None:
+            decisions = {int(k): v for k, v in (data.get("decisions") or {}).items()}
+        else:
+            status = {"approve": "approved", "reject": "rejected"}.get(request.form.get("action"))
+            decisions = {int(i): status for i in request.form.getlist("ids")}
+    except (AttributeError, ValueError):
+        decisions = None
+    if not decisions or any(v not in ("approved", "rejected") for v in decisions.values()):
+        return _bulk_reply(data, 400, error="Choose volunteers and approve or reject.")
+    if len(decisions) > MAX_BULK:
+        return _bulk_reply(data, 400, error=f"At most {MAX_BULK} decisions per request.")
+
+    cur = mysql.connection.cursor()
+    if not organizations.owns_activity(cur, session["user_id"], activity_id):
+        cur.close()
+        return _bulk_reply(data, 404, error="Activity not found.")
+
+    for attempt in range(DEADLOCK_RETRIES):
+        try:
+            result = signups.set_status(cur, activity_id, decisions)
+            events.publish(cur, f'activity:{activity_id}', 'status',
+                           approved=len(result["approved"]), rejected=len(result["rejected"]))
+            mysql.connection.commit()
+            break
+        except Exception as e:
+            if not signups.is_deadlock(e) or attempt == DEADLOCK_RETRIES - 1:
+                raise
+            mysql.connection.rollback()
+    cur.close()
+    return _bulk_reply(data, 200, **result)
+
+
+def _bulk_reply(data, code, error=None, **result):
+    if data is not None:
+        return (jsonify(error=error) if error else jsonify(**result)), code
+    if error:
+        flash(error, "error")
+    else:
+        msg = f"{len(result['approved'])} approved, {len(result['rejected'])} rejected"
+        if result["promoted"]:
+            msg += f", {len(result['promoted'])} promoted from the waitlist"
+        if result["skipped"]:
+            msg += f", {len(result['skipped'])} unchanged"
+        flash(msg + ".", "success")
+    return redirect(request.referrer or "/organization/dashboard")
+
+
+# ================================================================
+# LIVE ROSTER STREAM  (sign-ups + attendance for one activity)
+# ================================================================
+@org_bp.route("/volunteers/<int:activity_id>/stream")
+@org_required
+def volunteers_stream(activity_id):
+    cur = mysql.connection.cursor()
+    owned = organizations.owns_activity(cur, session["user_id"], activity_id)
+    cur.close()
+    if not owned:
+        return "", 404
+    return events.sse_response([f'activity:{activity_id}'])
+
+
 # ================================================================
 # UPDATE VOLUNTEER (attendance + rating)
 # ================================================================
@@ -474,11 +381,9 @@ def update(id):
     rating     = request.form["rating"]
 
     cur = mysql.connection.cursor()
-    cur.execute("""
-        UPDATE volunteer_activity
-        SET attendance=%s, performance_rating=%s
-        WHERE id=%s
-    """, (attendance, rating, id))
+    activity_id = organizations.rate_signup(cur, id, attendance, rating)
+    if activity_id:
+        events.publish(cur, f'activity:{activity_id}', 'attendance', id=id)
     mysql.connection.commit()
     cur.close()
 
@@ -486,6 +391,51 @@ def update(id):
     return redirect(request.referrer)
 
 
+# ================================================================
+# SAVE THE ATTENDANCE GRID  (whole activity, one commit)
+#
+# Form:  attendance-<id>=0|1, rating-<id>=1..5 for every row
+# JSON:  {"rows": [{"id": 1, "attendance": true, "rating": 4}, ...]}
+# Answers with the rows that changed.
+# ================================================================
+@org_bp.route("/attendance/<int:activity_id>", methods=["POST"])
+@org_required
+def save_attendance(activity_id):
+    payload = request.get_json(silent=True)
+
+    cur = mysql.connection.cursor()
+    if not organizations.owns_activity(cur, session["user_id"], activity_id):
+        cur.close()
+        if payload is not None:
+            return jsonify(error="Activity not found."), 404
+        flash("Activity not found.", "error")
+        return redirect("/organization/dashboard")
+
+    try:
+        grid = (attendance.parse_json(payload) if payload is not None
+                else attendance.parse_form(request.form))
+        changed = attendance.apply(cur, activity_id, grid)
+    except attendance.GridError as e:
+        mysql.connection.rollback()
+        cur.close()
+        if payload is not None:
+            return jsonify(error=str(e)), 400
+        flash(f"Attendance not saved: {e}", "error")
+        return redirect(request.referrer or "/organization/dashboard")
+
+    if changed:
+        events.publish(cur, f'activity:{activity_id}', 'attendance', count=len(changed))
+    mysql.connection.commit()
+    cur.close()
+
+    if payload is not None:
+        return jsonify(changed=[
+            dict(id=sid, attendance=att, rating=rating) for sid, att, rating in changed
+        ])
+    flash(f"Attendance saved ({len(changed)} changed).", "success")
+    return redirect(request.referrer or "/organization/dashboard")
+
+
 # ================================================================
 # NOTIFY VOLUNTEERS FOR A POSITION (manual re-notify)
 # ================================================================
@@ -494,45 +444,40 @@ def update(id):
 def notify_position(activity_id, position_id):
     cur = mysql.connection.cursor()
 
-    cur.execute("""
-        SELECT ap.title, ap.required_skills, a.name, a.reg_close
-        FROM activity_position ap
-        JOIN activity a ON ap.activity_id = a.activity_id
-        WHERE ap.position_id = %s
-    """, (position_id,))
-    pos = cur.fetchone()
+    title = organizations.position_title(cur, activity_id, position_id)
 
-    if not pos:
+    if not title:
         flash("Position not found.", "error")
         return redirect(request.referrer)
 
-    pos_title, req_skills_str, act_name, reg_close = pos
-    req_list = [s.strip().lower() for s in (req_skills_str or '').split(',') if s.strip()]
-
-    cur.execute("""
-        SELECT volunteer_id, email,
-               CONCAT(first_name,' ',last_name), skills
-        FROM volunteer
-        WHERE skills IS NOT NULL AND skills != ''
-    """)
-    all_vols = cur.fetchall()
-
-    notified = 0
-    for vol_id, vol_email, vol_name, skills_str in all_vols:
-        vol_skills = [s.strip().lower() for s in (skills_str or '').split(',') if s.strip()]
-        if not req_list or all(r in vol_skills for r in req_list):
-            cur.execute("""
-                INSERT INTO notification (volunteer_id, activity_id, message)
-                VALUES (%s, %s, %s)
-            """, (
-                vol_id, activity_id,
-                f"Reminder: Position '{pos_title}' is still open for '{act_name}'. "
-                f"Registration closes: {reg_close or 'Open'}."
-            ))
-            mysql.connection.commit()
-            send_notification_email(vol_email, vol_name, act_name, pos_title, reg_close or "Open")
-            notified += 1
+    jobs.enqueue(cur, activity_id, position_id, 'reminder')
+    mysql.connection.commit()
+    cur.close()
+
+    flash(f"Notifying eligible volunteers for '{title}' in the background.", "success")
+    return redirect(request.referrer)
+
 
+# ================================================================
+# ANNOUNCE TO AN ACTIVITY'S VOLUNTEERS  (one broadcast row)
+# ================================================================
+@org_bp.route("/announce/<int:activity_id>", methods=["POST"])
+@org_required
+def announce(activity_id):
+    message = request.form.get("message", "").strip()
+    if not message:
+        flash("Announcement cannot be empty.", "error")
+        return redirect(request.referrer)
+
+    cur = mysql.connection.cursor()
+    if not organizations.owns_activity(cur, session["user_id"], activity_id):
+        cur.close()
+        flash("Activity not found.", "error")
+        return redirect(request.referrer)
+
+    broadcast.publish(cur, activity_id, templates.ANNOUNCEMENT, templates.dump(text=message[:900]))
+    mysql.connection.commit()
     cur.close()
-    flash(f"Notified {notified} eligible volunteer(s).", "success")
-    return redirect(request.referrer)
\ No newline at end of file
+
+    flash("Announcement sent to everyone who joined.", "success")
+    return redirect(request.referrer)
@@ -0,0 +1,151 @@
+# ================================================================
+# pool.py  — MySQL connection pool
+#
+# Keeps up to `size` idle pymysql connections per worker process and
+# opens up to `max_overflow` extra ones under load (closed again when
+# returned to a full pool). Borrowers wait up to `timeout` seconds
+# when everything is in use.
+#
+# On borrow, connections older than `recycle` seconds are replaced and
+# connections idle longer than `ping_after` seconds are pinged first,
+# so a server-side wait_timeout or failover never reaches a request.
+#
+# Fork safety: connections inherited from a parent process (gunicorn
+# --preload) are dropped without sending QUIT on the shared socket.
+# ================================================================
+
+import collections
+import os
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    """No connection became free within the pool timeout."""
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, size=5, max_overflow=10, timeout=10,
+                 recycle=1800, ping_after=5):
+        self._connect     = connect
+        self.size         = size
+        self.max_overflow = max_overflow
+        self.timeout      = timeout
+        self.recycle      = recycle
+        self.ping_after   = ping_after
+
+        self._cond  = threading.Condition()
+        self._reset_state()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _reset_state(self):
+        self._pid   = os.getpid()
+        self._idle  = collections.deque()   # (conn, created, last_used)
+        self._total = 0
+        self._stats = collections.Counter()
+
+    def _after_fork(self):
+        # The Condition may have been held by another thread at fork time
+        self._cond = threading.Condition()
+        self._reset_state()
+
+    # ── Borrow / return ──────────────────────────────────────────
+    def acquire(self):
+        if self._pid != os.getpid():
+            self._after_fork()
+
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()    # LIFO keeps hot connections hot
+                    break
+                if self._total < self.size + self.max_overflow:
+                    self._total += 1
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"no MySQL connection free after {self.timeout}s "
+                        f"(size={self.size}, overflow={self.max_overflow})"
+                    )
+                self._stats["waits"] += 1
+                self._cond.wait(remaining)
+
+        self._stats["borrowed"] += 1
+        if entry is None:
+            return self._open()
+
+        conn, created, last_used = entry
+        now = time.monotonic()
+        if now - created > self.recycle:
+            self._stats["recycled"] += 1
+            self._close(conn)
+            return self._open()
+        if now - last_used > self.ping_after:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                self._stats["failed_checks"] += 1
+                self._close(conn)
+                return self._open()
+        return conn
+
+    def release(self, conn):
+        if getattr(conn, "_pool_pid", None) != os.getpid():
+            return  # inherited across fork; the parent still owns the socket
+
+        try:
+            conn.rollback()     # never hand out an open transaction
+        except Exception:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._stats["returned"] += 1
+            if len(self._idle) < self.size:
+                self._idle.append((conn, conn._pool_created, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(conn)
+
+    # ── Internals ────────────────────────────────────────────────
+    def _open(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+        conn._pool_created = time.monotonic()
+        conn._pool_pid     = os.getpid()
+        self._stats["created"] += 1
+        return conn
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _discard(self, conn):
+        self._close(conn)
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return dict(
+                self._stats,
+                size     = self.size,
+                overflow = max(0, self._total - self.size),
+                open     = self._total,
+                idle     = len(self._idle),
+                in_use   = self._total - len(self._idle),
+            )
@@ -0,0 +1,128 @@
+# ================================================================
+# querylog.py  — per-request query instrumentation
+#
+# db.py opens every pooled connection with InstrumentedCursor, which
+# times each statement and records it on the current request:
+# query count, total DB time and the slowest statement. At the end of
+# each request the summary is logged and sent back as a Server-Timing
+# header, so a browser devtools panel or the bench runner can read it.
+#
+# In debug mode two extra checks run:
+#   - a statement executed more than DB_REPEAT_WARN times in one
+#     request (the usual N+1 shape) is logged with its call count;
+#   - a SELECT slower than DB_SLOW_QUERY_MS is logged with its EXPLAIN.
+# ================================================================
+
+import collections
+import logging
+import time
+
+import pymysql.cursors
+from flask import current_app, g, has_request_context, request
+
+log = logging.getLogger(__name__)
+
+
+class QueryStats:
+
+    __slots__ = ("count", "total", "slowest", "slowest_sql", "repeats", "explained")
+
+    def __init__(self):
+        self.count       = 0
+        self.total       = 0.0
+        self.slowest     = 0.0
+        self.slowest_sql = None
+        self.repeats     = collections.Counter()
+        self.explained   = set()
+
+    def record(self, sql, elapsed):
+        self.count += 1
+        self.total += elapsed
+        self.repeats[sql] += 1
+        if elapsed > self.slowest:
+            self.slowest     = elapsed
+            self.slowest_sql = sql
+
+
+def current():
+    """QueryStats for the current request, or None outside one."""
+    if not has_request_context():
+        return None
+    stats = g.get("_query_stats")
+    if stats is None:
+        stats = g._query_stats = QueryStats()
+    return stats
+
+
+def _compact(sql):
+    return " ".join(sql.split())
+
+
+class InstrumentedCursor(pymysql.cursors.Cursor):
+    """
+    pymysql cursor that times execute(). executemany() goes through
+    execute() too (once per multi-row INSERT chunk, otherwise per row),
+    so the count matches the round trips actually made.
+    """
+
+    def execute(self, query, args=None):
+        stats = current()
+        if stats is None:
+            return super().execute(query, args)
+
+        start = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            elapsed = time.perf_counter() - start
+            sql = _compact(query)
+            stats.record(sql, elapsed)
+            if current_app.debug:
+                self._check_slow(stats, sql, args, elapsed)
+
+    def _check_slow(self, stats, sql, args, elapsed):
+        threshold = current_app.config.get("DB_SLOW_QUERY_MS", 200)
+        if elapsed * 1000 < threshold or sql in stats.explained:
+            return
+        stats.explained.add(sql)
+        plan = None
+        if sql[:6].upper() == "SELECT":
+            try:
+                with self.connection.cursor(pymysql.cursors.Cursor) as cur:
+                    cur.execute("EXPLAIN " + sql, args)
+                    plan = cur.fetchall()
+            except pymysql.MySQLError as e:
+                plan = f"EXPLAIN failed: {e}"
+        log.warning("slow query %.1f ms: %s\n  plan: %s", elapsed * 1000, sql, plan)
+
+
+# ── Request hooks ────────────────────────────────────────────────
+def init_app(app):
+    app.after_request(_after_request)
+
+
+def _after_request(response):
+    stats = g.get("_query_stats")
+    if stats is None or not stats.count:
+        return response
+
+    total_ms = stats.total * 1000
+    response.headers["Server-Timing"] = (
+        f'db;dur={total_ms:.1f};desc="{stats.count} queries"'
+    )
+    log.info(
+        "%s %s: %d queries, %.1f ms in DB, slowest %.1f ms: %s",
+        request.method, request.path, stats.count, total_ms,
+        stats.slowest * 1000, (stats.slowest_sql or "")[:200],
+    )
+
+    if current_app.debug:
+        limit = current_app.config.get("DB_REPEAT_WARN", 10)
+        for sql, n in stats.repeats.most_common():
+            if n <= limit:
+                break
+            log.warning(
+                "possible N+1 on %s %s: statement ran %d times: %s",
+                request.method, request.path, n, sql[:200],
+            )
+    return response
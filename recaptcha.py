@@ -0,0 +1,165 @@
+# ================================================================
+# recaptcha.py  — reCAPTCHA verification service
+#
+# Login and register call `verifier.verify(token, remote_ip)`.
+# The Google backend keeps one pooled keep-alive requests.Session per
+# worker, uses strict connect/read timeouts and sits behind a circuit
+# breaker: after RECAPTCHA_FAILURE_THRESHOLD upstream errors in a row
+# it stops calling Google for RECAPTCHA_RESET_SECONDS and answers
+# immediately (rejecting, unless RECAPTCHA_FAIL_OPEN is set).
+#
+# RECAPTCHA_BACKEND=stub swaps in a local verifier for tests and
+# benchmarks: tokens equal to RECAPTCHA_STUB_FAIL_TOKEN fail,
+# everything else non-empty passes, after RECAPTCHA_STUB_DELAY_MS.
+# ================================================================
+
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+SITEVERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+
+
+class VerificationUnavailable(Exception):
+    """The upstream could not give an answer (timeout, error, breaker open)."""
+
+
+# ── Backends ─────────────────────────────────────────────────────
+class GoogleBackend:
+
+    def __init__(self, secret, timeout=3.0, pool_size=10):
+        self.secret  = secret
+        self.timeout = (min(timeout, 1.0), timeout)     # (connect, read)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+
+    def verify(self, token, remote_ip=None):
+        payload = {"secret": self.secret, "response": token}
+        if remote_ip:
+            payload["remoteip"] = remote_ip
+        try:
+            r = self.session.post(SITEVERIFY_URL, data=payload, timeout=self.timeout)
+            r.raise_for_status()
+            return bool(r.json().get("success"))
+        except (requests.RequestException, ValueError) as e:
+            raise VerificationUnavailable(str(e)) from e
+
+
+class StubBackend:
+
+    def __init__(self, fail_token="fail", delay_ms=0):
+        self.fail_token = fail_token
+        self.delay      = delay_ms / 1000
+
+    def verify(self, token, remote_ip=None):
+        if self.delay:
+            time.sleep(self.delay)
+        return bool(token) and token != self.fail_token
+
+
+# ── Circuit breaker ──────────────────────────────────────────────
+class CircuitBreaker:
+
+    def __init__(self, threshold=5, reset_seconds=30):
+        self.threshold     = threshold
+        self.reset_seconds = reset_seconds
+        self._failures     = 0
+        self._opened_at    = None
+        self._lock         = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            # Half-open: let one probe through after the cool-down
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self._failures  = 0
+            self._opened_at = None
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.threshold:
+                if self._opened_at is None:
+                    log.warning("reCAPTCHA circuit opened after %d failures", self._failures)
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+
+# ── Service ──────────────────────────────────────────────────────
+class Verifier:
+
+    def __init__(self):
+        self.backend   = None
+        self.breaker   = CircuitBreaker()
+        self.fail_open = False
+        self._calls    = 0
+        self._total_ms = 0.0
+        self._max_ms   = 0.0
+
+    def init_app(self, app):
+        cfg = app.config
+        if cfg.get("RECAPTCHA_BACKEND") == "stub":
+            self.backend = StubBackend(
+                fail_token = cfg.get("RECAPTCHA_STUB_FAIL_TOKEN", "fail"),
+                delay_ms   = cfg.get("RECAPTCHA_STUB_DELAY_MS", 0),
+            )
+        else:
+            self.backend = GoogleBackend(
+                cfg.get("RECAPTCHA_SECRET"),
+                timeout = cfg.get("RECAPTCHA_TIMEOUT", 3.0),
+            )
+        self.breaker = CircuitBreaker(
+            threshold     = cfg.get("RECAPTCHA_FAILURE_THRESHOLD", 5),
+            reset_seconds = cfg.get("RECAPTCHA_RESET_SECONDS", 30),
+        )
+        self.fail_open = cfg.get("RECAPTCHA_FAIL_OPEN", False)
+        app.extensions["recaptcha"] = self
+
+    def verify(self, token, remote_ip=None):
+        """True if the token is valid. Never blocks past the timeout."""
+        if not token:
+            return False
+        if not self.breaker.allow():
+            return self.fail_open
+
+        start = time.perf_counter()
+        try:
+            ok = self.backend.verify(token, remote_ip)
+            self.breaker.success()
+            return ok
+        except VerificationUnavailable as e:
+            log.warning("reCAPTCHA unavailable: %s", e)
+            self.breaker.failure()
+            return self.fail_open
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self._calls    += 1
+            self._total_ms += elapsed
+            self._max_ms    = max(self._max_ms, elapsed)
+
+    def stats(self):
+        return {
+            "calls":        self._calls,
+            "avg_ms":       self._total_ms / self._calls if self._calls else 0.0,
+            "max_ms":       self._max_ms,
+            "circuit_open": self.breaker.is_open,
+        }
+
+
+verifier = Verifier()
@@ -0,0 +1,321 @@
+# ================================================================
+# recommend.py  — precomputed activity recommendations
+#
+# Run from cron:   python -m recommend           every few minutes
+#                  python -m recommend --full    nightly
+#
+# Ranks the activities that are open for registration for each
+# volunteer and stores the top TOP_N in `recommendation`, so the
+# dashboard reads a few rows instead of scoring on every request.
+#
+# Score, in [0, 1]:
+#   W_SKILL  skill overlap: required skills the volunteer holds in the
+#            best position they qualify for, m / (m + 1), so specific
+#            matches beat activities that need no skills at all
+#   W_TYPE   activity-type history: share of the volunteer's past
+#            sign-ups of this type, each weighted up by attendance and
+#            a good performance_rating
+# Only activities the volunteer may join are ranked (all activity-level
+# required skills, and every skill of at least one position), and
+# activities they already signed up for are skipped.
+#
+# Candidates come from an inverted index skill -> open activities,
+# capped at PER_SKILL soonest per skill, and skill scores are memoized
+# per distinct skill set: with Zipf-distributed skills most volunteers
+# share a handful of sets. Volunteers are processed BATCH_SIZE at a
+# time, one commit per batch. The catalog is read once per run, so each
+# batch drops activities deleted since before storing its lists.
+#
+# The incremental run recomputes only volunteers whose skills changed
+# since the last run (volunteer.skills_updated_at) and volunteers with
+# a skill that a newly created or newly opened activity asks for. New
+# activities that need no skills at all, closed activities and fresh
+# sign-ups are handled at read time (load() filters) and by the next
+# full run.
+# ================================================================
+
+import argparse
+import heapq
+import logging
+
+from db import mysql
+from skill_index import parse_skills
+
+TOP_N      = 20
+PER_SKILL  = 100
+BATCH_SIZE = 2000
+MEMO_LIMIT = 50_000
+MIN_SKILLS = 2      # join_activity refuses volunteers with fewer skills
+
+W_SKILL = 0.6
+W_TYPE  = 0.4
+
+log = logging.getLogger(__name__)
+
+_OPEN = """
+    a.start_date >= CURDATE()
+    AND (a.reg_open  IS NULL OR a.reg_open  <= NOW())
+    AND (a.reg_close IS NULL OR a.reg_close >= NOW())
+"""
+
+
+# ── Catalog of open activities ───────────────────────────────────
+class Catalog:
+
+    def __init__(self, cur):
+        cur.execute("SELECT skill_id, name FROM skill")
+        skill_id = {name: sid for sid, name in cur.fetchall()}
+
+        cur.execute(f"""
+            SELECT a.activity_id, a.type, a.start_date FROM activity a
+            WHERE {_OPEN}
+            ORDER BY a.start_date, a.activity_id
+        """)
+        self.type  = {}
+        self.order = {}         # activity_id -> position in start order
+        for i, (aid, atype, _) in enumerate(cur.fetchall()):
+            self.type[aid]  = atype
+            self.order[aid] = i
+
+        self.required  = {aid: set() for aid in self.type}   # activity-level skill ids
+        self.positions = {aid: [] for aid in self.type}      # [set of skill ids]
+        cur.execute(f"""
+            SELECT ask.activity_id, ask.skill_id
+            FROM activity_skill ask JOIN activity a ON a.activity_id = ask.activity_id
+            WHERE {_OPEN}
+        """)
+        for aid, sid in cur.fetchall():
+            self.required[aid].add(sid)
+
+        cur.execute(f"""
+            SELECT ap.activity_id, ap.required_skills
+            FROM activity_position ap JOIN activity a ON a.activity_id = ap.activity_id
+            WHERE {_OPEN}
+        """)
+        for aid, raw in cur.fetchall():
+            # A skill nobody has registered cannot be held: -1 never matches
+            self.positions[aid].append({skill_id.get(n, -1) for n in parse_skills(raw)})
+
+        by_skill, open_to_all = {}, []
+        for aid in sorted(self.type, key=self.order.get):
+            skills = set(self.required[aid]).union(*self.positions[aid])
+            skills.discard(-1)
+            if not skills:
+                if len(open_to_all) < PER_SKILL:
+                    open_to_all.append(aid)
+                continue
+            for sid in skills:
+                bucket = by_skill.setdefault(sid, [])
+                if len(bucket) < PER_SKILL:
+                    bucket.append(aid)
+        self.by_skill    = by_skill
+        self.open_to_all = open_to_all
+        self._memo       = {}
+
+    def skill_scores(self, skills):
+        """[(activity_id, skill score)] of the activities a skill set may join."""
+        key = frozenset(skills)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        candidates = set(self.open_to_all)
+        for sid in key:
+            candidates.update(self.by_skill.get(sid, ()))
+
+        scored = []
+        for aid in candidates:
+            required = self.required[aid]
+            if not required <= key:
+                continue
+            positions = self.positions[aid]
+            fits = [len(req) for req in positions if req <= key]
+            if positions and not fits:
+                continue
+            m = len(required) + max(fits, default=0)
+            scored.append((aid, m / (m + 1)))
+
+        if len(self._memo) >= MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[key] = scored
+        return scored
+
+
+# ── Scoring ──────────────────────────────────────────────────────
+def type_affinity(history):
+    """[(type, status, attendance, rating)] -> {type: share in [0, 1]}"""
+    weights, total = {}, 0.0
+    for atype, status, attended, rating in history:
+        if status in ('rejected', 'waitlisted'):
+            continue
+        w = 1.0 + bool(attended) + max((rating or 3) - 3, 0) / 2
+        weights[atype] = weights.get(atype, 0.0) + w
+        total += w
+    return {t: w / total for t, w in weights.items()} if total else {}
+
+
+def rank(catalog, skills, history, joined, n=TOP_N):
+    """Top n [(activity_id, score)] for one volunteer, best first."""
+    if len(skills) < MIN_SKILLS:
+        return []
+    affinity = type_affinity(history)
+    scored = (
+        (aid, W_SKILL * s + W_TYPE * affinity.get(catalog.type[aid], 0.0))
+        for aid, s in catalog.skill_scores(skills) if aid not in joined
+    )
+    # Ties go to the activity that starts first
+    return heapq.nlargest(n, scored, key=lambda r: (r[1], -catalog.order[r[0]]))
+
+
+# ── Batch ────────────────────────────────────────────────────────
+def _profiles(cur, vids):
+    """{volunteer_id: (skill ids, history, joined activity ids)} for a batch."""
+    placeholders = ', '.join(['%s'] * len(vids))
+    profiles = {vid: (set(), [], set()) for vid in vids}
+    cur.execute(f"""
+        SELECT volunteer_id, skill_id FROM volunteer_skill
+        WHERE volunteer_id IN ({placeholders})
+    """, vids)
+    for vid, sid in cur.fetchall():
+        profiles[vid][0].add(sid)
+    cur.execute(f"""
+        SELECT va.volunteer_id, va.activity_id, a.type,
+               va.status, va.attendance, va.performance_rating
+        FROM volunteer_activity va JOIN activity a ON a.activity_id = va.activity_id
+        WHERE va.volunteer_id IN ({placeholders})
+    """, vids)
+    for vid, aid, atype, status, attended, rating in cur.fetchall():
+        profiles[vid][1].append((atype, status, attended, rating))
+        profiles[vid][2].add(aid)
+    return profiles
+
+
+def _store(cur, vids, ranked):
+    placeholders = ', '.join(['%s'] * len(vids))
+    cur.execute(f"DELETE FROM recommendation WHERE volunteer_id IN ({placeholders})", vids)
+
+    # The catalog was read at the start of the run; skip activities
+    # deleted since, and share-lock the rest so none goes before commit
+    aids = {aid for top in ranked.values() for aid, _ in top}
+    if aids:
+        cur.execute(f"""
+            SELECT activity_id FROM activity
+            WHERE activity_id IN ({', '.join(['%s'] * len(aids))})
+            LOCK IN SHARE MODE
+        """, tuple(aids))
+        aids = {r[0] for r in cur.fetchall()}
+    rows = [
+        (vid, i, aid, round(score * 1000))
+        for vid, top in ranked.items()
+        for i, (aid, score) in enumerate([t for t in top if t[0] in aids])
+    ]
+    if rows:
+        cur.executemany("""
+            INSERT INTO recommendation (volunteer_id, rank_no, activity_id, score)
+            VALUES (%s, %s, %s, %s)
+        """, rows)
+
+
+def refresh(cur, catalog, vids):
+    """Recompute and store the lists of `vids`, BATCH_SIZE per commit."""
+    for i in range(0, len(vids), BATCH_SIZE):
+        batch = vids[i:i + BATCH_SIZE]
+        profiles = _profiles(cur, batch)
+        _store(cur, batch, {
+            vid: rank(catalog, skills, history, joined)
+            for vid, (skills, history, joined) in profiles.items()
+        })
+        mysql.connection.commit()
+
+
+def _dirty(cur, catalog, since, max_activity_id):
+    """Volunteers whose list may be stale since the last run."""
+    cur.execute("SELECT volunteer_id FROM volunteer WHERE skills_updated_at >= %s", (since,))
+    dirty = {r[0] for r in cur.fetchall()}
+
+    cur.execute(f"""
+        SELECT a.activity_id FROM activity a
+        WHERE {_OPEN} AND (a.activity_id > %s OR a.reg_open >= %s)
+    """, (max_activity_id, since))
+    wanted = set()
+    for (aid,) in cur.fetchall():
+        if aid in catalog.type:
+            wanted.update(catalog.required[aid], *catalog.positions[aid])
+    wanted.discard(-1)
+    if wanted:
+        placeholders = ', '.join(['%s'] * len(wanted))
+        cur.execute(f"""
+            SELECT DISTINCT volunteer_id FROM volunteer_skill
+            WHERE skill_id IN ({placeholders})
+        """, tuple(wanted))
+        dirty.update(r[0] for r in cur.fetchall())
+    return sorted(dirty)
+
+
+def run(full=False):
+    cur = mysql.connection.cursor()
+    cur.execute("SELECT NOW(), COALESCE(MAX(activity_id), 0) FROM activity")
+    started, max_activity_id = cur.fetchone()
+    cur.execute("""
+        SELECT started_at, max_activity_id FROM recommendation_run
+        WHERE finished_at IS NOT NULL ORDER BY run_id DESC LIMIT 1
+    """)
+    last = cur.fetchone()
+
+    catalog = Catalog(cur)
+    if full or last is None:
+        kind = 'full'
+        cur.execute("SELECT volunteer_id FROM volunteer ORDER BY volunteer_id")
+        vids = [r[0] for r in cur.fetchall()]
+    else:
+        kind = 'incremental'
+        vids = _dirty(cur, catalog, *last)
+
+    cur.execute("""
+        INSERT INTO recommendation_run (kind, started_at, max_activity_id, volunteers)
+        VALUES (%s, %s, %s, %s)
+    """, (kind, started, max_activity_id, len(vids)))
+    run_id = cur.lastrowid
+    mysql.connection.commit()
+
+    refresh(cur, catalog, vids)
+
+    cur.execute("UPDATE recommendation_run SET finished_at = NOW() WHERE run_id = %s", (run_id,))
+    mysql.connection.commit()
+    cur.close()
+    log.info("%s run: %d volunteer(s), %d open activities", kind, len(vids), len(catalog.type))
+    return len(vids)
+
+
+# ── Read side ────────────────────────────────────────────────────
+def load(cur, volunteer_id, limit=6):
+    """
+    The volunteer's stored list, still open and not joined, best
+    first: [(activity_id, name, type, start_date, score)].
+    """
+    cur.execute(f"""
+        SELECT a.activity_id, a.name, a.type, a.start_date, r.score
+        FROM recommendation r
+        JOIN activity a ON a.activity_id = r.activity_id
+        WHERE r.volunteer_id = %s AND {_OPEN}
+          AND NOT EXISTS (
+              SELECT 1 FROM volunteer_activity va
+              WHERE va.volunteer_id = r.volunteer_id AND va.activity_id = r.activity_id
+          )
+        ORDER BY r.rank_no
+        LIMIT %s
+    """, (volunteer_id, limit))
+    return cur.fetchall()
+
+
+if __name__ == "__main__":
+    from app import app
+
+    parser = argparse.ArgumentParser(prog="python -m recommend")
+    parser.add_argument("--full", action="store_true",
+                        help="recompute every volunteer instead of the changed ones")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    with app.app_context():
+        run(args.full)
@@ -0,0 +1,17 @@
+# ================================================================
+# repository  — route-level data access
+#
+# The queries the blueprints and app.py run, returning the typed rows
+# of repository.records:
+#   accounts        credentials, registration, password and picture
+#                   of either account type
+#   volunteers      volunteer profile, skills, sign-up history
+#   organizations   organization profile, its activities and positions
+#   admin           admin listings and deletes
+#
+# Domain modules keep their own SQL next to the logic it serves and
+# are called by the routes directly: signups (slots, waitlist),
+# organization.roster / .attendance, volunteer.feed, search, schedule,
+# recommend, matching, skill_index, vocabulary, counters, events and
+# notifications.*.
+# ================================================================
@@ -0,0 +1,88 @@
+# ================================================================
+# repository/accounts.py  — login / registration queries
+# ================================================================
+
+import counters
+from repository.records import Credentials, AdminRow
+
+# role -> (table, id column); the only tables credentials live in
+_ACCOUNT_TABLES = {
+    'volunteer':    ('volunteer',    'volunteer_id'),
+    'organization': ('organization', 'org_id'),
+}
+
+
+def _table(role):
+    return _ACCOUNT_TABLES['volunteer' if role == 'volunteer' else 'organization']
+
+
+def find_credentials(cur, role, email):
+    table, id_col = _table(role)
+    cur.execute(f"SELECT {id_col}, password FROM {table} WHERE email=%s", (email,))
+    row = cur.fetchone()
+    return Credentials(*row) if row else None
+
+
+def email_taken(cur, role, email):
+    table, id_col = _table(role)
+    cur.execute(f"SELECT {id_col} FROM {table} WHERE email=%s", (email,))
+    return cur.fetchone() is not None
+
+
+def create_volunteer(cur, first_name, last_name, email, password_hash,
+                     gender=None, phone=None, skills=''):
+    cur.execute("""
+        INSERT INTO volunteer
+        (first_name, last_name, email, password, gender, phone, skills)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, (first_name, last_name, email, password_hash, gender, phone, skills))
+    counters.bump(cur, volunteers=1)
+    return cur.lastrowid
+
+
+def create_organization(cur, name, email, password_hash,
+                        phone=None, address=None, representative=None):
+    cur.execute("""
+        INSERT INTO organization
+        (name, email, password, phone, address, representative)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, (name, email, password_hash, phone, address, representative))
+    counters.bump(cur, organizations=1)
+    return cur.lastrowid
+
+
+def find_admin(cur, username):
+    cur.execute(
+        "SELECT admin_id, username, password FROM admin WHERE username=%s",
+        (username,)
+    )
+    row = cur.fetchone()
+    return AdminRow(*row) if row else None
+
+
+def password_hash(cur, role, account_id):
+    table, id_col = _table(role)
+    cur.execute(f"SELECT password FROM {table} WHERE {id_col}=%s", (account_id,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def set_password(cur, role, account_id, password_hash):
+    table, id_col = _table(role)
+    cur.execute(f"UPDATE {table} SET password=%s WHERE {id_col}=%s",
+                (password_hash, account_id))
+
+
+def picture(cur, role, account_id):
+    """Stored profile picture file name, or None."""
+    table, id_col = _table(role)
+    cur.execute(f"SELECT profile_picture FROM {table} WHERE {id_col}=%s", (account_id,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def set_picture(cur, role, account_id, filename):
+    """filename=None removes the picture."""
+    table, id_col = _table(role)
+    cur.execute(f"UPDATE {table} SET profile_picture=%s WHERE {id_col}=%s",
+                (filename, account_id))
@@ -0,0 +1,255 @@
+# ================================================================
+# repository/admin.py  — admin dashboard queries
+# ================================================================
+
+import base64
+import json
+
+import counters
+import search
+from repository.records import VolunteerRow, OrganizationRow, ActivityRow
+
+
+# ── Paged listings ───────────────────────────────────────────────
+# Each tab is read one page at a time with keyset pagination on
+# (sort column, primary key), so page N costs the same as page 1.
+# Search is full-text and ranked by relevance (search.py) when the
+# query has indexable words; otherwise (short words, an email address)
+# it is a prefix match on indexed columns. Per-row aggregates
+# (activity_count, volunteer_count) are computed for the page's ids
+# only, never for the whole table.
+
+PAGE_SIZE = 25
+MAX_PAGE  = 100
+
+
+class Listing:
+
+    def __init__(self, table, pk, columns, sorts, default_sort, search, record,
+                 fulltext, joins=''):
+        self.table        = table
+        self.pk           = pk
+        self.columns      = columns
+        self.sorts        = sorts           # name -> (column, record field)
+        self.default_sort = default_sort
+        self.search       = search          # columns matched by prefix
+        self.record       = record
+        self.fulltext     = fulltext        # search.FIELDS index
+        self.joins        = joins
+
+
+LISTINGS = {
+    'volunteers': Listing(
+        'volunteer v', 'v.volunteer_id',
+        'v.volunteer_id, v.first_name, v.last_name, v.email, v.gender, v.phone, '
+        'v.skills, v.profile_picture, v.created_at',
+        sorts        = {'created': ('v.created_at', 'created_at'),
+                        'name':    ('v.last_name', 'last_name'),
+                        'email':   ('v.email', 'email')},
+        default_sort = 'created',
+        search       = ('v.first_name', 'v.last_name', 'v.email'),
+        record       = VolunteerRow,
+        fulltext     = 'volunteer',
+    ),
+    'organizations': Listing(
+        'organization o', 'o.org_id',
+        'o.org_id, o.name, o.email, o.phone, o.address, o.representative, '
+        'o.profile_picture, o.created_at, 0',
+        sorts        = {'created': ('o.created_at', 'created_at'),
+                        'name':    ('o.name', 'name'),
+                        'email':   ('o.email', 'email')},
+        default_sort = 'created',
+        search       = ('o.name', 'o.email'),
+        record       = OrganizationRow,
+        fulltext     = 'organization',
+    ),
+    'activities': Listing(
+        'activity a', 'a.activity_id',
+        'a.activity_id, a.name, a.type, a.place, a.start_date, a.end_date, '
+        'a.reg_open, a.reg_close, o.name, 0',
+        sorts        = {'start':     ('a.start_date', 'start_date'),
+                        'name':      ('a.name', 'name'),
+                        'reg_close': ('a.reg_close', 'reg_close')},
+        default_sort = 'start',
+        search       = ('a.name',),
+        record       = ActivityRow,
+        fulltext     = 'activity',
+        joins        = 'JOIN organization o ON o.org_id = a.org_id',
+    ),
+}
+
+
+def encode_cursor(value, pk):
+    """Opaque cursor for the row after (sort value, pk); dates go as text."""
+    raw = json.dumps([None if value is None else str(value), pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, pk = json.loads(raw)
+        return value, int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def page(cur, tab, sort=None, direction='desc', q='', cursor=None, limit=PAGE_SIZE):
+    """
+    One page of a dashboard tab. Unknown sort names fall back to the
+    tab default; full-text results ignore the sort and come best match
+    first. Returns (rows, next_cursor); next_cursor is None on the last
+    page.
+    """
+    spec  = LISTINGS[tab]
+    col, field = spec.sorts.get(sort) or spec.sorts[spec.default_sort]
+    desc  = direction != 'asc'
+    op    = '<' if desc else '>'
+    order = 'DESC' if desc else 'ASC'
+    limit = max(1, min(int(limit or PAGE_SIZE), MAX_PAGE))
+
+    q = (q or '').strip()
+    ranked = '@' not in q and search.boolean_query(q)
+    if ranked:
+        rows, next_cursor = search.ranked(
+            cur, spec.fulltext, ranked, spec.columns,
+            f'{spec.table} {spec.joins}', spec.pk, cursor=cursor, limit=limit,
+        )
+        return _with_counts(cur, tab, [spec.record(*r) for r in rows]), next_cursor
+
+    where, params = [], []
+    if q:
+        like = q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        where.append('(' + ' OR '.join(f'{c} LIKE %s' for c in spec.search) + ')')
+        params += [like] * len(spec.search)
+
+    # MySQL sorts NULLs first ascending and last descending, so the
+    # keyset has to cross between the NULL and non-NULL runs
+    after = decode_cursor(cursor) if cursor else None
+    if after:
+        value, pk = after
+        if value is None:
+            nulls = f'({col} IS NULL AND {spec.pk} {op} %s)'
+            where.append(nulls if desc else f'({nulls} OR {col} IS NOT NULL)')
+            params.append(pk)
+        else:
+            after_value = f'{col} {op} %s OR ({col} = %s AND {spec.pk} {op} %s)'
+            where.append(f'({after_value} OR {col} IS NULL)' if desc else f'({after_value})')
+            params += [value, value, pk]
+
+    sql = f"SELECT {spec.columns} FROM {spec.table} {spec.joins}"
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += f' ORDER BY {col} {order}, {spec.pk} {order} LIMIT %s'
+    params.append(limit + 1)
+
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    more, rows = len(rows) > limit, rows[:limit]
+    rows = _with_counts(cur, tab, [spec.record(*r) for r in rows])
+
+    next_cursor = None
+    if more:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, field), last[0])
+    return rows, next_cursor
+
+
+def _with_counts(cur, tab, rows):
+    """Fill the per-row aggregate for the page's ids in one grouped query."""
+    if not rows or tab == 'volunteers':
+        return rows
+    ids = [r[0] for r in rows]
+    placeholders = ', '.join(['%s'] * len(ids))
+    if tab == 'organizations':
+        cur.execute(f"""
+            SELECT org_id, COUNT(*) FROM activity
+            WHERE org_id IN ({placeholders}) GROUP BY org_id
+        """, ids)
+        counts = dict(cur.fetchall())
+        return [r._replace(activity_count=counts.get(r.org_id, 0)) for r in rows]
+    cur.execute(f"""
+        SELECT activity_id, COUNT(*) FROM volunteer_activity
+        WHERE activity_id IN ({placeholders}) GROUP BY activity_id
+    """, ids)
+    counts = dict(cur.fetchall())
+    return [r._replace(volunteer_count=counts.get(r.activity_id, 0)) for r in rows]
+
+
+def volunteer_name(cur, volunteer_id):
+    cur.execute(
+        "SELECT first_name, last_name FROM volunteer WHERE volunteer_id=%s",
+        (volunteer_id,)
+    )
+    return cur.fetchone()
+
+
+def organization_name(cur, org_id):
+    cur.execute("SELECT name FROM organization WHERE org_id=%s", (org_id,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def activity_name(cur, activity_id):
+    cur.execute("SELECT name FROM activity WHERE activity_id=%s", (activity_id,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+# ── Unpaged listings (pages kept for compatibility) ──────────────
+def all_volunteers(cur):
+    cur.execute("SELECT volunteer_id, first_name, last_name, email, gender, phone FROM volunteer")
+    return cur.fetchall()
+
+
+def all_organizations(cur):
+    cur.execute("SELECT org_id, name, email, phone, address, representative FROM organization")
+    return cur.fetchall()
+
+
+def all_activities(cur):
+    cur.execute("SELECT activity_id, name, type, place, start_date, end_date, org_id FROM activity")
+    return cur.fetchall()
+
+
+# Deletes cascade (ON DELETE CASCADE); the cascaded rows are counted
+# first so the summary counters drop by the same amount.
+
+def delete_volunteer(cur, volunteer_id):
+    cur.execute(
+        "SELECT COUNT(*) FROM volunteer_activity WHERE volunteer_id=%s",
+        (volunteer_id,)
+    )
+    gone = cur.fetchone()[0]
+    cur.execute("DELETE FROM volunteer WHERE volunteer_id=%s", (volunteer_id,))
+    if cur.rowcount:
+        counters.bump(cur, volunteers=-1, signups=-gone)
+        # Lets every worker's match engine drop the volunteer
+        cur.execute(
+            "INSERT IGNORE INTO volunteer_deleted (volunteer_id) VALUES (%s)",
+            (volunteer_id,)
+        )
+
+
+def delete_organization(cur, org_id):
+    cur.execute("""
+        SELECT COUNT(DISTINCT a.activity_id), COUNT(va.id)
+        FROM activity a
+        LEFT JOIN volunteer_activity va ON va.activity_id = a.activity_id
+        WHERE a.org_id = %s
+    """, (org_id,))
+    activities, gone = cur.fetchone()
+    cur.execute("DELETE FROM organization WHERE org_id=%s", (org_id,))
+    if cur.rowcount:
+        counters.bump(cur, organizations=-1, activities=-activities, signups=-gone)
+
+
+def delete_activity(cur, activity_id):
+    cur.execute(
+        "SELECT COUNT(*) FROM volunteer_activity WHERE activity_id=%s",
+        (activity_id,)
+    )
+    gone = cur.fetchone()[0]
+    cur.execute("DELETE FROM activity WHERE activity_id=%s", (activity_id,))
+    if cur.rowcount:
+        counters.bump(cur, activities=-1, signups=-gone)
@@ -0,0 +1,92 @@
+# ================================================================
+# repository/organizations.py  — organization profile, activities
+#                                and positions
+# ================================================================
+
+import counters
+from repository.records import OrganizationProfile, OrganizationActivityRow
+
+
+def profile(cur, org_id):
+    cur.execute("""
+        SELECT name, email, phone, address, representative, profile_picture
+        FROM organization WHERE org_id=%s
+    """, (org_id,))
+    row = cur.fetchone()
+    return OrganizationProfile(*row) if row else None
+
+
+def update_profile(cur, org_id, name, phone, address, representative):
+    cur.execute("""
+        UPDATE organization
+        SET name=%s, phone=%s, address=%s, representative=%s
+        WHERE org_id=%s
+    """, (name, phone, address, representative, org_id))
+
+
+def activities(cur, org_id):
+    """The organization's activities with position and sign-up counts."""
+    cur.execute("""
+        SELECT a.activity_id, a.name, a.type, a.start_date, a.end_date,
+               a.place, a.description, a.reg_open, a.reg_close,
+               COUNT(DISTINCT ap.position_id) AS position_count,
+               COUNT(DISTINCT va.id)           AS volunteer_count
+        FROM activity a
+        LEFT JOIN activity_position ap ON a.activity_id = ap.activity_id
+        LEFT JOIN volunteer_activity va ON a.activity_id = va.activity_id
+        WHERE a.org_id = %s
+        GROUP BY a.activity_id
+        ORDER BY a.start_date DESC
+    """, (org_id,))
+    return [OrganizationActivityRow(*r) for r in cur.fetchall()]
+
+
+def owns_activity(cur, org_id, activity_id):
+    cur.execute(
+        "SELECT 1 FROM activity WHERE activity_id=%s AND org_id=%s",
+        (activity_id, org_id)
+    )
+    return cur.fetchone() is not None
+
+
+def create_activity(cur, org_id, name, type_, place, start, end,
+                    description='', reg_open=None, reg_close=None):
+    cur.execute("""
+        INSERT INTO activity
+        (name, type, place, start_date, end_date, org_id,
+         description, reg_open, reg_close)
+        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    """, (name, type_, place, start, end, org_id,
+          description, reg_open, reg_close))
+    counters.bump(cur, activities=1)
+    return cur.lastrowid
+
+
+def add_position(cur, activity_id, title, required_skills, slots):
+    cur.execute("""
+        INSERT INTO activity_position
+        (activity_id, title, required_skills, slots)
+        VALUES (%s, %s, %s, %s)
+    """, (activity_id, title, required_skills, slots))
+    return cur.lastrowid
+
+
+def position_title(cur, activity_id, position_id):
+    cur.execute("""
+        SELECT title FROM activity_position
+        WHERE position_id = %s AND activity_id = %s
+    """, (position_id, activity_id))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def rate_signup(cur, signup_id, attendance, rating):
+    """Set one sign-up's attendance and rating; returns its activity_id or None."""
+    cur.execute("""
+        UPDATE volunteer_activity
+        SET attendance=%s, performance_rating=%s
+        WHERE id=%s
+    """, (attendance, rating, signup_id))
+    cur.execute("SELECT activity_id FROM volunteer_activity WHERE id=%s", (signup_id,))
+    row = cur.fetchone()
+    return row[0] if row else None
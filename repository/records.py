@@ -0,0 +1,48 @@
+# ================================================================
+# repository/records.py  — typed rows returned by the repository
+#
+# namedtuples keep rows as light as the raw tuples they replace while
+# giving templates attribute access (v.first_name) without the
+# per-row dict(zip(cols, r)) the routes used to build.
+# ================================================================
+
+from collections import namedtuple
+
+Credentials = namedtuple('Credentials', 'id password')
+
+AdminRow = namedtuple('AdminRow', 'admin_id username password')
+
+VolunteerRow = namedtuple('VolunteerRow', [
+    'volunteer_id', 'first_name', 'last_name', 'email',
+    'gender', 'phone', 'skills', 'profile_picture', 'created_at',
+])
+
+OrganizationRow = namedtuple('OrganizationRow', [
+    'org_id', 'name', 'email', 'phone', 'address',
+    'representative', 'profile_picture', 'created_at', 'activity_count',
+])
+
+ActivityRow = namedtuple('ActivityRow', [
+    'activity_id', 'name', 'type', 'place', 'start_date', 'end_date',
+    'reg_open', 'reg_close', 'org_name', 'volunteer_count',
+])
+
+VolunteerProfile = namedtuple('VolunteerProfile', [
+    'first_name', 'last_name', 'email', 'phone', 'gender',
+    'skills', 'profile_picture', 'digest_email',
+])
+
+JoinedRow = namedtuple('JoinedRow', [
+    'name', 'start_date', 'role', 'attendance', 'performance_rating', 'status',
+])
+
+JoinTarget = namedtuple('JoinTarget', 'required_skills start_date end_date')
+
+OrganizationProfile = namedtuple('OrganizationProfile', [
+    'name', 'email', 'phone', 'address', 'representative', 'profile_picture',
+])
+
+OrganizationActivityRow = namedtuple('OrganizationActivityRow', [
+    'activity_id', 'name', 'type', 'start_date', 'end_date', 'place',
+    'description', 'reg_open', 'reg_close', 'position_count', 'volunteer_count',
+])
@@ -0,0 +1,63 @@
+# ================================================================
+# repository/volunteers.py  — volunteer profile and sign-up history
+# ================================================================
+
+from repository.records import VolunteerProfile, JoinedRow, JoinTarget
+from skill_index import sync_volunteer_skills
+
+
+def profile(cur, volunteer_id):
+    cur.execute("""
+        SELECT first_name, last_name, email, phone, gender,
+               skills, profile_picture, digest_email
+        FROM volunteer
+        WHERE volunteer_id = %s
+    """, (volunteer_id,))
+    row = cur.fetchone()
+    return VolunteerProfile(*row) if row else None
+
+
+def skills(cur, volunteer_id):
+    """The volunteer's skills display string ('' when none)."""
+    cur.execute("SELECT skills FROM volunteer WHERE volunteer_id=%s", (volunteer_id,))
+    row = cur.fetchone()
+    return (row[0] if row else None) or ''
+
+
+def set_skills(cur, volunteer_id, skills_str):
+    """Store the display string and rewrite the skill index. Caller commits."""
+    cur.execute(
+        "UPDATE volunteer SET skills=%s WHERE volunteer_id=%s",
+        (skills_str, volunteer_id)
+    )
+    sync_volunteer_skills(cur, volunteer_id, skills_str)
+
+
+def set_digest(cur, volunteer_id, digest):
+    cur.execute(
+        "UPDATE volunteer SET digest_email=%s WHERE volunteer_id=%s",
+        (digest, volunteer_id)
+    )
+
+
+def joined(cur, volunteer_id):
+    """Every sign-up of the volunteer, latest activity first."""
+    cur.execute("""
+        SELECT a.name, a.start_date, va.role,
+               va.attendance, va.performance_rating, va.status
+        FROM volunteer_activity va
+        JOIN activity a ON va.activity_id = a.activity_id
+        WHERE va.volunteer_id = %s
+        ORDER BY a.start_date DESC
+    """, (volunteer_id,))
+    return [JoinedRow(*r) for r in cur.fetchall()]
+
+
+def join_target(cur, activity_id):
+    """What joining an activity is checked against, or None."""
+    cur.execute(
+        "SELECT required_skills, start_date, end_date FROM activity WHERE activity_id=%s",
+        (activity_id,)
+    )
+    row = cur.fetchone()
+    return JoinTarget(*row) if row else None
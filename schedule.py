@@ -0,0 +1,110 @@
+# ================================================================
+# schedule.py  — schedule conflicts between a volunteer's activities
+#
+# A volunteer's commitments (pending or approved sign-ups that have
+# not ended yet) are loaded with one query and put in an interval
+# tree: the intervals sorted by start, viewed as an implicit balanced
+# binary tree where each node also keeps the latest end date of its
+# subtree. "Which commitments overlap [start, end]" skips every
+# subtree that ends before `start` or begins after `end`, so a check
+# costs O(log n + k) for k conflicts instead of a scan of everything
+# the volunteer has joined. The feed builds the tree once per request
+# and checks every card against it.
+#
+# A single check (joining one activity) does not pay for the tree:
+# overlapping() asks the database directly, reaching the volunteer's
+# sign-ups through uq_va_volunteer_activity and each activity by key.
+# ================================================================
+
+
+class IntervalIndex:
+
+    def __init__(self, intervals):
+        """intervals: [(start, end, item)], dates inclusive."""
+        intervals = sorted(intervals, key=lambda i: i[0])
+        self._start = [i[0] for i in intervals]
+        self._end   = [i[1] for i in intervals]
+        self._item  = [i[2] for i in intervals]
+        self._max   = list(self._end)     # node -> latest end in its subtree
+        self._build(0, len(intervals))
+
+    def __len__(self):
+        return len(self._item)
+
+    def _build(self, lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and self._max[child] > self._max[mid]:
+                self._max[mid] = self._max[child]
+        return mid
+
+    def overlapping(self, start, end):
+        """Items whose interval shares at least one day with [start, end]."""
+        out = []
+        self._search(0, len(self._item), start, end, out)
+        return out
+
+    def _search(self, lo, hi, start, end, out):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max[mid] < start:
+            return                      # the whole subtree ends too early
+        self._search(lo, mid, start, end, out)
+        if self._start[mid] > end:
+            return                      # mid and everything right start too late
+        if self._end[mid] >= start:
+            out.append(self._item[mid])
+        self._search(mid + 1, hi, start, end, out)
+
+
+def commitments(cur, volunteer_id, exclude_activity=None):
+    """
+    IntervalIndex of the volunteer's pending/approved activities that
+    end today or later; items are (activity_id, name). Activities
+    without dates cannot conflict and are left out.
+    """
+    cur.execute("""
+        SELECT a.activity_id, a.name, a.start_date, a.end_date
+        FROM volunteer_activity va
+        JOIN activity a ON a.activity_id = va.activity_id
+        WHERE va.volunteer_id = %s
+          AND va.status IN ('pending', 'approved')
+          AND a.start_date IS NOT NULL
+          AND COALESCE(a.end_date, a.start_date) >= CURDATE()
+    """, (volunteer_id,))
+    return IntervalIndex([
+        (start, end or start, (aid, name))
+        for aid, name, start, end in cur.fetchall()
+        if aid != exclude_activity
+    ])
+
+
+def overlapping(cur, volunteer_id, start, end, exclude_activity=None):
+    """
+    Names of the volunteer's pending/approved activities sharing a day
+    with [start, end], soonest first; the one-off form of conflicts().
+    """
+    if start is None:
+        return []
+    cur.execute("""
+        SELECT a.name
+        FROM volunteer_activity va
+        JOIN activity a ON a.activity_id = va.activity_id
+        WHERE va.volunteer_id = %s
+          AND va.status IN ('pending', 'approved')
+          AND va.activity_id <> COALESCE(%s, 0)
+          AND a.start_date <= %s
+          AND COALESCE(a.end_date, a.start_date) >= %s
+        ORDER BY a.start_date
+    """, (volunteer_id, exclude_activity, end or start, start))
+    return [r[0] for r in cur.fetchall()]
+
+
+def conflicts(index, start, end):
+    """Names of commitments overlapping an activity's dates, soonest first."""
+    if start is None or not len(index):
+        return []
+    return [name for _, name in index.overlapping(start, end or start)]
@@ -0,0 +1,135 @@
+# ================================================================
+# search.py  — full-text search over activities, organizations and
+#              volunteers
+#
+# Backed by InnoDB FULLTEXT indexes (migration 0018), which MySQL keeps
+# up to date on every INSERT/UPDATE, so there is nothing to rebuild:
+#
+#   ft_activity       activity(name, description, place, type)
+#   ft_organization   organization(name)
+#   ft_volunteer      volunteer(first_name, last_name, skills)
+#
+# Queries run in BOOLEAN MODE with every word required and matched as
+# a prefix ("phot mumbai" -> +phot* +mumbai*), so results narrow as
+# words are added and the match set read from the index stays small.
+# Words shorter than innodb_ft_min_token_size or on InnoDB's stopword
+# list are never indexed and are dropped from the query; a query left
+# with no words is not a full-text query (boolean_query() -> None) and
+# callers fall back to their plain filters.
+#
+# Results are ranked by relevance, then newest id, and paged by keyset
+# on (score, id). The score is the MATCH relevance scaled to an
+# integer so the cursor comparison is exact.
+# ================================================================
+
+import re
+
+MIN_TOKEN = 3           # innodb_ft_min_token_size
+MAX_WORDS = 8
+SCALE     = 1_000_000
+PAGE_SIZE = 12
+
+# InnoDB's default stopword list (information_schema.INNODB_FT_DEFAULT_STOPWORD)
+STOPWORDS = frozenset("""
+    a about an are as at be by com de en for from how i in is it la of
+    on or that the this to was what when where who will with und www
+""".split())
+
+FIELDS = {
+    'activity':     'a.name, a.description, a.place, a.type',
+    'organization': 'o.name',
+    'volunteer':    'v.first_name, v.last_name, v.skills',
+}
+
+_WORD = re.compile(r'\w+')
+
+
+def boolean_query(text):
+    """'Photo walks in Pune' -> '+photo* +walks* +pune*', or None."""
+    words = [
+        w for w in _WORD.findall((text or '').lower())
+        if len(w) >= MIN_TOKEN and w not in STOPWORDS
+    ]
+    words = list(dict.fromkeys(words))[:MAX_WORDS]
+    return ' '.join(f'+{w}*' for w in words) or None
+
+
+def match(index):
+    """WHERE clause selecting rows of `index` matching one boolean_query param."""
+    return f"MATCH({FIELDS[index]}) AGAINST(%s IN BOOLEAN MODE)"
+
+
+def score(index):
+    """Integer relevance of rows of `index`; takes the same param as match()."""
+    return f"FLOOR({match(index)} * {SCALE})"
+
+
+def encode_cursor(score_value, row_id):
+    return f"{score_value}.{row_id}"
+
+
+def decode_cursor(cursor):
+    try:
+        value, row_id = cursor.split('.')
+        return int(value), int(row_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def ranked(cur, index, q, select, source, pk, where='', params=(),
+           cursor=None, limit=PAGE_SIZE):
+    """
+    Rows of `select` (primary key first) from `source` that match the
+    boolean query `q` and the optional `where`, best match first.
+    Returns (rows, next_cursor).
+    """
+    conds, args = [match(index)], [q]
+    if where:
+        conds.append(where)
+        args += params
+    after = decode_cursor(cursor) if cursor else None
+    if after:
+        conds.append(f"({score(index)} < %s OR ({score(index)} = %s AND {pk} < %s))")
+        args += [q, after[0], q, after[0], after[1]]
+
+    cur.execute(f"""
+        SELECT {select}, {score(index)} AS score
+        FROM {source}
+        WHERE {' AND '.join(conds)}
+        ORDER BY score DESC, {pk} DESC
+        LIMIT %s
+    """, (q, *args, limit + 1))
+    rows = cur.fetchall()
+    more, rows = len(rows) > limit, rows[:limit]
+
+    next_cursor = None
+    if more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last[-1], last[0])
+    return [r[:-1] for r in rows], next_cursor
+
+
+# ── Public activity search (volunteer dashboard) ─────────────────
+def activities(cur, text, volunteer_id, cursor=None, limit=PAGE_SIZE):
+    """
+    Activities open for registration that the volunteer has not joined
+    and that match `text`, best match first. Returns (rows,
+    next_cursor); rows are (activity_id, name, type, place,
+    start_date, end_date), the shape volunteer.feed.cards() takes.
+    """
+    q = boolean_query(text)
+    if q is None:
+        return [], None
+    return ranked(
+        cur, 'activity', q,
+        'a.activity_id, a.name, a.type, a.place, a.start_date, a.end_date',
+        'activity a', 'a.activity_id',
+        where="""a.start_date >= CURDATE()
+          AND (a.reg_open  IS NULL OR a.reg_open  <= NOW())
+          AND (a.reg_close IS NULL OR a.reg_close >= NOW())
+          AND NOT EXISTS (
+              SELECT 1 FROM volunteer_activity va
+              WHERE va.volunteer_id = %s AND va.activity_id = a.activity_id
+          )""",
+        params=(volunteer_id,), cursor=cursor, limit=limit,
+    )
@@ -0,0 +1,278 @@
+# ================================================================
+# signups.py  — position slots and waitlist
+#
+# activity_position.filled counts the sign-ups holding a slot
+# (status pending or approved). A slot is taken with one conditional
+# UPDATE ... WHERE filled < slots and no SELECT ... FOR UPDATE before
+# it: the row lock is held only from that statement to the caller's
+# commit, and concurrent joins can never overbook a position.
+#
+# A volunteer who finds the position full is stored with status
+# 'waitlisted'; volunteer_activity.id gives the queue order. When a
+# slot holder leaves (rejected, deleted), release() hands the slot
+# straight to the head of the waitlist instead of decrementing
+# filled, so a freed slot is never up for grabs in between. Both
+# sides lock the activity_position row before touching its queue:
+# a join that waitlists re-checks for a free slot under that lock,
+# and release() reads the queue only once it holds it, so a slot is
+# never freed while someone is (about to be) waiting for it.
+#
+# Lock order is always activity_position rows (in position_id order)
+# before volunteer_activity rows: join(), release() and set_status()
+# all follow it, so they queue behind each other instead of
+# deadlocking. Gap locks on the waitlist index can still collide with
+# a concurrent INSERT; callers of set_status() retry on DEADLOCK.
+#
+# UNIQUE(volunteer_id, activity_id) makes a second sign-up for the
+# same activity fail with IntegrityError, positions or not.
+#
+# All functions leave committing to the caller.
+# ================================================================
+
+import pymysql
+
+import counters
+import events
+from notifications import inbox, templates
+from skill_index import parse_skills
+
+JOINED     = 'joined'
+WAITLISTED = 'waitlisted'
+DUPLICATE  = 'duplicate'
+
+DEADLOCK   = 1213       # ER_LOCK_DEADLOCK; InnoDB rolled the transaction back
+
+
+def is_deadlock(e):
+    return isinstance(e, pymysql.err.OperationalError) and e.args[:1] == (DEADLOCK,)
+
+
+def reserve(cur, position_id):
+    """Take one slot of a position. True if one was free."""
+    cur.execute("""
+        UPDATE activity_position SET filled = filled + 1
+        WHERE position_id = %s AND filled < slots
+    """, (position_id,))
+    return cur.rowcount == 1
+
+
+def pick_positions(cur, activity_id, volunteer_skills):
+    """
+    (qualifying, has_positions): ids of the activity's positions the
+    volunteer has the skills for, in display order, and whether the
+    activity has any positions at all.
+    """
+    cur.execute("""
+        SELECT position_id, required_skills FROM activity_position
+        WHERE activity_id = %s ORDER BY position_id
+    """, (activity_id,))
+    rows = cur.fetchall()
+    have = set(volunteer_skills)
+    return [pid for pid, req in rows if set(parse_skills(req)) <= have], bool(rows)
+
+
+def join(cur, volunteer_id, activity_id, position_ids):
+    """
+    Sign a volunteer up for the first of `position_ids` with a free
+    slot, or waitlist them on the first one when all are full.
+
+    Returns (JOINED | WAITLISTED | DUPLICATE, position_id). On
+    DUPLICATE a slot may already have been reserved: the caller must
+    roll back.
+    """
+    if not position_ids:
+        # Activities without positions have no slot limit
+        try:
+            cur.execute("""
+                INSERT INTO volunteer_activity (volunteer_id, activity_id)
+                VALUES (%s, %s)
+            """, (volunteer_id, activity_id))
+        except pymysql.IntegrityError:
+            return DUPLICATE, None
+        counters.bump(cur, signups=1)
+        return JOINED, None
+
+    for position_id in position_ids:
+        if reserve(cur, position_id):
+            status = 'pending'
+            break
+    else:
+        # All full: check again holding the row lock release() takes
+        # first, so a slot freed meanwhile is taken instead of queued
+        position_id = position_ids[0]
+        cur.execute(
+            "SELECT 1 FROM activity_position WHERE position_id = %s FOR UPDATE",
+            (position_id,)
+        )
+        status = 'pending' if reserve(cur, position_id) else 'waitlisted'
+
+    try:
+        cur.execute("""
+            INSERT INTO volunteer_activity (volunteer_id, activity_id, position_id, status)
+            VALUES (%s, %s, %s, %s)
+        """, (volunteer_id, activity_id, position_id, status))
+    except pymysql.IntegrityError:
+        return DUPLICATE, None
+    counters.bump(cur, signups=1)
+    return (JOINED if status == 'pending' else WAITLISTED), position_id
+
+
+def release(cur, position_id, count=1):
+    """
+    `count` slot holders of a position have left. Their slots go to
+    the head of the waitlist; slots nobody is waiting for are freed.
+    Returns the promoted volunteer_activity ids.
+    """
+    # Position first (as join() does), then the true head of the queue
+    cur.execute(
+        "SELECT 1 FROM activity_position WHERE position_id = %s FOR UPDATE",
+        (position_id,)
+    )
+    cur.execute("""
+        SELECT id, volunteer_id, activity_id FROM volunteer_activity
+        WHERE position_id = %s AND status = 'waitlisted'
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE
+    """, (position_id, count))
+    heads = cur.fetchall()
+
+    if heads:
+        placeholders = ', '.join(['%s'] * len(heads))
+        cur.execute(f"""
+            UPDATE volunteer_activity SET status = 'pending'
+            WHERE id IN ({placeholders})
+        """, [h[0] for h in heads])
+        inbox.add_direct(cur, [
+            (vid, aid, position_id, templates.PROMOTED, None) for _, vid, aid in heads
+        ])
+        events.publish_many(cur, [
+            (f'activity:{aid}', 'promoted', {'id': sid, 'volunteer_id': vid})
+            for sid, vid, aid in heads
+        ])
+
+    freed = count - len(heads)
+    if freed:
+        cur.execute("""
+            UPDATE activity_position SET filled = GREATEST(filled - %s, 0)
+            WHERE position_id = %s
+        """, (freed, position_id))
+    return [h[0] for h in heads]
+
+
+def release_for_volunteer(cur, volunteer_id):
+    """Free every slot a volunteer holds, before the volunteer is deleted."""
+    cur.execute("""
+        SELECT position_id, COUNT(*) FROM volunteer_activity
+        WHERE volunteer_id = %s AND position_id IS NOT NULL
+          AND status IN ('pending', 'approved')
+        GROUP BY position_id
+    """, (volunteer_id,))
+    for position_id, n in cur.fetchall():
+        release(cur, position_id, n)
+
+
+# ── Bulk decisions ───────────────────────────────────────────────
+def set_status(cur, activity_id, decisions):
+    """
+    Apply {volunteer_activity id: 'approved' | 'rejected'} for one
+    activity in set-based statements and keep `filled` consistent:
+
+      pending  -> approved   no slot change
+      holder   -> rejected   slot released (waitlist head promoted)
+      waitlist -> rejected   no slot change
+      other    -> approved   needs a free slot; granted in id order up
+                             to the position's free slots, else skipped
+
+    Returns dict(approved, rejected, skipped, promoted) of id lists.
+    Caller commits, and retries the transaction when is_deadlock().
+    """
+    if not decisions:
+        return dict(approved=[], rejected=[], skipped=[], promoted=[])
+
+    # Positions first, in position_id order, like join() and release().
+    # A sign-up's position_id never changes, so a plain read finds them.
+    placeholders = ', '.join(['%s'] * len(decisions))
+    cur.execute(f"""
+        SELECT DISTINCT position_id FROM volunteer_activity
+        WHERE activity_id = %s AND id IN ({placeholders})
+          AND position_id IS NOT NULL
+    """, (activity_id, *decisions))
+    position_ids = sorted(r[0] for r in cur.fetchall())
+    free = {}
+    if position_ids:
+        cur.execute(f"""
+            SELECT position_id, slots - filled FROM activity_position
+            WHERE position_id IN ({', '.join(['%s'] * len(position_ids))})
+            ORDER BY position_id
+            FOR UPDATE
+        """, tuple(position_ids))
+        free = dict(cur.fetchall())
+
+    cur.execute(f"""
+        SELECT id, volunteer_id, position_id, status FROM volunteer_activity
+        WHERE activity_id = %s AND id IN ({placeholders})
+        ORDER BY id
+        FOR UPDATE
+    """, (activity_id, *decisions))
+    rows = cur.fetchall()
+
+    found = {r[0] for r in rows}
+    approve, reject = [], []
+    skipped   = [i for i in decisions if i not in found]
+    freed     = {}      # position_id -> slots given up by rejections
+    need_slot = {}      # position_id -> sign-ups that need a slot to be approved
+    for sid, vid, pid, status in rows:
+        wanted = decisions[sid]
+        if wanted == status:
+            skipped.append(sid)
+        elif wanted == 'rejected':
+            reject.append((sid, vid, pid))
+            if pid is not None and status in ('pending', 'approved'):
+                freed[pid] = freed.get(pid, 0) + 1
+        elif status == 'pending' or pid is None:
+            approve.append((sid, vid, pid))
+        else:
+            need_slot.setdefault(pid, []).append((sid, vid, pid))
+
+    if need_slot:
+        # Slots freed by this batch are used first
+        taken = []
+        for pid, waiting in need_slot.items():
+            reused = min(len(waiting), freed.get(pid, 0))
+            extra  = max(0, min(len(waiting) - reused, free.get(pid, 0)))
+            approve.extend(waiting[:reused + extra])
+            skipped.extend(sid for sid, _, _ in waiting[reused + extra:])
+            freed[pid] = freed.get(pid, 0) - reused
+            if extra:
+                taken.append((extra, pid))
+        if taken:
+            cur.executemany(
+                "UPDATE activity_position SET filled = filled + %s WHERE position_id = %s",
+                taken,
+            )
+
+    for status, group in (('approved', approve), ('rejected', reject)):
+        if group:
+            cur.execute(f"""
+                UPDATE volunteer_activity SET status = %s
+                WHERE id IN ({', '.join(['%s'] * len(group))})
+            """, (status, *(sid for sid, _, _ in group)))
+
+    # Remaining freed slots go to the waitlists
+    promoted = []
+    for pid, n in freed.items():
+        if n:
+            promoted += release(cur, pid, n)
+
+    inbox.add_direct(cur, [
+        (vid, activity_id, pid, templates.APPROVED, None) for _, vid, pid in approve
+    ] + [
+        (vid, activity_id, pid, templates.REJECTED, None) for _, vid, pid in reject
+    ])
+    return dict(
+        approved = [sid for sid, _, _ in approve],
+        rejected = [sid for sid, _, _ in reject],
+        skipped  = skipped,
+        promoted = promoted,
+    )
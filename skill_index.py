@@ -0,0 +1,123 @@
+# ================================================================
+# skill_index.py  — normalized volunteer skill index
+#
+# volunteer.skills keeps the display string ("First Aid, Driving");
+# skill / volunteer_skill hold the same data one row per skill so
+# "has all required skills" is a single indexed set query instead of
+# a Python scan over every volunteer. activity_skill does the same for
+# activity.required_skills.
+# ================================================================
+
+
+def parse_skills(raw):
+    """Split a comma-separated skill string into unique lowercase names."""
+    return list(dict.fromkeys(
+        s.strip().lower() for s in (raw or '').split(',') if s.strip()
+    ))
+
+
+def ensure_skills(cur, names):
+    """Make sure every name has a skill row."""
+    if names:
+        cur.executemany(
+            "INSERT IGNORE INTO skill (name) VALUES (%s)",
+            [(n,) for n in names]
+        )
+
+
+def sync_volunteer_skills(cur, volunteer_id, raw):
+    """Rewrite the index rows of one volunteer. Caller commits."""
+    names = parse_skills(raw)
+
+    # Lets every worker's match engine pick the change up incrementally
+    cur.execute(
+        "UPDATE volunteer SET skills_updated_at=NOW() WHERE volunteer_id=%s",
+        (volunteer_id,)
+    )
+    cur.execute("DELETE FROM volunteer_skill WHERE volunteer_id=%s", (volunteer_id,))
+    if not names:
+        return
+
+    ensure_skills(cur, names)
+    placeholders = ', '.join(['%s'] * len(names))
+    cur.execute(f"""
+        INSERT INTO volunteer_skill (volunteer_id, skill_id)
+        SELECT %s, skill_id FROM skill WHERE name IN ({placeholders})
+    """, (volunteer_id, *names))
+
+
+def sync_activity_skills(cur, activity_id, raw):
+    """Rewrite the activity_skill rows of one activity. Caller commits."""
+    names = parse_skills(raw)
+    cur.execute("DELETE FROM activity_skill WHERE activity_id=%s", (activity_id,))
+    if not names:
+        return
+
+    ensure_skills(cur, names)
+    placeholders = ', '.join(['%s'] * len(names))
+    cur.execute(f"""
+        INSERT INTO activity_skill (activity_id, skill_id)
+        SELECT %s, skill_id FROM skill WHERE name IN ({placeholders})
+    """, (activity_id, *names))
+
+
+def match_subquery(required, min_skills=1):
+    """
+    SQL + params selecting the IDs of volunteers that hold every skill
+    in `required`. With no requirement, selects volunteers with at
+    least `min_skills` skills. Meant to be joined as a derived table
+    so MySQL materializes it once.
+    """
+    if required:
+        placeholders = ', '.join(['%s'] * len(required))
+        sql = f"""
+            SELECT vs.volunteer_id
+            FROM volunteer_skill vs
+            JOIN skill s ON s.skill_id = vs.skill_id
+            WHERE s.name IN ({placeholders})
+            GROUP BY vs.volunteer_id
+            HAVING COUNT(*) = %s
+        """
+        return sql, (*required, len(required))
+
+    sql = """
+        SELECT volunteer_id
+        FROM volunteer_skill
+        GROUP BY volunteer_id
+        HAVING COUNT(*) >= %s
+    """
+    return sql, (min_skills,)
+
+
+def matching_volunteer_ids(cur, required, min_skills=1):
+    """IDs of volunteers holding all `required` (parsed) skills."""
+    sql, params = match_subquery(required, min_skills)
+    cur.execute(sql, params)
+    return [r[0] for r in cur.fetchall()]
+
+
+def rebuild(cur):
+    """
+    Backfill the whole index from volunteer.skills and
+    activity.required_skills. Caller commits.
+    """
+    cur.execute("SELECT volunteer_id, skills FROM volunteer")
+    for vid, raw in cur.fetchall():
+        sync_volunteer_skills(cur, vid, raw)
+    cur.execute("SELECT activity_id, required_skills FROM activity")
+    for aid, raw in cur.fetchall():
+        sync_activity_skills(cur, aid, raw)
+
+
+# ==========================
+# python skill_index.py  — one-off backfill
+# ==========================
+if __name__ == "__main__":
+    from app import app
+    from db import mysql
+
+    with app.app_context():
+        cur = mysql.connection.cursor()
+        rebuild(cur)
+        mysql.connection.commit()
+        cur.close()
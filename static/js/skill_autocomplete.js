@@ -0,0 +1,104 @@
+/* ================================================================
+ * skill_autocomplete.js — suggestions for comma-separated skill fields
+ *
+ * Any <input>/<textarea data-skill-autocomplete> (including ones added
+ * to the page later) completes the skill being typed, i.e. the text
+ * after the last comma, from GET /skills/suggest?q=. Picking a
+ * suggestion replaces that text with the canonical label.
+ * ================================================================ */
+(function () {
+  const DELAY = 150;
+  const box = document.createElement('ul');
+  box.className = 'skill-ac';
+  box.hidden = true;
+  Object.assign(box.style, {
+    position: 'absolute', zIndex: 1000, margin: 0, padding: '4px 0', listStyle: 'none',
+    borderRadius: '8px', boxShadow: '0 8px 24px rgba(0,0,0,0.25)', maxHeight: '240px',
+    overflowY: 'auto', fontSize: '0.9rem'
+  });
+  document.addEventListener('DOMContentLoaded', () => document.body.appendChild(box));
+
+  let field = null, items = [], active = -1, timer = null, seq = 0;
+
+  function current(el) {
+    const parts = el.value.split(',');
+    return parts[parts.length - 1].trim();
+  }
+
+  function close() {
+    box.hidden = true;
+    items = [];
+    active = -1;
+  }
+
+  function pick(i) {
+    const parts = field.value.split(',').map(s => s.trim()).filter(Boolean);
+    if (current(field)) parts.pop();
+    if (!parts.map(s => s.toLowerCase()).includes(items[i].name)) parts.push(items[i].label);
+    field.value = parts.join(', ') + ', ';
+    field.focus();
+    close();
+  }
+
+  function render() {
+    box.innerHTML = '';
+    items.forEach((s, i) => {
+      const li = document.createElement('li');
+      li.textContent = s.label;
+      Object.assign(li.style, { padding: '6px 12px', cursor: 'pointer' });
+      if (i === active) li.style.background = 'rgba(255,65,108,0.18)';
+      li.addEventListener('mousedown', e => { e.preventDefault(); pick(i); });
+      box.appendChild(li);
+    });
+    const r = field.getBoundingClientRect();
+    const cs = getComputedStyle(field);
+    Object.assign(box.style, {
+      left: (r.left + window.scrollX) + 'px', top: (r.bottom + window.scrollY + 4) + 'px',
+      width: r.width + 'px', background: cs.backgroundColor, color: cs.color,
+      border: cs.border
+    });
+    box.hidden = !items.length;
+  }
+
+  function lookup(el) {
+    const q = current(el);
+    if (!q) return close();
+    const mine = ++seq;
+    fetch('/skills/suggest?q=' + encodeURIComponent(q))
+      .then(r => r.json())
+      .then(data => {
+        if (mine !== seq || el !== field) return;
+        items = data.skills;
+        active = -1;
+        render();
+      })
+      .catch(close);
+  }
+
+  document.addEventListener('input', e => {
+    if (!e.target.matches('[data-skill-autocomplete]')) return;
+    field = e.target;
+    field.setAttribute('autocomplete', 'off');
+    clearTimeout(timer);
+    timer = setTimeout(() => lookup(field), DELAY);
+  });
+
+  document.addEventListener('keydown', e => {
+    if (box.hidden || e.target !== field) return;
+    if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+      e.preventDefault();
+      const step = e.key === 'ArrowDown' ? 1 : -1;
+      active = (active + step + items.length) % items.length;
+      render();
+    } else if ((e.key === 'Enter' || e.key === 'Tab') && active >= 0) {
+      e.preventDefault();
+      pick(active);
+    } else if (e.key === 'Escape') {
+      close();
+    }
+  });
+
+  document.addEventListener('focusout', e => {
+    if (e.target === field) close();
+  });
+})();
@@ -0,0 +1,68 @@
+# ================================================================
+# tests/test_broadcast_audience.py  — who a skill broadcast reaches
+#
+# A position notice is published with min_skills=2 and the position's
+# required skills. The live-event filter (broadcast.audience) must
+# follow the same rule as the email recipients
+# (skill_index.match_subquery) and the inbox read path
+# (broadcast.for_volunteer): min_skills only applies when the
+# broadcast names no skills.
+#
+#   python -m pytest tests
+# ================================================================
+
+import unittest
+
+from notifications import broadcast
+
+FIRST_AID, DRIVING, COOKING = 1, 2, 3
+
+
+class StubCursor:
+    """Fake DB-API cursor answering audience()'s two reads."""
+
+    def __init__(self, joined, held):
+        self.joined = joined
+        self.held   = held
+        self._rows  = []
+
+    def execute(self, sql, args=None):
+        if "FROM volunteer_activity" in sql:
+            self._rows = [(a,) for a in self.joined]
+        elif "FROM volunteer_skill" in sql:
+            self._rows = [(s,) for s in self.held]
+        else:
+            self._rows = []
+
+    def fetchall(self):
+        return list(self._rows)
+
+
+def event(skill_ids, min_skills=2):
+    return dict(broadcast_id=1, target='skills', activity_id=7,
+                skill_ids=skill_ids, min_skills=min_skills)
+
+
+class AudienceTest(unittest.TestCase):
+
+    def accept(self, held, joined=()):
+        return broadcast.audience(StubCursor(joined, held), 42)
+
+    def test_one_skill_volunteer_gets_notice_for_that_skill(self):
+        self.assertTrue(self.accept([FIRST_AID])(event([FIRST_AID])))
+
+    def test_missing_required_skill_is_rejected(self):
+        self.assertFalse(self.accept([FIRST_AID])(event([FIRST_AID, DRIVING])))
+
+    def test_min_skills_applies_without_required_skills(self):
+        self.assertFalse(self.accept([COOKING])(event([])))
+        self.assertTrue(self.accept([COOKING, DRIVING])(event([])))
+
+    def test_activity_broadcast_follows_sign_ups(self):
+        data = dict(target='activity', activity_id=7)
+        self.assertTrue(self.accept([], joined=[7])(data))
+        self.assertFalse(self.accept([FIRST_AID], joined=[8])(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# ================================================================
+# tests/test_querylog.py  — per-request query instrumentation
+#
+# Runs requests through a bare Flask app with querylog installed and
+# InstrumentedCursor on top of a pymysql cursor whose round trip is
+# stubbed out, and checks the Server-Timing header bench.run reads
+# and the debug-mode N+1 warning.
+#
+#   python -m pytest tests
+# ================================================================
+
+import logging
+import re
+import unittest
+from unittest import mock
+
+import pytest
+
+flask   = pytest.importorskip("flask")
+pymysql = pytest.importorskip("pymysql")
+
+import querylog  # noqa: E402
+
+# The pattern bench.run parses the header with
+SERVER_TIMING = re.compile(r'^db;dur=\d+\.\d;desc="(\d+) queries"$')
+
+
+def make_app(debug=False):
+    app = flask.Flask(__name__)
+    app.debug = debug
+    app.config["DB_REPEAT_WARN"] = 3
+    querylog.init_app(app)
+
+    @app.route("/select/<int:n>")
+    def select(n):
+        cur = querylog.InstrumentedCursor(None)
+        for i in range(n):
+            cur.execute("SELECT name FROM volunteer WHERE volunteer_id = %s", (i,))
+        return "ok"
+
+    @app.route("/update/<int:n>")
+    def update(n):
+        cur = querylog.InstrumentedCursor(None)
+        cur.executemany("UPDATE volunteer SET skills = %s WHERE volunteer_id = %s",
+                        [("", i) for i in range(n)])
+        return "ok"
+
+    return app
+
+
+class ServerTimingTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(pymysql.cursors.Cursor, "execute", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = make_app().test_client()
+
+    def queries(self, path):
+        header = self.client.get(path).headers.get("Server-Timing")
+        if header is None:
+            return None
+        m = SERVER_TIMING.match(header)
+        self.assertIsNotNone(m, header)
+        return int(m.group(1))
+
+    def test_counts_every_statement(self):
+        self.assertEqual(self.queries("/select/1"), 1)
+        self.assertEqual(self.queries("/select/7"), 7)
+
+    def test_executemany_counts_round_trips(self):
+        # Not an INSERT ... VALUES, so pymysql runs one statement per row
+        self.assertEqual(self.queries("/update/4"), 4)
+
+    def test_no_header_without_queries(self):
+        self.assertIsNone(self.queries("/select/0"))
+
+    def test_counts_are_per_request(self):
+        self.queries("/select/5")
+        self.assertEqual(self.queries("/select/2"), 2)
+
+    def test_no_stats_outside_a_request(self):
+        cur = querylog.InstrumentedCursor(None)
+        cur.execute("SELECT 1")
+        self.assertIsNone(querylog.current())
+
+
+class RepeatWarningTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(pymysql.cursors.Cursor, "execute", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def warnings(self, debug, n):
+        with self.assertLogs(querylog.log, logging.INFO) as logs:
+            make_app(debug).test_client().get(f"/select/{n}")
+        return [r.getMessage() for r in logs.records if r.levelno == logging.WARNING]
+
+    def test_warns_past_the_limit_in_debug(self):
+        found = self.warnings(debug=True, n=4)
+        self.assertEqual(len(found), 1)
+        self.assertIn("possible N+1", found[0])
+        self.assertIn("ran 4 times", found[0])
+
+    def test_quiet_at_the_limit(self):
+        self.assertEqual(self.warnings(debug=True, n=3), [])
+
+    def test_quiet_outside_debug(self):
+        self.assertEqual(self.warnings(debug=False, n=10), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# ================================================================
+# tests/test_roster_queries.py  — query count of the volunteers page
+#
+# organization.roster.load_page must issue the same number of
+# statements whatever the size of the roster, the number of positions
+# or candidates. The page is loaded against a counting fake cursor
+# that answers each statement with synthetic rows of the requested
+# size, so no database is needed.
+#
+#   python -m pytest tests
+# ================================================================
+
+import datetime
+import unittest
+from unittest import mock
+
+from matching import SkillMatcher
+from organization import roster
+
+SKILLS = ["first aid", "teamwork", "logistics", "driving"]
+
+
+class CountingCursor:
+    """Fake DB-API cursor: records every execute(), returns sized rows."""
+
+    def __init__(self, volunteers, positions, signups):
+        self.volunteers = volunteers
+        self.positions  = positions
+        self.signups    = signups
+        self.statements = []
+        self._rows      = []
+
+    def execute(self, sql, args=None):
+        self.statements.append(" ".join(sql.split()))
+        self._rows = self._answer(self.statements[-1], args or ())
+        return len(self._rows)
+
+    def executemany(self, sql, rows):
+        for r in rows:
+            self.execute(sql, r)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def _answer(self, sql, args):
+        if sql == "SELECT NOW()":
+            return [(datetime.datetime(2030, 1, 1),)]
+        if "FROM volunteer_skill vs" in sql:
+            return [(vid, SKILLS[(vid + k) % len(SKILLS)])
+                    for vid in range(1, self.volunteers + 1) for k in range(2)]
+        if "FROM activity a WHERE" in sql:
+            return [("Fest", "Cultural", "Hall", datetime.date(2030, 1, 1), None,
+                     "", None, None)]
+        if "FROM activity_position" in sql:
+            return [(pid, f"Position {pid}", SKILLS[pid % len(SKILLS)], 5, 0)
+                    for pid in range(1, self.positions + 1)]
+        if "FROM volunteer_activity va" in sql:
+            return [((sid % self.positions) + 1, sid, sid, "First", "Last",
+                     f"v{sid}@test", "9000000000", "teamwork", False, None,
+                     ("pending", "approved", "waitlisted")[sid % 3])
+                    for sid in range(1, self.signups + 1)]
+        if sql.startswith("SELECT volunteer_id, first_name"):
+            return [(vid, "First", "Last", f"v{vid}@test", "teamwork") for vid in args]
+        return []
+
+
+class LoadPageQueryCountTest(unittest.TestCase):
+
+    def count(self, **sizes):
+        cur = CountingCursor(**sizes)
+        with mock.patch.object(roster, "matcher", SkillMatcher()):
+            roster.load_page(cur, 1, candidate_limit=10)     # loads the matcher
+            cur.statements.clear()
+            page = roster.load_page(cur, 1, candidate_limit=10)
+        return len(cur.statements), page
+
+    def test_constant_as_roster_grows(self):
+        counts = {n: self.count(volunteers=500, positions=3, signups=n)[0]
+                  for n in (1, 10, 300)}
+        self.assertEqual(len(set(counts.values())), 1, counts)
+
+    def test_constant_as_positions_grow(self):
+        counts = {n: self.count(volunteers=500, positions=n, signups=50)[0]
+                  for n in (1, 4, 40)}
+        self.assertEqual(len(set(counts.values())), 1, counts)
+
+    def test_constant_as_candidates_grow(self):
+        counts = {n: self.count(volunteers=n, positions=3, signups=5)[0]
+                  for n in (10, 200, 2000)}
+        self.assertEqual(len(set(counts.values())), 1, counts)
+
+    def test_page_is_grouped_by_position(self):
+        _, page = self.count(volunteers=100, positions=2, signups=12)
+        rostered = sum(len(v) for v in page["volunteers_by_position"].values())
+        waiting  = sum(len(v) for v in page["waitlist_by_position"].values())
+        self.assertEqual(rostered + waiting, 12)
+        self.assertEqual(waiting, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,252 @@
+# ================================================================
+# vocabulary.py  — canonical skill names and prefix autocomplete
+#
+#   python -m vocabulary rebuild    re-canonicalize stored skills
+#
+# Every skill string written by the app goes through canonical()
+# first: entries are normalized (case, spacing, "-", "_", "/", "."),
+# aliases are mapped to their skill ("photographer" -> photography),
+# and the display label is stored ("First Aid", "IT Support"). The
+# lowercased label is the skill.name key, so parse_skills() of a
+# stored string always lands on the same skill rows and free-text
+# variants no longer fragment volunteer_skill / activity_skill.
+#
+# Autocomplete is answered from memory: a sorted array of keys (each
+# skill name, each word suffix of it, each alias) is bisected for the
+# prefix range, and the matching skills are ranked by how many
+# volunteers hold them.
+#
+# Each worker holds its own copy as one immutable snapshot; requests
+# read whatever snapshot is current and never wait for a reload. The
+# first request of a worker loads names and aliases only (no counts,
+# two small reads) and starts a loader thread, which runs the volunteer_skill
+# aggregate and swaps in a complete snapshot right away and then every
+# REFRESH_SECONDS. Skills this worker creates are added by swapping in
+# a copy that includes them.
+# ================================================================
+
+import bisect
+import logging
+import re
+import sys
+import threading
+import time
+
+from flask import current_app
+
+REFRESH_SECONDS = 300
+SUGGEST_LIMIT   = 10
+REBUILD_BATCH   = 1000
+
+_SEPARATORS = re.compile(r'[\s\-_./]+')
+
+log = logging.getLogger(__name__)
+
+
+def normalize(text):
+    """'  First-Aid ' -> 'first aid'"""
+    return ' '.join(w for w in _SEPARATORS.split((text or '').lower()) if w)
+
+
+def _label(text):
+    """Display form of a new skill: words capitalized unless typed with capitals."""
+    words = [w for w in _SEPARATORS.split(text.strip()) if w]
+    return ' '.join(w if any(c.isupper() for c in w) else w.capitalize() for w in words)
+
+
+def _keys_of(name):
+    words = name.split(' ')
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+
+# ── Loading ──────────────────────────────────────────────────────
+def _read_names(cur):
+    """({skill name: label}, {alias: skill name})"""
+    cur.execute("""
+        SELECT a.alias, s.name FROM skill_alias a
+        JOIN skill s ON s.skill_id = a.skill_id
+    """)
+    alias = dict(cur.fetchall())
+    cur.execute("SELECT name, label FROM skill")
+    label = {
+        name: lbl or _label(name) for name, lbl in cur.fetchall()
+        if name not in alias        # an old free-text variant, not a skill of its own
+    }
+    return label, alias
+
+
+def _read_counts(cur):
+    """{skill name: volunteers holding it}; the expensive part."""
+    cur.execute("""
+        SELECT s.name, COUNT(*)
+        FROM volunteer_skill vs
+        JOIN skill s ON s.skill_id = vs.skill_id
+        GROUP BY s.skill_id
+    """)
+    return dict(cur.fetchall())
+
+
+class _Snapshot:
+
+    __slots__ = ('label', 'alias', 'count', 'keys', 'names')
+
+    def __init__(self, label, alias, count):
+        entries = sorted(
+            {(key, name) for name in label for key in _keys_of(name)}
+            | {(a, name) for a, name in alias.items() if name in label}
+        )
+        self.label = label      # skill name -> display label
+        self.alias = alias      # normalized alias -> skill name
+        self.count = count      # skill name -> volunteers holding it
+        self.keys  = [k for k, _ in entries]    # sorted search keys
+        self.names = [n for _, n in entries]    # skill name of each key
+
+    def with_skills(self, new):
+        return _Snapshot({**self.label, **dict(new)}, self.alias, self.count)
+
+
+class Vocabulary:
+
+    def __init__(self):
+        self._lock   = threading.Lock()     # serializes swaps; readers never take it
+        self._snap   = None
+        self._thread = None
+
+    def start(self, app):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(app,), daemon=True)
+                self._thread.start()
+
+    def _run(self, app):
+        from db import mysql
+
+        while True:
+            try:
+                with app.app_context():
+                    cur = mysql.connection.cursor()
+                    label, alias = _read_names(cur)
+                    count = _read_counts(cur)
+                    mysql.connection.commit()
+                    cur.close()
+                with self._lock:
+                    # Skills added by this worker while the read ran
+                    for name, lbl in (self._snap.label.items() if self._snap else ()):
+                        label.setdefault(name, lbl)
+                    self._snap = _Snapshot(label, alias, count)
+            except Exception:
+                log.exception("skill vocabulary reload failed; retrying")
+            time.sleep(REFRESH_SECONDS)
+
+    def _current(self, cur):
+        snap = self._snap
+        if snap is None:
+            with self._lock:
+                if self._snap is None:
+                    self._snap = _Snapshot(*_read_names(cur), {})
+                snap = self._snap
+            self.start(current_app._get_current_object())
+        return snap
+
+    def _add(self, new):
+        with self._lock:
+            self._snap = self._snap.with_skills(new)
+
+    # ── Canonical form ───────────────────────────────────────────
+    def canonical(self, cur, raw):
+        """
+        'first-aid, Photographer,  cpr' -> 'First Aid, Photography, CPR'.
+        Skills seen for the first time are created with their label.
+        """
+        snap = self._current(cur)
+        labels, new = {}, []
+        for entry in (raw or '').split(','):
+            key = normalize(entry)
+            if not key:
+                continue
+            name = snap.alias.get(key, key)
+            if name not in labels:
+                label = snap.label.get(name)
+                if label is None:
+                    label = _label(entry)
+                    new.append((name, label))
+                labels[name] = label
+
+        if new:
+            cur.executemany(
+                "INSERT IGNORE INTO skill (name, label) VALUES (%s, %s)", new
+            )
+            self._add(new)
+        return ', '.join(labels.values())
+
+    # ── Autocomplete ─────────────────────────────────────────────
+    def suggest(self, cur, prefix, limit=SUGGEST_LIMIT):
+        """Skills with a word or alias starting with `prefix`, most held first."""
+        snap = self._current(cur)
+        key = normalize(prefix)
+        if not key:
+            return []
+        lo = bisect.bisect_left(snap.keys, key)
+        hi = bisect.bisect_left(snap.keys, key + '\uffff', lo)
+        names = set(snap.names[lo:hi])
+        top = sorted(names, key=lambda n: (-snap.count.get(n, 0), n))[:limit]
+        return [{'name': n, 'label': snap.label[n]} for n in top]
+
+    def popular(self, cur, limit=15):
+        """Labels of the most held skills, for the quick-add chips."""
+        snap = self._current(cur)
+        top = sorted(snap.label, key=lambda n: (-snap.count.get(n, 0), n))[:limit]
+        return [snap.label[n] for n in top]
+
+
+vocabulary = Vocabulary()
+
+
+# ── Re-canonicalize stored skills ────────────────────────────────
+def rebuild():
+    """
+    Rewrite volunteer.skills, activity.required_skills and
+    activity_position.required_skills in canonical form and resync the
+    skill index, REBUILD_BATCH rows per commit.
+    """
+    from db import mysql
+    from skill_index import sync_volunteer_skills, sync_activity_skills
+
+    targets = (
+        ('volunteer',         'volunteer_id', 'skills',          sync_volunteer_skills),
+        ('activity',          'activity_id',  'required_skills', sync_activity_skills),
+        ('activity_position', 'position_id',  'required_skills', None),
+    )
+    cur = mysql.connection.cursor()
+    for table, pk, column, sync in targets:
+        last, changed = 0, 0
+        while True:
+            cur.execute(f"""
+                SELECT {pk}, {column} FROM {table}
+                WHERE {pk} > %s ORDER BY {pk} LIMIT %s
+            """, (last, REBUILD_BATCH))
+            rows = cur.fetchall()
+            if not rows:
+                break
+            for row_id, raw in rows:
+                fixed = vocabulary.canonical(cur, raw)
+                if fixed != (raw or ''):
+                    cur.execute(f"UPDATE {table} SET {column}=%s WHERE {pk}=%s",
+                                (fixed, row_id))
+                    if sync:
+                        sync(cur, row_id, fixed)
+                    changed += 1
+            mysql.connection.commit()
+            last = rows[-1][0]
+        print(f"{table}.{column}: {changed} row(s) rewritten")
+    cur.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python -m vocabulary rebuild")
+
+    from app import app
+
+    with app.app_context():
+        rebuild()
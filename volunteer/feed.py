@@ -0,0 +1,121 @@
+# ================================================================
+# volunteer/feed.py  — "Available Activities" feed
+#
+# Only activities a volunteer can still sign up for: registration
+# window open now (a missing bound counts as open), start date today
+# or later, not joined yet. Pages are read in (start_date, activity_id)
+# order by keyset from idx_activity_feed, which also carries the
+# registration window, so a page costs LIMIT + 1 index entries however
+# many activities exist.
+#
+# Eligibility follows join_activity: at least MIN_SKILLS skills, every
+# skill in activity.required_skills, and, when the activity has
+# positions, one position whose required skills the volunteer holds
+# (the rule of signups.pick_positions). The page's positions are read
+# in one query. Each card is also checked against the volunteer's
+# commitments (schedule.py) so overlapping dates can be flagged.
+# ================================================================
+
+import datetime
+
+import schedule
+from skill_index import parse_skills
+
+PAGE_SIZE   = 12
+MIN_SKILLS  = 2     # join_activity refuses volunteers with fewer skills
+
+
+def encode_cursor(start_date, activity_id):
+    return f"{start_date.isoformat()}.{activity_id}"
+
+
+def decode_cursor(cursor):
+    try:
+        day, aid = cursor.split('.')
+        return datetime.date.fromisoformat(day), int(aid)
+    except (AttributeError, ValueError):
+        return None
+
+
+def page(cur, volunteer_id, volunteer_skills, cursor=None, limit=PAGE_SIZE):
+    """
+    One page of the feed for a volunteer holding `volunteer_skills`
+    (parsed). Returns (activities, next_cursor); each activity is a
+    dict with id, name, type, place, date, req_skills [(name, have)],
+    missing [name], eligible and conflicts [name].
+    """
+    where, params = [], [volunteer_id]
+    after = decode_cursor(cursor) if cursor else None
+    if after:
+        where.append("AND (a.start_date > %s OR (a.start_date = %s AND a.activity_id > %s))")
+        params += [after[0], after[0], after[1]]
+
+    cur.execute(f"""
+        SELECT a.activity_id, a.name, a.type, a.place, a.start_date, a.end_date
+        FROM activity a
+        WHERE a.start_date >= CURDATE()
+          AND (a.reg_open  IS NULL OR a.reg_open  <= NOW())
+          AND (a.reg_close IS NULL OR a.reg_close >= NOW())
+          AND NOT EXISTS (
+              SELECT 1 FROM volunteer_activity va
+              WHERE va.volunteer_id = %s AND va.activity_id = a.activity_id
+          )
+          {' '.join(where)}
+        ORDER BY a.start_date, a.activity_id
+        LIMIT %s
+    """, (*params, limit + 1))
+    rows = cur.fetchall()
+    more, rows = len(rows) > limit, rows[:limit]
+    if not rows:
+        return [], None
+
+    last = rows[-1]
+    return (cards(cur, volunteer_id, volunteer_skills, rows),
+            encode_cursor(last[4], last[0]) if more else None)
+
+
+def cards(cur, volunteer_id, volunteer_skills, rows):
+    """
+    Card dicts for rows of (activity_id, name, type, place, start_date,
+    end_date), in the same order. Also used for search results.
+
+    req_skills lists the activity's own skills and those of its
+    closest position: the first one the volunteer qualifies for, else
+    the one missing the fewest skills.
+    """
+    if not rows:
+        return []
+
+    booked = schedule.commitments(cur, volunteer_id)
+    activities = {
+        aid: {'id': aid, 'name': name, 'type': atype, 'place': place,
+              'date': start, 'req_skills': [], 'missing': [],
+              'conflicts': schedule.conflicts(booked, start, end)}
+        for aid, name, atype, place, start, end in rows
+    }
+
+    placeholders = ', '.join(['%s'] * len(activities))
+    cur.execute(f"""
+        SELECT a.activity_id, a.required_skills, ap.required_skills
+        FROM activity a
+        LEFT JOIN activity_position ap ON ap.activity_id = a.activity_id
+        WHERE a.activity_id IN ({placeholders})
+        ORDER BY a.activity_id, ap.position_id
+    """, tuple(activities))
+    own, positions = {}, {}
+    for aid, activity_req, position_req in cur.fetchall():
+        own[aid] = parse_skills(activity_req)
+        if position_req is not None:
+            positions.setdefault(aid, []).append(parse_skills(position_req))
+
+    have = set(volunteer_skills)
+    for aid, a in activities.items():
+        # min() keeps the first position (in position_id order) on ties
+        needed = min(positions.get(aid, [[]]),
+                     key=lambda req: sum(s not in have for s in req))
+        for name in dict.fromkeys(own.get(aid, []) + needed):
+            a['req_skills'].append((name, name in have))
+            if name not in have:
+                a['missing'].append(name)
+        a['eligible'] = len(have) >= MIN_SKILLS and not a['missing']
+    return list(activities.values())
@@ -7,11 +7,22 @@ import os
 import uuid
 from flask import (
     Blueprint, render_template, request,
-    redirect, url_for, session, flash, current_app
+    redirect, url_for, session, flash, current_app, jsonify, make_response
 )
 from werkzeug.security import generate_password_hash, check_password_hash
 from db import mysql
 from functools import wraps
+from skill_index import parse_skills
+from notifications import broadcast, inbox
+from repository import accounts
+from repository import volunteers
+from volunteer import feed
+import recommend
+import schedule
+import search
+import signups
+import events
+from vocabulary import vocabulary
 
 volunteer_bp = Blueprint('volunteer', __name__, url_prefix='/volunteer')
 
@@ -40,18 +51,14 @@ def login():
         password = request.form.get('password')
 
         cur = mysql.connection.cursor()
-        cur.execute(
-            "SELECT volunteer_id, password FROM volunteer WHERE email=%s",
-            (email,)
-        )
-        user = cur.fetchone()
+        user = accounts.find_credentials(cur, "volunteer", email)
         cur.close()
 
         if not user:
             flash("Invalid email or password.", "error")
             return redirect(url_for('volunteer.login'))
 
-        stored_password = user[1]
+        stored_password = user.password
 
         valid = check_password_hash(stored_password, password)
 
@@ -59,7 +66,7 @@ def login():
             flash("Invalid email or password.", "error")
             return redirect(url_for('volunteer.login'))
 
-        session['volunteer_id'] = user[0]
+        session['volunteer_id'] = user.id
         flash("Login successful!", "success")
         return redirect(url_for('volunteer.dashboard'))
 
@@ -76,81 +83,91 @@ def dashboard():
     cur = mysql.connection.cursor()
 
     # ---- Volunteer info ----
-    cur.execute("""
-        SELECT first_name, last_name, email, phone, gender,
-               skills, profile_picture
-        FROM volunteer
-        WHERE volunteer_id = %s
-    """, (vid,))
-    vol = cur.fetchone()
+    vol = volunteers.profile(cur, vid)
 
-    first_name, last_name, email, phone, gender, skills_str, profile_picture = vol
-
-    volunteer_skills = [s.strip() for s in (skills_str or '').split(',') if s.strip()]
+    volunteer_skills = [s.strip() for s in (vol.skills or '').split(',') if s.strip()]
     skills_count     = len(volunteer_skills)
 
-    # ---- Activities NOT joined ----
-    cur.execute("""
-        SELECT activity_id, name, type, start_date, required_skills
-        FROM activity
-        WHERE activity_id NOT IN (
-            SELECT activity_id FROM volunteer_activity
-            WHERE volunteer_id = %s
-        )
-        ORDER BY start_date
-    """, (vid,))
-    raw_activities = cur.fetchall()
-
-    activities = []
-    for act in raw_activities:
-        act_id, name, atype, start_date, req_skills_str = act
-        req_skills = [s.strip() for s in (req_skills_str or '').split(',') if s.strip()]
-
-        if req_skills:
-            matched  = [s for s in req_skills if s in volunteer_skills]
-            eligible = (skills_count >= 2) and (len(matched) == len(req_skills))
-            missing  = [s for s in req_skills if s not in volunteer_skills]
-        else:
-            eligible = skills_count >= 2
-            missing  = []
-
-        activities.append({
-            'id':         act_id,
-            'name':       name,
-            'type':       atype,
-            'date':       start_date,
-            'req_skills': req_skills,
-            'eligible':   eligible,
-            'missing':    missing,
-        })
+    # ---- First page of the activity feed (the rest scrolls in) ----
+    activities, next_cursor = feed.page(cur, vid, parse_skills(vol.skills))
+
+    # ---- Recommendations (precomputed by recommend.py) ----
+    recommended = recommend.load(cur, vid)
 
     # ---- Joined activities ----
-    cur.execute("""
-        SELECT a.name, a.start_date, va.role,
-               va.attendance, va.performance_rating
-        FROM volunteer_activity va
-        JOIN activity a ON va.activity_id = a.activity_id
-        WHERE va.volunteer_id = %s
-        ORDER BY a.start_date DESC
-    """, (vid,))
-    joined = cur.fetchall()
+    joined = volunteers.joined(cur, vid)
+
+    unread_count = inbox.unread_count(cur, vid)
+    suggestions  = vocabulary.popular(cur)
     cur.close()
 
     return render_template(
         'volunteer/dashboard.html',
         activities       = activities,
+        next_cursor      = next_cursor,
+        recommended      = recommended,
         joined           = joined,
         volunteer_skills = volunteer_skills,
         skills_count     = skills_count,
-        first_name       = first_name,
-        last_name        = last_name,
-        email            = email,
-        phone            = phone or '',
-        gender           = gender or '',
-        profile_picture  = profile_picture,
+        suggestions      = suggestions,
+        first_name       = vol.first_name,
+        last_name        = vol.last_name,
+        email            = vol.email,
+        phone            = vol.phone or '',
+        gender           = vol.gender or '',
+        profile_picture  = vol.profile_picture,
+        digest_email     = vol.digest_email,
+        unread_count     = unread_count,
     )
 
 
+# ================================================================
+# ACTIVITY FEED  (next page, for infinite scroll)
+# ================================================================
+@volunteer_bp.route('/feed')
+@volunteer_required
+def activity_feed():
+    vid = session['volunteer_id']
+    cur = mysql.connection.cursor()
+    volunteer_skills = parse_skills(volunteers.skills(cur, vid))
+    skills_count     = len(volunteer_skills)
+    activities, next_cursor = feed.page(cur, vid, volunteer_skills, request.args.get('cursor'))
+    cur.close()
+
+    resp = make_response(render_template(
+        'volunteer/_activity_cards.html',
+        activities   = activities,
+        skills_count = skills_count,
+    ))
+    resp.headers['X-Next-Cursor'] = next_cursor or ''
+    return resp
+
+
+# ================================================================
+# ACTIVITY SEARCH  (full-text, same cards as the feed)
+# ================================================================
+@volunteer_bp.route('/search')
+@volunteer_required
+def activity_search():
+    vid = session['volunteer_id']
+    cur = mysql.connection.cursor()
+    volunteer_skills = parse_skills(volunteers.skills(cur, vid))
+    skills_count     = len(volunteer_skills)
+    rows, next_cursor = search.activities(
+        cur, request.args.get('q', ''), vid, request.args.get('cursor')
+    )
+    activities = feed.cards(cur, vid, volunteer_skills, rows)
+    cur.close()
+
+    resp = make_response(render_template(
+        'volunteer/_activity_cards.html',
+        activities   = activities,
+        skills_count = skills_count,
+    ))
+    resp.headers['X-Next-Cursor'] = next_cursor or ''
+    return resp
+
+
 # ================================================================
 # UPDATE SKILLS
 # ================================================================
@@ -160,16 +177,10 @@ def update_skills():
     vid = session['volunteer_id']
     raw = request.form.get('skills', '')
 
-    skills_list = list(dict.fromkeys(
-        s.strip().title() for s in raw.split(',') if s.strip()
-    ))
-    skills_str = ', '.join(skills_list)
-
     cur = mysql.connection.cursor()
-    cur.execute(
-        "UPDATE volunteer SET skills=%s WHERE volunteer_id=%s",
-        (skills_str, vid)
-    )
+    skills_str  = vocabulary.canonical(cur, raw)
+    skills_list = parse_skills(skills_str)
+    volunteers.set_skills(cur, vid, skills_str)
     mysql.connection.commit()
     cur.close()
 
@@ -210,21 +221,15 @@ def update_picture():
 
     # Delete old picture from disk if it exists
     cur = mysql.connection.cursor()
-    cur.execute(
-        "SELECT profile_picture FROM volunteer WHERE volunteer_id = %s", (vid,)
-    )
-    old = cur.fetchone()
-    if old and old[0]:
-        old_path = os.path.join(current_app.config['UPLOAD_FOLDER'], old[0])
+    old = accounts.picture(cur, 'volunteer', vid)
+    if old:
+        old_path = os.path.join(current_app.config['UPLOAD_FOLDER'], old)
         if os.path.exists(old_path):
             os.remove(old_path)
 
     file.save(filepath)
 
-    cur.execute(
-        "UPDATE volunteer SET profile_picture=%s WHERE volunteer_id=%s",
-        (filename, vid)
-    )
+    accounts.set_picture(cur, 'volunteer', vid, filename)
     mysql.connection.commit()
     cur.close()
 
@@ -256,10 +261,7 @@ def change_password():
         return redirect(url_for('volunteer.dashboard'))
 
     cur = mysql.connection.cursor()
-    cur.execute(
-        "SELECT password FROM volunteer WHERE volunteer_id=%s", (vid,)
-    )
-    stored = cur.fetchone()[0]
+    stored = accounts.password_hash(cur, 'volunteer', vid)
 
     valid = check_password_hash(stored, current_pw)
 
@@ -268,10 +270,7 @@ def change_password():
         cur.close()
         return redirect(url_for('volunteer.dashboard'))
 
-    cur.execute(
-        "UPDATE volunteer SET password=%s WHERE volunteer_id=%s",
-        (generate_password_hash(new_pw), vid)
-    )
+    accounts.set_password(cur, 'volunteer', vid, generate_password_hash(new_pw))
     mysql.connection.commit()
     cur.close()
 
@@ -279,55 +278,135 @@ def change_password():
     return redirect(url_for('volunteer.dashboard'))
 
 
+# ================================================================
+# EMAIL PREFERENCES  (instant emails vs. daily digest)
+# ================================================================
+@volunteer_bp.route('/profile/digest', methods=['POST'])
+@volunteer_required
+def update_digest():
+    vid    = session['volunteer_id']
+    digest = request.form.get('digest_email') == 'on'
+
+    cur = mysql.connection.cursor()
+    volunteers.set_digest(cur, vid, digest)
+    mysql.connection.commit()
+    cur.close()
+
+    if digest:
+        flash('You will get one daily email digest.', 'success')
+    else:
+        flash('You will get an email for each new position.', 'success')
+    return redirect(url_for('volunteer.dashboard'))
+
+
+# ================================================================
+# NOTIFICATIONS  (direct + broadcast notices, keyset-paged)
+# ================================================================
+@volunteer_bp.route('/notifications')
+@volunteer_required
+def notifications():
+    vid    = session['volunteer_id']
+    limit  = max(1, min(request.args.get('limit', inbox.PAGE_SIZE, type=int), 100))
+
+    cur = mysql.connection.cursor()
+    items, next_cursor = inbox.page(cur, vid, request.args.get('cursor'), limit)
+    unread = inbox.unread_count(cur, vid)
+    cur.close()
+    return jsonify(items=items, next_cursor=next_cursor, unread=unread)
+
+
+@volunteer_bp.route('/notifications/unread')
+@volunteer_required
+def unread_notifications():
+    cur = mysql.connection.cursor()
+    unread = inbox.unread_count(cur, session['volunteer_id'])
+    cur.close()
+    return jsonify(unread=unread)
+
+
+@volunteer_bp.route('/notifications/read', methods=['POST'])
+@volunteer_required
+def mark_notifications_read():
+    vid = session['volunteer_id']
+    cur = mysql.connection.cursor()
+    inbox.mark_all_read(cur, vid)
+    mysql.connection.commit()
+    cur.close()
+    return jsonify(unread=0)
+
+
+@volunteer_bp.route('/stream')
+@volunteer_required
+def stream():
+    vid = session['volunteer_id']
+    cur = mysql.connection.cursor()
+    accept = broadcast.audience(cur, vid)
+    cur.close()
+    mysql.connection.commit()
+    return events.sse_response([f'volunteer:{vid}', 'broadcast'], accept)
+
+
 # ================================================================
 # JOIN ACTIVITY
 # ================================================================
 @volunteer_bp.route('/join/<int:activity_id>')
+@volunteer_bp.route('/join/<int:activity_id>/<int:position_id>')
 @volunteer_required
-def join_activity(activity_id):
+def join_activity(activity_id, position_id=None):
     vid = session['volunteer_id']
     cur = mysql.connection.cursor()
 
-    cur.execute(
-        "SELECT skills FROM volunteer WHERE volunteer_id=%s", (vid,)
-    )
-    volunteer_skills = [
-        s.strip() for s in (cur.fetchone()[0] or '').split(',') if s.strip()
-    ]
+    volunteer_skills = parse_skills(volunteers.skills(cur, vid))
 
     if len(volunteer_skills) < 2:
         flash('Add at least 2 skills before joining.', 'error')
         cur.close()
         return redirect(url_for('volunteer.dashboard'))
 
-    cur.execute(
-        "SELECT required_skills FROM activity WHERE activity_id=%s", (activity_id,)
-    )
-    act_row = cur.fetchone()
+    target = volunteers.join_target(cur, activity_id)
 
-    if not act_row:
+    if not target:
         flash('Activity not found.', 'error')
         cur.close()
         return redirect(url_for('volunteer.dashboard'))
 
-    req_skills = [s.strip() for s in (act_row[0] or '').split(',') if s.strip()]
-    missing    = [s for s in req_skills if s not in volunteer_skills]
+    missing = [s for s in parse_skills(target.required_skills) if s not in volunteer_skills]
 
     if missing:
         flash(f'Missing required skills: {", ".join(missing)}.', 'error')
         cur.close()
         return redirect(url_for('volunteer.dashboard'))
 
-    try:
-        cur.execute(
-            "INSERT INTO volunteer_activity (volunteer_id, activity_id) VALUES (%s,%s)",
-            (vid, activity_id)
-        )
-        mysql.connection.commit()
-        flash('Successfully joined the activity!', 'success')
-    except Exception:
+    # Positions this volunteer qualifies for; a named one must be among them
+    positions, has_positions = signups.pick_positions(cur, activity_id, volunteer_skills)
+    if position_id is not None:
+        positions = [p for p in positions if p == position_id]
+    if has_positions and not positions:
+        flash('You do not have the skills any open position requires.', 'error')
+        cur.close()
+        return redirect(url_for('volunteer.dashboard'))
+
+    # Overlapping dates are allowed but flagged
+    clashes = schedule.overlapping(
+        cur, vid, target.start_date, target.end_date, exclude_activity=activity_id
+    )
+
+    outcome, position_id = signups.join(cur, vid, activity_id, positions)
+    if outcome == signups.DUPLICATE:
         mysql.connection.rollback()
         flash('Already joined this activity.', 'warning')
+    else:
+        events.publish(cur, f'activity:{activity_id}', 'signup',
+                       volunteer_id=vid, position_id=position_id, status=outcome)
+        mysql.connection.commit()
+        if outcome == signups.WAITLISTED:
+            flash('All slots are taken. You are on the waitlist and will be '
+                  'moved in automatically when a slot opens.', 'warning')
+        else:
+            flash('Successfully joined the activity!', 'success')
+        if clashes:
+            flash(f'Heads up: this overlaps with {", ".join(clashes)}, '
+                  'which you have also joined.', 'warning')
 
     cur.close()
-    return redirect(url_for('volunteer.dashboard'))
\ No newline at end of file
+    return redirect(url_for('volunteer.dashboard'))